@@ -0,0 +1,122 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the time to import the relay.testing.tf models with the TensorFlow frontend,
+with and without the compiled function cache of infer_value.
+
+e.g.
+python3 tf_import_bench.py --network ssd_mobilenet_v1 --repeat 3
+"""
+
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tvm import relay
+from tvm.relay.frontend import common
+import tvm.relay.testing.tf as tf_testing
+
+try:
+    tf_compat_v1 = tf.compat.v1
+except AttributeError:
+    tf_compat_v1 = tf
+
+# name -> (model path, model sub path, input node, input shape, output nodes, layout)
+NETWORKS = {
+    "inception_v3": (
+        "InceptionV3/inception_v3_2016_08_28_frozen-with_shapes.pb",
+        None,
+        "input",
+        (1, 299, 299, 3),
+        ["InceptionV3/Predictions/Reshape_1"],
+        "NHWC",
+    ),
+    "mobilenet_v2": (
+        "https://storage.googleapis.com/mobilenet_v2/checkpoints/mobilenet_v2_1.4_224.tgz",
+        "mobilenet_v2_1.4_224_frozen.pb",
+        "input",
+        (1, 224, 224, 3),
+        ["MobilenetV2/Predictions/Reshape_1"],
+        "NHWC",
+    ),
+    "ssd_mobilenet_v1": (
+        "object_detection/ssd_mobilenet_v1_ppn_shared_"
+        "box_predictor_300x300_coco14_sync_2018_07_03.pb",
+        None,
+        "image_tensor",
+        (1, 512, 512, 3),
+        ["detection_boxes", "detection_scores", "detection_classes"],
+        "NCHW",
+    ),
+}
+
+
+def load_graph_def(network):
+    """Download a model and add the shapes of its nodes"""
+    model_path, model_sub_path, _, _, out_nodes, _ = NETWORKS[network]
+    with tf_compat_v1.Graph().as_default():
+        graph_def = tf_testing.get_workload(model_path, model_sub_path)
+        graph_def = tf_testing.ProcessGraphDefParam(graph_def)
+        with tf_compat_v1.Session() as sess:
+            graph_def = tf_testing.AddShapesToGraphDef(sess, out_nodes)
+    return graph_def
+
+
+def import_time(network, graph_def, use_cache):
+    """Import a model once and return the elapsed time"""
+    _, _, in_node, in_shape, out_nodes, layout = NETWORKS[network]
+    evaluator = common.ConstantEvaluator()
+    evaluator.enabled = use_cache
+    tic = time.time()
+    with common.TypeInferenceContext(evaluator):
+        relay.frontend.from_tensorflow(
+            graph_def, layout=layout, shape={in_node: in_shape}, outputs=out_nodes
+        )
+    elapsed = time.time() - tic
+    return elapsed, evaluator.hits, evaluator.misses
+
+
+def benchmark(network, repeat):
+    graph_def = load_graph_def(network)
+    for use_cache in (False, True):
+        times = []
+        for _ in range(repeat):
+            elapsed, hits, misses = import_time(network, graph_def, use_cache)
+            times.append(elapsed)
+        print(
+            "%-20s cache: %-5s import time: %8.2f s (std %.2f s), "
+            "compiled functions: %d, reused: %d"
+            % (network, use_cache, np.mean(times), np.std(times), misses, hits)
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--network",
+        type=str,
+        choices=list(NETWORKS) + ["all"],
+        default="all",
+        help="The name of the network",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="The number of imports timed")
+    args = parser.parse_args()
+
+    networks = list(NETWORKS) if args.network == "all" else [args.network]
+    for name in networks:
+        benchmark(name, args.repeat)
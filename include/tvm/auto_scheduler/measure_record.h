@@ -34,7 +34,14 @@
 namespace tvm {
 namespace auto_scheduler {
 
-/*! \brief Callback for logging the input and results of measurements to file */
+/*!
+ * \brief Callback for logging the input and results of measurements to file.
+ * It also appends one line per record to the side index file (filename + ".idx"),
+ * holding the byte offset and size of the record in the log file with its error number,
+ * mean cost, target and workload key, separated by tabs.
+ * The offsets are taken from the end of the log file when it is opened, so they are only right
+ * when this callback is the single writer of the file.
+ */
 class RecordToFileNode : public MeasureCallbackNode {
  public:
   /*! \brief The name of output file. */
@@ -120,6 +127,17 @@ class RecordReader : public ObjectRef {
 void WriteMeasureRecords(std::ostream* os, const Array<MeasureInput>& inputs,
                          const Array<MeasureResult>& results);
 
+/*!
+ * \brief Append the side index entry of a measure record to an output stream.
+ * \param os A pointer to a output stream.
+ * \param offset The byte offset of the record in the log file.
+ * \param size The size of the record in bytes, including the trailing newline.
+ * \param input The MeasureInput of the record.
+ * \param result The MeasureResult of the record.
+ */
+void WriteRecordIndexEntry(std::ostream* os, int64_t offset, size_t size,
+                           const MeasureInput& input, const MeasureResult& result);
+
 /*!
  * \brief Read one measure record from a string.
  * \param str The record string to be parsed.
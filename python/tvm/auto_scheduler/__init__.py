@@ -40,7 +40,14 @@ from .measure import (
     RPCRunner,
     LocalRPCMeasureContext,
 )
-from .measure_record import RecordToFile, RecordReader, load_best, load_records, save_records
+from .measure_record import (
+    RecordToFile,
+    RecordReader,
+    RecordIndex,
+    load_best,
+    load_records,
+    save_records,
+)
 from .search_task import SearchTask
 from .search_policy import EmptyPolicy, SketchPolicy, PreloadMeasuredStates
 from .task_scheduler import TaskScheduler
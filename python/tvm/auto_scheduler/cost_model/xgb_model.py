@@ -17,9 +17,11 @@
 # pylint: disable=invalid-name
 
 """Cost model based on xgboost"""
+import hashlib
 import multiprocessing
 import logging
-from collections import defaultdict
+import threading
+from collections import defaultdict, OrderedDict
 import time
 
 import numpy as np
@@ -74,6 +76,70 @@ class XGBDMatrixContext:
 dmatrix_context = XGBDMatrixContext()
 
 
+class StateFeatureCache:
+    """A bounded cache of the per-store features of states, least recently used first out.
+    The key of a state is a hash of its task and of its printed loop structure,
+    the canonical form search policies use to detect redundant states.
+
+    Parameters
+    ----------
+    capacity: int = 20000
+        The maximum number of cached feature vectors
+    """
+
+    def __init__(self, capacity=20000):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._features = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(task, state):
+        """Get the key of a state of a task, or None if the state can not be keyed
+        (e.g. the states read from log files do not have their loop structure)
+
+        Parameters
+        ----------
+        task: SearchTask
+            The search task of the state
+        state: Union[State, StateObject]
+            The state
+
+        Returns
+        -------
+        key: Optional[bytes]
+        """
+        state_str = str(state)
+        if not state_str:
+            return None
+        ident = "%s\n%s\n%s" % (task.workload_key, task.target, state_str)
+        return hashlib.md5(ident.encode("utf-8")).digest()
+
+    def get(self, key):
+        """Get the features of a key, None if they are not cached"""
+        with self._lock:
+            if key is None or key not in self._features:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._features.move_to_end(key)
+            return self._features[key]
+
+    def put(self, key, features):
+        """Cache the features of a key"""
+        if key is None:
+            return
+        with self._lock:
+            self._features[key] = features
+            self._features.move_to_end(key)
+            while len(self._features) > self.capacity:
+                self._features.popitem(last=False)
+
+    def __len__(self):
+        return len(self._features)
+
+
 class XGBModel(PythonBasedModel):
     """Train a XGBoost model to predict the normalized throughputs of programs.
     Let the normalized throughput be the score of a program (higher is better). We predict
@@ -89,9 +155,33 @@ class XGBModel(PythonBasedModel):
     of several samples, so we implemented a custom loss function and call it pack-sum-rmse.
     It is called "pack-sum" because we combine several samples into a "pack" and sum up
     their predictions.
+
+    Parameters
+    ----------
+    verbose_eval: int = 25
+        Print training log every `verbose_eval` iterations.
+    num_warmup_sample: int = 100
+        The minimum number of samples to start to use the trained model.
+    seed: Optional[int]
+        The random seed.
+    incremental: bool = False
+        If is True, each update continues boosting from the previous booster
+        instead of training a new one from scratch.
+    window_size: Optional[int]
+        If is not None, train only on the `window_size` most recent measurement records.
+    feature_cache_size: int = 20000
+        The maximum number of states whose features are cached across updates and predictions.
     """
 
-    def __init__(self, verbose_eval=25, num_warmup_sample=100, seed=None):
+    def __init__(
+        self,
+        verbose_eval=25,
+        num_warmup_sample=100,
+        seed=None,
+        incremental=False,
+        window_size=None,
+        feature_cache_size=20000,
+    ):
         self.xgb_params = {
             "max_depth": 10,
             "gamma": 0.001,
@@ -108,6 +198,12 @@ class XGBModel(PythonBasedModel):
         self.plan_size = 32
         self.num_warmup_sample = num_warmup_sample
         self.verbose_eval = verbose_eval
+        self.incremental = incremental
+        self.window_size = window_size
+        # the training time of every update, in seconds
+        self.train_times = []
+        # the search policies of a concurrent TaskScheduler share this model across threads
+        self._lock = threading.Lock()
 
         super().__init__()
 
@@ -115,10 +211,13 @@ class XGBModel(PythonBasedModel):
         self.inputs = []
         self.results = []
         self.inputs_feature_cache = []
+        # features of the states scored by predict or measured, keyed by state hash
+        self.feature_cache = StateFeatureCache(feature_cache_size)
 
     def update(self, inputs, results):
         """Update the cost model according to new measurement results (training data).
-        XGBoost does not support incremental training, so we re-train a new model every time.
+        By default a new model is re-trained on all the records every time.
+        In incremental mode the previous booster is trained further instead.
         Parameters
         ----------
         inputs : List[MeasureInput]
@@ -129,47 +228,77 @@ class XGBModel(PythonBasedModel):
         if len(inputs) <= 0:
             return
         assert len(inputs) == len(results)
-        tic = time.time()
+        with self._lock:
+            tic = time.time()
 
-        self.inputs.extend(inputs)
-        self.results.extend(results)
+            self.inputs.extend(inputs)
+            self.results.extend(results)
 
-        # extract feature
-        n_cached = len(self.inputs_feature_cache)
-        features, normalized_throughputs, task_ids = get_per_store_features_from_measure_pairs(
-            self.inputs, self.results, skip_first_n_feature_extraction=n_cached
-        )
-        if n_cached > 0:
-            features = list(features)
-            features[:n_cached] = self.inputs_feature_cache
+            # extract feature, only for the new inputs whose states were not scored before
+            n_cached = len(self.inputs_feature_cache)
+            _, normalized_throughputs, task_ids = get_per_store_features_from_measure_pairs(
+                self.inputs, self.results, skip_first_n_feature_extraction=len(self.inputs)
+            )
+            keys = [StateFeatureCache.key(inp.task, inp.state) for inp in inputs]
+            features = list(self.inputs_feature_cache) + [self.feature_cache.get(k) for k in keys]
+            need_extract = [i for i in range(n_cached, len(features)) if features[i] is None]
+            if need_extract:
+                extracted, _, _ = get_per_store_features_from_measure_pairs(
+                    [self.inputs[i] for i in need_extract], [self.results[i] for i in need_extract]
+                )
+                for i, fea in zip(need_extract, extracted):
+                    features[i] = fea
+                    self.feature_cache.put(keys[i - n_cached], fea)
             features = np.array(features, dtype=object)
-        self.inputs_feature_cache = features
-        dtrain = pack_sum_xgbmatrix(
-            features, normalized_throughputs, task_ids, normalized_throughputs
-        )
+            self.inputs_feature_cache = features
+
+            # throughputs are normalized on all the records before keeping the most recent ones
+            if self.window_size and len(features) > self.window_size:
+                features = features[-self.window_size :]
+                normalized_throughputs = normalized_throughputs[-self.window_size :]
+                task_ids = task_ids[-self.window_size :]
+            dtrain = pack_sum_xgbmatrix(
+                features, normalized_throughputs, task_ids, normalized_throughputs
+            )
 
-        # train xgb model
-        self.bst = xgb.train(
-            self.xgb_params,
-            dtrain,
-            num_boost_round=10000,
-            obj=pack_sum_square_error,
-            callbacks=[
-                custom_callback(
-                    stopping_rounds=50,
-                    metric="tr-p-rmse",
-                    fevals=[
-                        pack_sum_rmse,
-                        pack_sum_average_peak_score(self.plan_size),
-                    ],
-                    evals=[(dtrain, "tr")],
-                    maximize=False,
-                    verbose_eval=self.verbose_eval,
-                )
-            ],
-        )
+            xgb_model = None
+            if self.incremental and self.bst is not None:
+                xgb_model = self.bst
+                # restart early stopping on the new training data
+                xgb_model.set_attr(best_score=None, best_iteration=None, best_msg=None)
+
+            # train xgb model
+            self.bst = xgb.train(
+                self.xgb_params,
+                dtrain,
+                num_boost_round=10000,
+                obj=pack_sum_square_error,
+                xgb_model=xgb_model,
+                callbacks=[
+                    custom_callback(
+                        stopping_rounds=50,
+                        metric="tr-p-rmse",
+                        fevals=[
+                            pack_sum_rmse,
+                            pack_sum_average_peak_score(self.plan_size),
+                        ],
+                        evals=[(dtrain, "tr")],
+                        maximize=False,
+                        verbose_eval=self.verbose_eval,
+                    )
+                ],
+            )
 
-        logger.info("XGBModel Training time: %.2f s", time.time() - tic)
+            self.train_times.append(time.time() - tic)
+            logger.info(
+                "XGBModel Training time: %.2f s\tsamples: %d\twarm start: %s\t"
+                "feature cache hits: %d\tmisses: %d",
+                self.train_times[-1],
+                len(features),
+                xgb_model is not None,
+                self.feature_cache.hits,
+                self.feature_cache.misses,
+            )
 
     def predict(self, task, states):
         """Predict the scores of states
@@ -184,10 +313,11 @@ class XGBModel(PythonBasedModel):
         scores: List[float]
             The predicted scores for all states
         """
-        features = get_per_store_features_from_states(states, task)
+        features = self._get_state_features(task, states)
         if self.bst is not None and len(self.inputs) > self.num_warmup_sample:
             dtest, pack_ids = feature_to_pack_sum_xgbmatrix(features)
-            raw_preds = self.bst.predict(dtest)
+            with self._lock:
+                raw_preds = self.bst.predict(dtest)
             ret = predict_throughput_pack_sum(raw_preds, pack_ids)
         else:
             ret = np.random.uniform(0, 1, (len(states),))
@@ -235,10 +365,11 @@ class XGBModel(PythonBasedModel):
         To implement this format, we also store int as float, so we can store all numbers
         into a single float array.
         """
-        features = get_per_store_features_from_states(states, task)
+        features = self._get_state_features(task, states)
         if self.bst is not None and len(self.inputs) > self.num_warmup_sample:
             dtest, pack_ids = feature_to_pack_sum_xgbmatrix(features)
-            raw_preds = self.bst.predict(dtest)
+            with self._lock:
+                raw_preds = self.bst.predict(dtest)
             breakdown = predict_throughput_pack_sum(raw_preds, pack_ids)
             stage_scores = [[] for _ in range(len(states))]
             for pred, pack_id in zip(raw_preds, pack_ids):
@@ -263,6 +394,18 @@ class XGBModel(PythonBasedModel):
 
         return breakdown
 
+    def _get_state_features(self, task, states):
+        """Get the per-store features of states, extracting only the ones not cached"""
+        keys = [StateFeatureCache.key(task, state) for state in states]
+        features = [self.feature_cache.get(k) for k in keys]
+        need_extract = [i for i, fea in enumerate(features) if fea is None]
+        if need_extract:
+            extracted = get_per_store_features_from_states([states[i] for i in need_extract], task)
+            for i, fea in zip(need_extract, extracted):
+                features[i] = fea
+                self.feature_cache.put(keys[i], fea)
+        return features
+
     def update_from_file(self, file_name, n_lines=None):
         """Load measure records from a log file to update the cost model.
         This function can be used to pre-train the cost model with history log files.
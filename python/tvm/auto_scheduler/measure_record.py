@@ -17,6 +17,12 @@
 
 """ Serialization and other I/O support for measurement records (tuning logs). """
 
+import heapq
+import json
+import logging
+import os
+from collections import namedtuple
+
 import numpy as np
 
 import tvm._ffi
@@ -26,11 +32,16 @@ from .measure import MeasureErrorNo, MeasureInput, MeasureCallback
 from .search_task import SearchTask
 from . import _ffi_api
 
+logger = logging.getLogger("auto_scheduler")
+
 
 @tvm._ffi.register_object("auto_scheduler.RecordToFile")
 class RecordToFile(MeasureCallback):
     """
     A measurement callback that writes measurement records into a file.
+    It also maintains the side index of the file used by :any:`RecordIndex`.
+    The offsets of the index are only right when this callback is the single writer
+    of the file: do not append to the same file from several processes.
 
     Parameters
     ----------
@@ -135,6 +146,7 @@ def save_records(filename, inputs, results):
 def load_best(filename, workload_key=None, target=None):
     """Return the best measurement pair form a log file. This may return none results if
     there is no legal measure pair with the specified workload_key/target found from the log file.
+    Only the best record is deserialized, it is found with the side index of the log file.
 
     Parameters
     ----------
@@ -154,27 +166,243 @@ def load_best(filename, workload_key=None, target=None):
     result : auto_scheduler.measure.MeasureResult
         The best State's MeasureResult from this log fine.
     """
-    log_reader = RecordReader(filename)
-    best_cost = 1e30
-    best_inp = None
-    best_res = None
-
-    for inp, res in log_reader:
-        if res.error_no != MeasureErrorNo.NO_ERROR:
-            continue
-        if workload_key and inp.task.workload_key != workload_key:
-            continue
-        if target and inp.task.target.kind.name != target.kind.name:
-            continue
-
-        costs = [v.value for v in res.costs]
-        cost = np.mean(costs)
-        if cost < best_cost:
-            best_cost = cost
-            best_inp = inp
-            best_res = res
-
-    return best_inp, best_res
+    best = RecordIndex(filename).query_best(workload_key, target, top_k=1)
+    if not best:
+        return None, None
+    return best[0]
+
+
+class RecordIndexEntry(
+    namedtuple("RecordIndexEntry", ["offset", "size", "error_no", "cost", "target", "workload_key"])
+):
+    """The position of a record in a log file with the fields needed to rank it.
+
+    Parameters
+    ----------
+    offset : int
+        The byte offset of the record in the log file
+    size : int
+        The size of the record in bytes
+    error_no : int
+        The error number of the measurement
+    cost : float
+        The mean cost of the measurement
+    target : str
+        The target string of the task
+    workload_key : str
+        The workload key of the task
+    """
+
+
+class RecordIndex:
+    """
+    Side index of a log file, to look up the best records of a workload key and a target
+    without deserializing the whole log file.
+
+    The index is kept in filename + ".idx", with one line per record:
+    the byte offset and size of the record in the log file, its error number, mean cost,
+    target and workload key, separated by tabs. It is appended to by :any:`RecordToFile`.
+    Records written by other means (e.g. :any:`save_records`) are indexed here
+    when the index does not cover them, before, between or after the indexed records. When the index cannot be
+    written (e.g. in a read-only directory), it is only kept in memory.
+    Remove the index to index the log file again after several processes appended to it.
+
+    Parameters
+    ----------
+    filename : str
+        The log file.
+    top_k : int = 1
+        The number of best records kept in memory for every workload key and target.
+    """
+
+    def __init__(self, filename, top_k=1):
+        self.filename = filename
+        self.index_filename = filename + ".idx"
+        self.top_k = top_k
+        # (workload_key, target) -> the number of records
+        self.counts = {}
+        # (workload_key, target) -> list of (-cost, -offset, RecordIndexEntry) of the best records
+        self.best = {}
+        self._load()
+
+    def _add(self, entry):
+        key = (entry.workload_key, entry.target)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if entry.error_no != MeasureErrorNo.NO_ERROR:
+            return
+        heap = self.best.setdefault(key, [])
+        item = (-entry.cost, -entry.offset, entry)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def _load(self):
+        # (offset, end) of the indexed records
+        spans = []
+        seen = set()
+        if os.path.isfile(self.index_filename) and os.path.isfile(self.filename):
+            log_size = os.path.getsize(self.filename)
+            with open(self.index_filename) as f:
+                for line in f:
+                    fields = line.rstrip("\n").split("\t", 5)
+                    if len(fields) != 6:
+                        continue
+                    entry = RecordIndexEntry(
+                        int(fields[0]),
+                        int(fields[1]),
+                        int(fields[2]),
+                        float(fields[3]),
+                        fields[4],
+                        fields[5],
+                    )
+                    if entry.offset + entry.size > log_size:
+                        # the log file was truncated or replaced, index it again
+                        self.counts, self.best, seen, spans = {}, {}, set(), []
+                        break
+                    if entry.offset in seen:
+                        continue
+                    seen.add(entry.offset)
+                    self._add(entry)
+                    spans.append((entry.offset, entry.offset + entry.size))
+            if not spans:
+                try:
+                    os.remove(self.index_filename)
+                except OSError:
+                    pass
+
+        if not os.path.isfile(self.filename):
+            return
+        # the index may not cover the whole log, e.g. when RecordToFile appended to a log
+        # written by other means, so the bytes between the indexed records are indexed too
+        gaps = []
+        end = 0
+        for span_offset, span_end in sorted(spans):
+            if span_offset > end:
+                gaps.append((end, span_offset))
+            end = max(end, span_end)
+        log_size = os.path.getsize(self.filename)
+        if end < log_size:
+            gaps.append((end, log_size))
+        if gaps:
+            self._index_gaps(gaps)
+
+    def _index_gaps(self, gaps):
+        """Index the records of the log file in some (start, end) byte ranges"""
+        new_entries = []
+        with open(self.filename, "rb") as f:
+            for start, end in gaps:
+                f.seek(start)
+                offset = start
+                while offset < end:
+                    line = f.readline()
+                    if not line:
+                        break
+                    entry = self._parse_line(line, offset)
+                    if entry is not None:
+                        new_entries.append(entry)
+                    offset += len(line)
+        if not new_entries:
+            return
+        for entry in new_entries:
+            self._add(entry)
+        try:
+            with open(self.index_filename, "a") as f:
+                for entry in new_entries:
+                    f.write("\t".join(str(x) for x in entry) + "\n")
+        except (IOError, OSError):
+            logger.warning(
+                "RecordIndex: Cannot write %s, keep the index in memory", self.index_filename
+            )
+        logger.info("RecordIndex: Indexed %d records of %s", len(new_entries), self.filename)
+
+    def _parse_line(self, line, offset):
+        """Get the index entry of a line of the log file, or None if it is not a record"""
+        if not line.strip() or line[:1] in (b"#", b" "):
+            return None
+        try:
+            row = json.loads(line)
+            costs, error_no = row["r"][0], row["r"][1]
+            return RecordIndexEntry(
+                offset,
+                len(line),
+                error_no,
+                float(np.mean(costs)) if costs else 1e30,
+                row["i"][0][1],
+                row["i"][0][0],
+            )
+        except (ValueError, KeyError, IndexError, TypeError):
+            logger.warning("Skip invalid record at byte %d of %s", offset, self.filename)
+            return None
+
+    def query_entries(self, workload_key=None, target=None, top_k=None):
+        """Get the index entries of the best records, sorted by increasing cost
+
+        Parameters
+        ----------
+        workload_key : Optional[str]
+            The workload key of the compute declaration. With `None`, match all workloads.
+        target : Optional[Union[tvm.target.Target, str]]
+            The target device, matched by its kind. With `None`, match all target devices.
+        top_k : Optional[int]
+            The maximum number of entries, at most the `top_k` of this index.
+
+        Returns
+        -------
+        entries : List[RecordIndexEntry]
+        """
+        kind = None
+        if target is not None:
+            kind = target if isinstance(target, str) else target.kind.name
+            kind = kind.split()[0]
+        entries = []
+        for (key, target_str), heap in self.best.items():
+            if workload_key and key != workload_key:
+                continue
+            if kind and target_str.split()[0] != kind:
+                continue
+            entries.extend(item[2] for item in heap)
+        entries.sort(key=lambda e: (e.cost, e.offset))
+        return entries[: top_k or self.top_k]
+
+    def read(self, entries):
+        """Deserialize the records of some index entries
+
+        Parameters
+        ----------
+        entries : List[RecordIndexEntry]
+            The entries to read
+
+        Returns
+        -------
+        records : List[Tuple[MeasureInput, MeasureResult]]
+        """
+        ret = []
+        with open(self.filename, "rb") as f:
+            for entry in entries:
+                f.seek(entry.offset)
+                inp, res = _ffi_api.ReadMeasureRecord(f.read(entry.size).decode())
+                ret.append((inp, res))
+        return ret
+
+    def query_best(self, workload_key=None, target=None, top_k=None):
+        """Deserialize the best records of a workload key and a target
+
+        Parameters
+        ----------
+        workload_key : Optional[str]
+            The workload key of the compute declaration. With `None`, match all workloads.
+        target : Optional[Union[tvm.target.Target, str]]
+            The target device, matched by its kind. With `None`, match all target devices.
+        top_k : Optional[int]
+            The maximum number of records, at most the `top_k` of this index.
+
+        Returns
+        -------
+        records : List[Tuple[MeasureInput, MeasureResult]]
+            The best records, sorted by increasing cost
+        """
+        return self.read(self.query_entries(workload_key, target, top_k))
 
 
 def recover_measure_input(inp, rebuild_state=False):
@@ -26,6 +26,7 @@ Programs for Deep Learning." (OSDI 2020).
 import time
 import math
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import numpy as np
 
@@ -33,7 +34,7 @@ from .search_policy import SearchPolicy, SketchPolicy
 from .cost_model import RandomModel, XGBModel
 from .utils import array_mean, to_str_round
 from .measure import ProgramMeasurer
-from .measure_record import RecordReader
+from .measure_record import RecordIndex
 
 logger = logging.getLogger("auto_scheduler")
 
@@ -159,6 +160,12 @@ class TaskScheduler:
         The parameter used for 'gradient' strategy
     backward_window_size: int = 3
         The parameter used for 'gradient' strategy
+    num_parallel_tasks: int = 1
+        The number of tasks searched and measured at the same time.
+        With more than one, every task gets its own measurer sharing the builder and the
+        runner of the tuning options, and the next task is chosen each time a search round
+        completes. This is useful when the runner dispatches to several devices,
+        e.g. a RPCRunner behind a tracker.
     """
 
     def __init__(
@@ -173,6 +180,7 @@ class TaskScheduler:
         beta: float = 2,
         gamma: float = 0.5,
         backward_window_size: int = 3,
+        num_parallel_tasks: int = 1,
     ):
         self.tasks = tasks
         self.objective_func = objective_func or sum
@@ -184,8 +192,10 @@ class TaskScheduler:
         self.beta = beta
         self.gamma = gamma
         self.backward_window_size = backward_window_size
+        self.num_parallel_tasks = num_parallel_tasks
 
         assert len(self.tasks) != 0, "No tasks"
+        assert self.num_parallel_tasks >= 1
         assert self.strategy in ["round-robin", "gradient"]
 
         # task_cts[i] saves how many times task i is tuned
@@ -199,6 +209,7 @@ class TaskScheduler:
         self.cur_score = self._compute_score(self.best_costs)
 
         self.tune_option = self.measurer = self.search_policies = self.ct = self.tic = None
+        self.measurers = None
         self.num_measures_per_round = None
         self.dead_tasks = set()
 
@@ -263,6 +274,10 @@ class TaskScheduler:
             self.load_log_file,
         )
 
+        if self.num_parallel_tasks > 1:
+            self._tune_concurrently()
+            return
+
         # do a round robin first to warm up
         for i in range(len(self.tasks)):
             self._tune_task(i)
@@ -270,72 +285,144 @@ class TaskScheduler:
         # use the specific strategy to choose workload to tune
         task_idx = -1
         while self.ct < tune_option.num_measure_trials and len(self.dead_tasks) < len(self.tasks):
-            if self.strategy == "round-robin":
-                task_idx = (task_idx + 1) % len(self.tasks)
-                while task_idx in self.dead_tasks:
-                    task_idx = (task_idx + 1) % len(self.tasks)
-            elif self.strategy == "gradient":
-                gradients = []
-                for i in range(len(self.tasks)):
-                    if i in self.dead_tasks:
-                        gradients.append(0)
-                        continue
-
-                    # compute gradient from chain rule : (delta f / delta g_i)
-                    delta = 1e-7
-                    new_costs = list(self.best_costs)
-                    new_costs[i] -= delta
-                    chain_grad = (
-                        self._compute_score(self.best_costs) - self._compute_score(new_costs)
-                    ) / delta
-
-                    # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
-                    if (
-                        self.task_cts[i] - 1 < len(self.task_costs_history[i])
-                        and self.task_cts[i] - 1 - self.backward_window_size >= 0
-                    ):
-                        backward_grad = (
-                            self.task_costs_history[i][self.task_cts[i] - 1]
-                            - self.task_costs_history[i][
-                                self.task_cts[i] - 1 - self.backward_window_size
-                            ]
-                        ) / self.backward_window_size
-                    else:
-                        backward_grad = 0
-
-                    # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
-                    g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
-
-                    g_next_2 = self.beta * 1e30
-                    group_id = self.tag_to_group_id.get(self.task_tags[i], None)
-                    if group_id is not None and len(self.group_task_ids[group_id]) > 1:
-                        best_flops = max(
-                            [
-                                self.flop_cts[j] / self.best_costs[j]
-                                for j in self.group_task_ids[group_id]
-                            ]
-                        )
-                        g_next_2 = self.beta * self.flop_cts[i] / best_flops
-
-                    g_next = min(g_next_1, g_next_2)
-                    forward_grad = g_next - self.best_costs[i]
-
-                    # combine all grads
-                    grad = chain_grad * (
-                        self.alpha * backward_grad + (1 - self.alpha) * forward_grad
-                    )
-                    assert grad <= 0
-                    gradients.append(grad)
+            task_idx = self._choose_task(task_idx)
+            self._tune_task(task_idx)
+            self._adjust_similarity_group(task_idx)
+
+    def _choose_task(self, last_task_idx, busy_tasks=()):
+        """Use the specific strategy to choose the next task to tune, among the tasks
+        that are not in busy_tasks. Return None if there is no task to choose."""
+        if len(self.dead_tasks.union(busy_tasks)) >= len(self.tasks):
+            return None
 
-                if max(gradients) == min(gradients):
-                    task_idx = np.random.choice(len(gradients))
+        if self.strategy == "round-robin":
+            task_idx = (last_task_idx + 1) % len(self.tasks)
+            while task_idx in self.dead_tasks or task_idx in busy_tasks:
+                task_idx = (task_idx + 1) % len(self.tasks)
+        elif self.strategy == "gradient":
+            gradients = []
+            for i in range(len(self.tasks)):
+                if i in self.dead_tasks or i in busy_tasks:
+                    gradients.append(0)
+                    continue
+
+                # compute gradient from chain rule : (delta f / delta g_i)
+                delta = 1e-7
+                new_costs = list(self.best_costs)
+                new_costs[i] -= delta
+                chain_grad = (
+                    self._compute_score(self.best_costs) - self._compute_score(new_costs)
+                ) / delta
+
+                # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
+                if (
+                    self.task_cts[i] - 1 < len(self.task_costs_history[i])
+                    and self.task_cts[i] - 1 - self.backward_window_size >= 0
+                ):
+                    backward_grad = (
+                        self.task_costs_history[i][self.task_cts[i] - 1]
+                        - self.task_costs_history[i][
+                            self.task_cts[i] - 1 - self.backward_window_size
+                        ]
+                    ) / self.backward_window_size
                 else:
-                    task_idx = np.argmin(gradients)
+                    backward_grad = 0
+
+                # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
+                g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
+
+                g_next_2 = self.beta * 1e30
+                group_id = self.tag_to_group_id.get(self.task_tags[i], None)
+                if group_id is not None and len(self.group_task_ids[group_id]) > 1:
+                    best_flops = max(
+                        [
+                            self.flop_cts[j] / self.best_costs[j]
+                            for j in self.group_task_ids[group_id]
+                        ]
+                    )
+                    g_next_2 = self.beta * self.flop_cts[i] / best_flops
+
+                g_next = min(g_next_1, g_next_2)
+                forward_grad = g_next - self.best_costs[i]
+
+                # combine all grads
+                grad = chain_grad * (self.alpha * backward_grad + (1 - self.alpha) * forward_grad)
+                assert grad <= 0
+                gradients.append(grad)
+
+            if max(gradients) == min(gradients):
+                task_idx = np.random.choice(
+                    [
+                        i
+                        for i in range(len(self.tasks))
+                        if i not in self.dead_tasks and i not in busy_tasks
+                    ]
+                )
             else:
-                raise ValueError("Invalid strategy: " + self.strategy)
+                task_idx = np.argmin(gradients)
+        else:
+            raise ValueError("Invalid strategy: " + self.strategy)
+        return task_idx
+
+    def _tune_concurrently(self):
+        """Keep up to num_parallel_tasks search rounds in flight,
+        choosing the next task every time one of them completes"""
+        tune_option = self.tune_option
+        self.measurers = [
+            ProgramMeasurer(
+                tune_option.builder,
+                tune_option.runner,
+                tune_option.measure_callbacks,
+                tune_option.verbose,
+            )
+            for _ in self.tasks
+        ]
 
-            self._tune_task(task_idx)
-            self._adjust_similarity_group(task_idx)
+        # do a round robin first to warm up
+        warm_up = list(range(len(self.tasks)))
+        warm_up_futures = set()
+        in_flight = {}  # future -> task id
+        task_idx = -1
+        with ThreadPoolExecutor(max_workers=self.num_parallel_tasks) as executor:
+            while True:
+                while len(in_flight) < self.num_parallel_tasks:
+                    busy_tasks = set(in_flight.values())
+                    is_warm_up = bool(warm_up)
+                    if is_warm_up:
+                        next_idx = warm_up.pop(0)
+                    elif (
+                        self.ct + len(in_flight) * self.num_measures_per_round
+                        < tune_option.num_measure_trials
+                    ):
+                        next_idx = self._choose_task(task_idx, busy_tasks)
+                    else:
+                        next_idx = None
+                    if next_idx is None:
+                        break
+                    task_idx = next_idx
+                    if self.verbose >= 1:
+                        logger.info("TaskScheduler: task id:\t%d", task_idx)
+                    future = executor.submit(
+                        self.search_policies[task_idx].continue_search_one_round,
+                        self.num_measures_per_round,
+                        self.measurers[task_idx],
+                    )
+                    in_flight[future] = task_idx
+                    if is_warm_up:
+                        warm_up_futures.add(future)
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(list(in_flight.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = in_flight.pop(future)
+                    measure_inputs, measure_results = future.result()
+                    self._update_task(idx, measure_inputs, measure_results)
+                    if future in warm_up_futures:
+                        warm_up_futures.remove(future)
+                    else:
+                        self._adjust_similarity_group(idx)
 
     def _tune_task(self, task_idx):
         """Tune the select task for one round"""
@@ -344,7 +431,10 @@ class TaskScheduler:
         measure_inputs, measure_results = self.search_policies[task_idx].continue_search_one_round(
             self.num_measures_per_round, self.measurer
         )
+        self._update_task(task_idx, measure_inputs, measure_results)
 
+    def _update_task(self, task_idx, measure_inputs, measure_results):
+        """Update the status of a task with the results of one search round"""
         for res in measure_results:
             cost = array_mean(res.costs)
             if cost < self.best_costs[task_idx]:
@@ -398,19 +488,20 @@ class TaskScheduler:
         """restore task_cts and best_costs from a log file"""
         str_target = str(self.tasks[0].target)
         workload_key_to_task_id = {t.workload_key: i for i, t in enumerate(self.tasks)}
-        total_ct = -1
+        index = RecordIndex(log_file)
 
-        for total_ct, (inp, res) in enumerate(RecordReader(log_file)):
-            if str(inp.task.target) != str_target:
+        # only the side index of the log file is read, no record is deserialized
+        for (workload_key, target), count in index.counts.items():
+            if target != str_target:
                 continue
-            task_idx = workload_key_to_task_id.get(inp.task.workload_key, None)
+            task_idx = workload_key_to_task_id.get(workload_key, None)
             if task_idx is None:
                 continue
 
-            if res.error_no == 0:
-                self.best_costs[task_idx] = min(self.best_costs[task_idx], array_mean(res.costs))
+            for _, _, entry in index.best.get((workload_key, target), []):
+                self.best_costs[task_idx] = min(self.best_costs[task_idx], entry.cost)
 
-            self.task_cts[task_idx] += 1
+            self.task_cts[task_idx] += count
 
         for i in range(len(self.tasks)):
             # The computation of taks_cts is just an estimation.
@@ -419,4 +510,8 @@ class TaskScheduler:
             self.task_cts[i] = int(self.task_cts[i] / num_measures_per_round + 0.5)
             self.task_costs_history[i].append(self.best_costs[i])
 
-        logger.info("TaskScheduler: Loaded %d measurement records from %s", total_ct + 1, log_file)
+        logger.info(
+            "TaskScheduler: Loaded %d measurement records from %s",
+            sum(index.counts.values()),
+            log_file,
+        )
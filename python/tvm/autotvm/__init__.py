@@ -31,6 +31,7 @@ from . import database
 from . import feature
 from . import measure
 from . import record
+from . import record_store
 from . import task
 from . import tuner
 from . import util
@@ -61,6 +62,7 @@ from .task import (
     DispatchContext,
     FallbackContext,
     ApplyHistoryBest as apply_history_best,
+    ApplyIndexedHistoryBest as apply_indexed_history_best,
     ApplyGraphBest as apply_graph_best,
 )
 from .env import GLOBAL_SCOPE
@@ -19,6 +19,7 @@
 Database of MeasureInput/MeasureResult pair.
 This can be used for replaying measurement.
 """
+import fnmatch
 import os
 
 from .record import encode, decode, measure_str_key
@@ -202,3 +203,199 @@ class DummyDatabase(RedisDatabase):
 
     def flush(self):
         self.db = {}
+
+
+class RedisListDatabase(Database):
+    """
+    Redis version of record database where the results of an input are kept
+    in a native redis list. Saving a record is a single RPUSH instead of
+    rewriting the whole value, batches of records are written through one
+    pipeline and filtering streams the keys with SCAN.
+
+    Parameters
+    ----------
+    db_index: int, optional
+        The index of the redis database, see RedisDatabase
+    client: optional
+        A redis client. By default a client to the fleet host is created.
+    batch_size: int, optional
+        The number of keys fetched by a SCAN step and read by one pipeline.
+    """
+
+    KEY_PREFIX = "autotvm:"
+
+    def __init__(self, db_index=RedisDatabase.REDIS_PROD, client=None, batch_size=512):
+        if client is None:
+            # pylint: disable=import-outside-toplevel
+            import redis
+
+            if db_index == RedisDatabase.REDIS_TEST:
+                host = "localhost"
+            else:
+                host = os.environ.get("TVM_FLEET_HOST")
+            client = redis.StrictRedis(host=host, port=6379, db=db_index)
+        self.db = client
+        self.db_index = db_index
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _key(inp):
+        return RedisListDatabase.KEY_PREFIX + measure_str_key(inp)
+
+    @staticmethod
+    def _decode_rows(rows):
+        records = [decode(x.decode() if isinstance(x, bytes) else x) for x in rows]
+        return [rec for rec in records if rec is not None]
+
+    def load(self, inp, get_all=False):
+        records = self._decode_rows(self.db.lrange(self._key(inp), 0, -1))
+        if not records:
+            return None
+        results = [rec[1] for rec in records]
+        if get_all:
+            return results
+        return max(results, key=lambda result: result.timestamp)
+
+    def save(self, inp, res, extend=False):
+        self.save_batch([(inp, res)], extend)
+
+    def save_batch(self, records, extend=True):
+        """
+        Save a batch of records with a single round trip to the server
+
+        Parameters
+        ----------
+        records: iterable of (MeasureInput, MeasureResult)
+            The records to save
+        extend: bool, optional
+            Whether to extend existing MeasureResults if they exist
+        """
+        pipe = self.db.pipeline(transaction=False)
+        replaced = set()
+        for inp, res in records:
+            key = self._key(inp)
+            if not extend and key not in replaced:
+                pipe.delete(key)
+                replaced.add(key)
+            pipe.rpush(key, encode(inp, res))
+        pipe.execute()
+
+    def _scan(self):
+        """Generator: yield (key, rows) for all the keys of the database, batch by batch"""
+
+        def _fetch(keys):
+            pipe = self.db.pipeline(transaction=False)
+            for key in keys:
+                pipe.lrange(key, 0, -1)
+            return zip(keys, pipe.execute())
+
+        keys = []
+        match = RedisListDatabase.KEY_PREFIX + "*"
+        for key in self.db.scan_iter(match=match, count=self.batch_size):
+            keys.append(key)
+            if len(keys) >= self.batch_size:
+                for item in _fetch(keys):
+                    yield item
+                keys = []
+        if keys:
+            for item in _fetch(keys):
+                yield item
+
+    def iter_filter(self, func):
+        """
+        Generator: stream the records that match the given rule.
+        See filter for the signature of func.
+        """
+        for _, rows in self._scan():
+            try:
+                records = self._decode_rows(rows)
+            except (TypeError, ValueError):  # got a badly formatted/old format record
+                continue
+            if not records:
+                continue
+            inps, results = zip(*records)
+            inp = inps[0]
+            if not func(inp, results):
+                continue
+            yield inp, max(results, key=lambda res: res.timestamp)
+
+    def filter(self, func):
+        """
+        Dump all of the records that match the given rule
+
+        Parameters
+        ----------
+        func: callable
+            The signature of the function is (MeasureInput, [MeasureResult]) -> bool
+
+        Returns
+        -------
+        list of records in tuple (MeasureInput, MeasureResult) matching the rule
+        """
+        return list(self.iter_filter(func))
+
+    def flush(self):
+        self.db.flushdb()
+
+
+class _DummyRedisPipeline(object):
+    """Pipeline of _DummyRedis, queueing commands until execute"""
+
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def _queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        commands, self._commands = self._commands, []
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+class _DummyRedis(object):
+    """A minimal in-process stand-in of the redis list commands for testing"""
+
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+        return len(self.lists[key])
+
+    def lrange(self, key, start, end):
+        values = self.lists.get(key, [])
+        return values[start:] if end == -1 else values[start : end + 1]
+
+    def delete(self, *keys):
+        return sum(self.lists.pop(key, None) is not None for key in keys)
+
+    def scan_iter(self, match=None, count=None):
+        # pylint: disable=unused-argument
+        for key in list(self.lists.keys()):
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key
+
+    def pipeline(self, transaction=True):
+        # pylint: disable=unused-argument
+        return _DummyRedisPipeline(self)
+
+    def flushdb(self):
+        self.lists = {}
+
+
+class DummyListDatabase(RedisListDatabase):
+    """
+    A list-structured database backed by an in-process fake of redis for testing.
+    """
+
+    def __init__(self, batch_size=512):
+        super(DummyListDatabase, self).__init__(
+            RedisDatabase.REDIS_TEST, client=_DummyRedis(), batch_size=batch_size
+        )
@@ -26,4 +26,4 @@ from .measure import (
 from .measure_methods import LocalBuilder, LocalRunner, RPCRunner, request_remote, KLocalRunner, KLocalBuilder
 from .executor import Executor
 from .local_executor import LocalExecutor
-from .klocal_executor import KLocalExecutor
+from .klocal_executor import KLocalExecutor, KLocalWorkerExecutor
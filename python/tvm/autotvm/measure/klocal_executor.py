@@ -76,6 +76,114 @@ class KLocalFuture(executor.Future):
         return self.res
 
 
+def _kworker_loop(target, job_queue, result_queue):
+    """Serve jobs forever on a single device context opened once at startup"""
+    ctx = tvm.context(str(target))
+    if not ctx.exist:
+        result_queue.put(
+            RuntimeError(
+                "Cannot get context from local devices. "
+                "Please check you have a suitable device for target: %s" % target
+            )
+        )
+        return
+    result_queue.put(None)  # signal that the context is ready
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+        func, args, kwargs = job
+        try:
+            res = func(ctx, *args, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            res = exc
+        result_queue.put(res)
+
+
+class KLocalWorker(object):
+    """A long-lived process owning the device context of one target.
+
+    The context is initialized once when the process starts and reused by every
+    job. The process is recycled only when a job times out or the worker crashes.
+
+    Parameters
+    ----------
+    target: str
+        The target whose context is opened by the worker
+    timeout: float
+        timeout of a job. If time is out, the worker is killed and restarted lazily.
+    poll_interval: float, optional
+        Interval used to check the liveness of the worker while waiting for a result.
+    """
+
+    def __init__(self, target, timeout, poll_interval=0.1):
+        self.target = str(target)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._process = None
+        self._job_queue = None
+        self._result_queue = None
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def _start(self):
+        self._job_queue = Queue()
+        self._result_queue = Queue()
+        self._process = Process(
+            target=_kworker_loop, args=(self.target, self._job_queue, self._result_queue)
+        )
+        self._process.start()
+        return self._wait_result(self.timeout)
+
+    def _wait_result(self, timeout):
+        """Wait for the next result, returning an error if the worker dies or hangs"""
+        tic = time.time()
+        while True:
+            try:
+                return self._result_queue.get(block=True, timeout=self.poll_interval)
+            except Empty:
+                pass
+            if not self._process.is_alive():
+                # the worker may have pushed its result right before exiting
+                try:
+                    return self._result_queue.get(block=True, timeout=self.poll_interval)
+                except Empty:
+                    exitcode = self._process.exitcode
+                    self.terminate()
+                    return executor.ExecutionError(
+                        "Device worker exited with code %s" % str(exitcode)
+                    )
+            if time.time() - tic > timeout:
+                self.terminate()
+                return executor.TimeoutError()
+
+    def call(self, func, args, kwargs):
+        """Run func(ctx, *args, **kwargs) in the worker and return its result or an error"""
+        if not self.is_alive():
+            err = self._start()
+            if err is not None:
+                self.terminate()
+                return err
+        self._job_queue.put((func, args, kwargs))
+        return self._wait_result(self.timeout)
+
+    def terminate(self):
+        """Stop the worker and release the device"""
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            kill_child_processes(self._process.pid)
+            self._process.terminate()
+        self._process.join()
+        for queue in (self._job_queue, self._result_queue):
+            queue.close()
+            queue.join_thread()
+        self._process = None
+        self._job_queue = None
+        self._result_queue = None
+
+
 class KLocalExecutor(LocalExecutor):
     """Local executor that runs workers on the same machine with multiprocessing
     but the initialisation is done in the measured process and is guaranted that
@@ -95,3 +203,36 @@ class KLocalExecutor(LocalExecutor):
         queue = Queue(2)  # Size of 2 to avoid a race condition with size 1.
         return kcall_with_timeout(queue, self.timeout, func, target, args, kwargs)
 
+
+class KLocalWorkerExecutor(LocalExecutor):
+    """Executor that keeps one warm worker process per executor for device jobs.
+
+    Contrary to KLocalExecutor, the device context is opened once and kept alive
+    across jobs. The worker is recycled on timeout or crash, or when a job for
+    another target is submitted. Jobs are run synchronously so only one process
+    touches the device at a time.
+
+    Parameters
+    ----------
+    timeout: float, optional
+        timeout of a job. If time is out. A TimeoutError will be returned (not raised)
+    """
+
+    def __init__(self, timeout=None):
+        super(KLocalWorkerExecutor, self).__init__(timeout=timeout, do_fork=True)
+        self._worker = None
+
+    def submit(self, func, target, *args, **kwargs):
+        if self._worker is None or self._worker.target != str(target):
+            self.shutdown()
+            self._worker = KLocalWorker(target, self.timeout)
+        return local_executor.LocalFutureNoFork(self._worker.call(func, args, kwargs))
+
+    def shutdown(self):
+        """Terminate the worker process if any"""
+        if self._worker is not None:
+            self._worker.terminate()
+            self._worker = None
+
+    def __del__(self):
+        self.shutdown()
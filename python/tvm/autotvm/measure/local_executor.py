@@ -107,6 +107,19 @@ class LocalFuture(executor.Future):
         del self._process
         return res
 
+    def cancel(self):
+        """Kill the process running this task, the result is never got"""
+        if not hasattr(self, "_process"):  # the result was got
+            return
+        if self._process.is_alive():
+            kill_child_processes(self._process.pid)
+            self._process.terminate()
+        self._process.join()
+        self._queue.close()
+        self._done = True
+        del self._queue
+        del self._process
+
 
 class LocalFutureNoFork(executor.Future):
     """Local wrapper for the future.
@@ -123,6 +136,9 @@ class LocalFutureNoFork(executor.Future):
     def get(self, timeout=None):
         return self._result
 
+    def cancel(self):
+        pass
+
 
 class LocalExecutor(executor.Executor):
     """Local executor that runs workers on the same machine with multiprocessing.
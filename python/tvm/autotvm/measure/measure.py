@@ -269,6 +269,16 @@ def create_measure_batch(task, option):
         logging.debug("measure_batch returning with results")
         return results
 
+    def build(measure_inputs, tmp_dir=None):
+        """Build a batch, into tmp_dir if given and if the builder writes its files
+        into a directory it owns, so that the files of a batch outlive the next build"""
+        if tmp_dir is not None and hasattr(builder, "tmp_dir"):
+            return builder.build(measure_inputs, tmp_dir=tmp_dir)
+        return builder.build(measure_inputs)
+
     measure_batch.n_parallel = builder.n_parallel
+    # expose both stages so that callers can overlap builds and runs
+    measure_batch.build = build
+    measure_batch.run = runner.run
     measure_batch.attach_objects = attach_objects
     return measure_batch
@@ -28,6 +28,8 @@ import os
 import threading
 import time
 from random import getrandbits
+from multiprocessing import Queue
+from queue import Empty
 from collections import namedtuple
 import tempfile
 
@@ -45,9 +47,10 @@ from ..util import get_const_tuple
 from ..env import AutotvmGlobalScope
 from ..task.space import InstantiationError
 
+from . import executor
 from .measure import MeasureResult, MeasureErrorNo, Builder, Runner
 from .local_executor import LocalExecutor
-from .klocal_executor import KLocalExecutor
+from .klocal_executor import KLocalExecutor, KLocalWorkerExecutor
 logger = logging.getLogger('autotvm')
 
 class BuildResult(namedtuple("BuildResult", ('filename', 'arg_info', 'error', 'time_cost'))):
@@ -96,16 +99,28 @@ class LocalBuilder(Builder):
         self.executor = LocalExecutor(timeout=timeout)
         self.tmp_dir = tempfile.mkdtemp()
 
-    def build(self, measure_inputs):
+    def build(self, measure_inputs, tmp_dir=None):
+        """Build the programs of a batch
+
+        Parameters
+        ----------
+        measure_inputs: List[MeasureInput]
+            The inputs to build
+        tmp_dir: str, optional
+            The directory of the built files, owned by the caller. By default the files
+            are written to a new directory which replaces the one of the previous batch.
+        """
         results = []
 
-        shutil.rmtree(self.tmp_dir, ignore_errors=True)
-        self.tmp_dir = tempfile.mkdtemp()
+        if tmp_dir is None:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+            self.tmp_dir = tempfile.mkdtemp()
+            tmp_dir = self.tmp_dir
 
         for i in range(0, len(measure_inputs), self.n_parallel):
             futures = []
             for inp in measure_inputs[i : i + self.n_parallel]:
-                ret = self.executor.submit(self.build_func, inp, self.tmp_dir, **self.build_kwargs)
+                ret = self.executor.submit(self.build_func, inp, tmp_dir, **self.build_kwargs)
                 futures.append(ret)
 
             for future in futures:
@@ -204,6 +219,11 @@ class RPCRunner(Runner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool, optional
+        Whether each of the `n_parallel` workers leases one device session from the tracker
+        and reuses it for all the measurements it runs in a batch, instead of requesting a
+        new session and reconnecting to the device for every measurement.
+        The session is requested again after a runtime error on the device.
     """
 
     def __init__(
@@ -220,6 +240,7 @@ class RPCRunner(Runner):
         cooldown_interval=0.1,
         check_correctness=False,
         enable_cpu_cache_flush=False,
+        reuse_session=False,
     ):
         super(RPCRunner, self).__init__(timeout, n_parallel)
 
@@ -238,6 +259,7 @@ class RPCRunner(Runner):
         self.enable_cpu_cache_flush = enable_cpu_cache_flush
         self.check_correctness = check_correctness
         self.cooldown_interval = cooldown_interval
+        self.reuse_session = reuse_session
 
         self.executor = LocalExecutor()
 
@@ -294,6 +316,9 @@ class RPCRunner(Runner):
         return kwargs
 
     def run(self, measure_inputs, build_results):
+        if self.reuse_session:
+            return self._run_batches(measure_inputs, build_results)
+
         results = []
         remote_args = (self.key, self.host, self.port, self.priority, self.timeout)
 
@@ -330,6 +355,72 @@ class RPCRunner(Runner):
 
         return results
 
+    def _run_batches(self, measure_inputs, build_results):
+        """Split the inputs over `n_parallel` workers, each running its share
+        through one leased session"""
+        remote_args = (self.key, self.host, self.port, self.priority, self.timeout)
+        n_workers = max(1, min(self.n_parallel, len(measure_inputs)))
+        # a worker runs its whole batch before returning, so the job timeout grows with it
+        batch_size = (len(measure_inputs) + n_workers - 1) // n_workers
+        batch_executor = LocalExecutor(
+            timeout=max(self.executor.timeout, (self.timeout + self.cooldown_interval) * batch_size)
+        )
+
+        # the workers report each result as soon as it is measured
+        progress = Queue()
+        futures = []
+        for k in range(n_workers):
+            futures.append(
+                batch_executor.submit(
+                    run_batch_through_rpc,
+                    measure_inputs[k::n_workers],
+                    build_results[k::n_workers],
+                    self.number,
+                    self.repeat,
+                    self.min_repeat_ms,
+                    self.cooldown_interval,
+                    remote_args,
+                    self.ref_input,
+                    self.ref_output,
+                    self.enable_cpu_cache_flush,
+                    progress=(progress, k),
+                )
+            )
+
+        # every candidate gets the timeout of a job of `run`
+        results = [None] * len(measure_inputs)
+        deadlines = {k: time.time() + self.executor.timeout for k in range(n_workers)}
+        while True:
+            try:
+                k, i, res = progress.get(timeout=0.1 if deadlines else 0)
+                results[k + i * n_workers] = res
+                if k in deadlines:
+                    deadlines[k] = time.time() + self.executor.timeout
+            except Empty:
+                if not deadlines:
+                    break
+            now = time.time()
+            for k in [k for k in deadlines if futures[k].done() or deadlines[k] < now]:
+                del deadlines[k]
+
+        for k, future in enumerate(futures):
+            if future.done():
+                res = future.get()
+            else:  # the candidate in flight hangs
+                future.cancel()
+                res = executor.TimeoutError()
+            if isinstance(res, Exception):  # executor error or timeout
+                # keep the results measured before the error
+                for j in range(k, len(measure_inputs), n_workers):
+                    if results[j] is None:
+                        results[j] = MeasureResult(
+                            (str(res),), MeasureErrorNo.RUN_TIMEOUT, self.timeout, time.time()
+                        )
+            else:
+                results[k::n_workers] = res
+        progress.close()
+        return results
+
 
 class LocalRunner(RPCRunner):
     """Run generated code on local devices.
@@ -539,6 +630,7 @@ def run_through_rpc(
     ref_input=None,
     ref_output=None,
     enable_cpu_cache_flush=False,
+    remote=None,
 ):
     """Run a generated library through rpc
 
@@ -578,6 +670,9 @@ def run_through_rpc(
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    remote: RPCSession, optional
+        The session to run in, the module being already uploaded to it.
+        By default, a new session is requested with remote_args and the module is uploaded.
     """
     if isinstance(build_result, MeasureResult):
         return build_result
@@ -586,7 +681,9 @@ def run_through_rpc(
     errno = MeasureErrorNo.NO_ERROR
     try:
         # upload built module
-        remote = request_remote(*remote_args)
+        uploaded = remote is not None
+        if not uploaded:
+            remote = request_remote(*remote_args)
         # Program the FPGA every single time when targeting VTA
         if (
             hasattr(measure_input.target, "device_name")
@@ -597,7 +694,8 @@ def run_through_rpc(
 
             program_fpga(remote, None)
             reconfig_runtime(remote)
-        remote.upload(build_result.filename)
+        if not uploaded:
+            remote.upload(build_result.filename)
         func = remote.load_module(os.path.split(build_result.filename)[1])
         ctx = remote.context(str(measure_input.target), 0)
 
@@ -662,6 +760,105 @@ def run_through_rpc(
     return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
 
 
+def run_batch_through_rpc(
+    measure_inputs,
+    build_results,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    remote_args,
+    ref_input=None,
+    ref_output=None,
+    enable_cpu_cache_flush=False,
+    progress=None,
+):
+    """Run several generated libraries through one leased rpc session.
+    The libraries are uploaded at once in an archive, and uploaded again to the new session
+    requested after a runtime error on the device.
+
+    Parameters
+    ----------
+    measure_inputs: List of MeasureInput
+        The raw measure inputs
+    build_results: List of BuildResult
+        The results returned from Builder
+    remote_args: Tuple
+        The argument for request_remote. The timeout is for each measurement.
+    progress: Tuple of multiprocessing.Queue and int, optional
+        A queue and an id. When set, `(id, i, result)` is put to the queue as soon as
+        the i-th input is measured.
+
+    The other parameters are the ones of :any:`run_through_rpc`.
+
+    Returns
+    -------
+    results: List of MeasureResult
+    """
+    device_key, host, port, priority, timeout = remote_args
+    host = host or os.environ["TVM_TRACKER_HOST"]
+    port = port or int(os.environ["TVM_TRACKER_PORT"])
+
+    tracker = _rpc.connect_tracker(host, port)
+    results = []
+
+    def _append(res):
+        if progress is not None:
+            progress[0].put((progress[1], len(results), res))
+        results.append(res)
+
+    with tracker.lease(
+        device_key, priority=priority, session_timeout=timeout * len(measure_inputs)
+    ) as lease:
+        uploaded = None
+        for i, (measure_input, build_result) in enumerate(zip(measure_inputs, build_results)):
+            if isinstance(build_result, MeasureResult):
+                _append(build_result)
+                continue
+
+            remote = lease.session()
+            if remote is not uploaded:
+                # upload the libraries left to run in one round trip
+                files = [x.filename for x in build_results[i:] if isinstance(x, BuildResult)]
+                try:
+                    remote.upload_archive(files)
+                    uploaded = remote
+                except TVMError as exc:
+                    logger.warning("Failed to upload the libraries: %s", exc)
+                    # drop the session before the next one is requested, a device serves
+                    # one session at a time
+                    remote = uploaded = None
+                    lease.release()
+                    _append(
+                        MeasureResult(
+                            (RuntimeError(str(exc)[:1024]),),
+                            MeasureErrorNo.RUNTIME_DEVICE,
+                            build_result.time_cost,
+                            time.time(),
+                        )
+                    )
+                    continue
+
+            res = run_through_rpc(
+                measure_input,
+                build_result,
+                number,
+                repeat,
+                min_repeat_ms,
+                cooldown_interval,
+                remote_args,
+                ref_input,
+                ref_output,
+                enable_cpu_cache_flush,
+                remote=remote,
+            )
+            if res.error_no == MeasureErrorNo.RUNTIME_DEVICE:
+                remote = uploaded = None
+                lease.release()
+            _append(res)
+    return results
+
+
 def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
     """Request a remote session
 
@@ -776,8 +973,8 @@ def gpu_verify_pass(**kwargs):
 
 class KLocalBuilder(LocalBuilder):
     """Run compilation on local machine in a separated thread.
-    Less effective than LocalBuilder but made for environments that don't support
-    multiprocess device interactions.
+    By default less effective than LocalBuilder but made for environments that don't
+    support multiprocess device interactions.
 
     Parameters
     ----------
@@ -787,9 +984,18 @@ class KLocalBuilder(LocalBuilder):
         If is 'default', use default build function
         If is 'ndk', use function for android ndk
         If is callable, use it as custom build function, expect lib_format field.
+    n_parallel: int, optional
+        The number of builds run in parallel. "None" will use all cpu cores.
+        With the default value of 1, every build runs alone in a process that owns
+        the device context. Otherwise builds fan out over host processes that never
+        open the device, which leaves the exclusive device access to KLocalRunner.
     """
-    def __init__(self, timeout=10, build_func='default'):
-        super(KLocalBuilder, self).__init__(timeout, 1, build_func)
+    def __init__(self, timeout=10, build_func='default', n_parallel=1):
+        super(KLocalBuilder, self).__init__(timeout, n_parallel, build_func)
+        self.parallel = self.n_parallel > 1
+        if self.parallel:
+            # builds do not need the device: keep LocalBuilder's executor and build_func
+            return
         if isinstance(build_func, str):
             if build_func == 'default':
                 build_func = tar.tar
@@ -800,11 +1006,16 @@ class KLocalBuilder(LocalBuilder):
         self.executor = KLocalExecutor(timeout=timeout)
         self.build_func = _KWrappedBuildFunc(build_func)
 
-    def build(self, measure_inputs):
+    def build(self, measure_inputs, tmp_dir=None):
+        if self.parallel:
+            return super(KLocalBuilder, self).build(measure_inputs, tmp_dir)
+
         results = []
 
-        shutil.rmtree(self.tmp_dir, ignore_errors=True)
-        self.tmp_dir = tempfile.mkdtemp()
+        if tmp_dir is None:
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+            self.tmp_dir = tempfile.mkdtemp()
+            tmp_dir = self.tmp_dir
 
         for i in range(0, len(measure_inputs), self.n_parallel):
             futures = []
@@ -812,7 +1023,7 @@ class KLocalBuilder(LocalBuilder):
                 ret = self.executor.submit(self.build_func,
                                            str(inp.target),
                                            inp,
-                                           self.tmp_dir,
+                                           tmp_dir,
                                            **self.build_kwargs)
                 futures.append(ret)
 
@@ -881,6 +1092,10 @@ class KLocalRunner(Runner):
         Whether check correctness after measurement. This will use llvm cpu target to
         call your template and get the reference output.
         This can work for TOPI templates, but may not work for your custom template.
+    persistent_worker: bool, optional
+        Keep a single warm worker process that opens the device context once and
+        serves all the measurements. The worker is recycled on timeout or crash.
+        Otherwise a fresh process is forked for every measurement.
 
     Notes
     -----
@@ -890,7 +1105,7 @@ class KLocalRunner(Runner):
     def __init__(self,
                  timeout=10, n_parallel=1,
                  number=4, repeat=3, min_repeat_ms=0, cooldown_interval=0.1,
-                 check_correctness=False):
+                 check_correctness=False, persistent_worker=False):
         super(KLocalRunner, self).__init__(timeout, n_parallel)
 
         self.timeout = timeout
@@ -904,7 +1119,10 @@ class KLocalRunner(Runner):
         self.check_correctness = check_correctness
         self.cooldown_interval = cooldown_interval
 
-        self.executor = KLocalExecutor(timeout=timeout, do_fork=False)
+        if persistent_worker:
+            self.executor = KLocalWorkerExecutor(timeout=timeout)
+        else:
+            self.executor = KLocalExecutor(timeout=timeout, do_fork=False)
         self.target = None
 
     def set_task(self, task):
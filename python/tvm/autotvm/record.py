@@ -20,6 +20,8 @@
 
 import argparse
 import base64
+import hashlib
+import heapq
 import logging
 import multiprocessing
 import pickle
@@ -27,7 +29,7 @@ import json
 import time
 import os
 import itertools
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 import numpy as np
 
 from .. import build, lower
@@ -73,6 +75,34 @@ def measure_str_key(inp, include_config=True):
     )
 
 
+def encode_json_dict(inp, result):
+    """encode (MeasureInput, MeasureResult) pair to a json serializable dictionary
+
+    Parameters
+    ----------
+    inp: autotvm.measure.MeasureInput
+    result: autotvm.measure.MeasureResult
+        pair of input/result
+
+    Returns
+    -------
+    json_dict: dict
+        The dictionary dumped in a row of the json log format
+    """
+    return {
+        "input": (str(inp.target), inp.task.name, inp.task.args, inp.task.kwargs),
+        "config": inp.config.to_json_dict(),
+        "result": (
+            result.costs if result.error_no == 0 else (1e9,),
+            result.error_no,
+            result.all_cost,
+            result.timestamp,
+        ),
+        "version": AUTOTVM_LOG_VERSION,
+        "tvm_version": __version__,
+    }
+
+
 def encode(inp, result, protocol="json"):
     """encode (MeasureInput, MeasureResult) pair to a string
 
@@ -91,19 +121,7 @@ def encode(inp, result, protocol="json"):
     """
 
     if protocol == "json":
-        json_dict = {
-            "input": (str(inp.target), inp.task.name, inp.task.args, inp.task.kwargs),
-            "config": inp.config.to_json_dict(),
-            "result": (
-                result.costs if result.error_no == 0 else (1e9,),
-                result.error_no,
-                result.all_cost,
-                result.timestamp,
-            ),
-            "version": AUTOTVM_LOG_VERSION,
-            "tvm_version": __version__,
-        }
-        return json.dumps(json_dict)
+        return json.dumps(encode_json_dict(inp, result))
     if protocol == "pickle":
         row = (
             str(inp.target),
@@ -122,6 +140,79 @@ def encode(inp, result, protocol="json"):
     raise RuntimeError("Invalid log protocol: " + protocol)
 
 
+def clean_json_to_python(x):
+    """1. Convert all list in x to tuple (hashable)
+    2. Convert unicode to str for python2
+    """
+    if isinstance(x, (list, tuple)):
+        return tuple([clean_json_to_python(a) for a in x])
+    if isinstance(x, _unicode):
+        return str(x)
+    if isinstance(x, (_long, int)):
+        return int(x)
+    return x
+
+
+def decode_target_str(tgt):
+    """Get the target string of a record, upgrading deprecated options"""
+    tgt = str(tgt)
+    if "-target" in tgt:
+        logger.warning('"-target" is deprecated, use "-mtriple" instead.')
+        tgt = tgt.replace("-target", "-mtriple")
+    return tgt
+
+
+def decode_workload(json_dict):
+    """Get the workload of a json record without building its Task
+
+    Parameters
+    ----------
+    json_dict : dict
+        a record in the format of :any:`encode_json_dict`
+
+    Returns
+    -------
+    workload : tuple
+        The same value as the workload of the decoded task
+    """
+    _, task_name, task_args, _ = json_dict["input"]
+    return (clean_json_to_python(task_name),) + clean_json_to_python(task_args)
+
+
+def decode_json_dict(row):
+    """Decode a json dictionary record to python object
+
+    Parameters
+    ----------
+    row : dict
+        a record in the format of :any:`encode_json_dict`
+
+    Returns
+    -------
+    ret : tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult), or None
+        The tuple of input and result, or None if input uses old version log format.
+    """
+    # pylint: disable=unused-variable
+    global _old_version_warning
+
+    if "v" in row and row["v"] == 0.1:
+        if _old_version_warning:
+            logger.warning("AutoTVM log version 0.1 is no longer supported.")
+            _old_version_warning = False
+        return None
+
+    tgt, task_name, task_args, task_kwargs = row["input"]
+    tgt = Target(decode_target_str(tgt))
+
+    tsk = task.Task(clean_json_to_python(task_name), clean_json_to_python(task_args))
+    config = ConfigEntity.from_json_dict(row["config"])
+    inp = MeasureInput(tgt, tsk, config)
+    result = MeasureResult(*[tuple(x) if isinstance(x, list) else x for x in row["result"]])
+    config.cost = np.mean(result.costs)
+
+    return inp, result
+
+
 def decode(row, protocol="json"):
     """Decode encoded record string to python object
 
@@ -138,43 +229,10 @@ def decode(row, protocol="json"):
     ret : tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult), or None
         The tuple of input and result, or None if input uses old version log format.
     """
-    # pylint: disable=unused-variable
     global _old_version_warning
 
     if protocol == "json":
-        row = json.loads(row)
-        if "v" in row and row["v"] == 0.1:
-            if _old_version_warning:
-                logger.warning("AutoTVM log version 0.1 is no longer supported.")
-                _old_version_warning = False
-            return None
-
-        tgt, task_name, task_args, task_kwargs = row["input"]
-        tgt = str(tgt)
-        if "-target" in tgt:
-            logger.warning('"-target" is deprecated, use "-mtriple" instead.')
-            tgt = tgt.replace("-target", "-mtriple")
-        tgt = Target(str(tgt))
-
-        def clean_json_to_python(x):
-            """1. Convert all list in x to tuple (hashable)
-            2. Convert unicode to str for python2
-            """
-            if isinstance(x, list):
-                return tuple([clean_json_to_python(a) for a in x])
-            if isinstance(x, _unicode):
-                return str(x)
-            if isinstance(x, (_long, int)):
-                return int(x)
-            return x
-
-        tsk = task.Task(clean_json_to_python(task_name), clean_json_to_python(task_args))
-        config = ConfigEntity.from_json_dict(row["config"])
-        inp = MeasureInput(tgt, tsk, config)
-        result = MeasureResult(*[tuple(x) if isinstance(x, list) else x for x in row["result"]])
-        config.cost = np.mean(result.costs)
-
-        return inp, result
+        return decode_json_dict(json.loads(row))
     if protocol == "pickle":
         items = row.split("\t")
         if len(items) == 4:
@@ -215,7 +273,167 @@ def load_from_file(filename):
             yield ret
 
 
-def split_workload(in_file, clean=True):
+class _ScannedRow(
+    namedtuple(
+        "_ScannedRow",
+        ["line", "target", "workload", "input_key", "config_key", "error_no", "cost"],
+    )
+):
+    """A json log row with the fields needed to dedupe, split and rank it, without decoding"""
+
+
+def _scan_rows(lines):
+    """Extract the keys of a chunk of json log rows. Runs in the worker processes."""
+    ret = []
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        try:
+            row = json.loads(line)
+            if "v" in row and row["v"] == 0.1:
+                continue
+            costs, error_no = row["result"][0], row["result"][1]
+            ret.append(
+                _ScannedRow(
+                    line if line.endswith("\n") else line + "\n",
+                    str(row["input"][0]),
+                    decode_workload(row),
+                    json.dumps(row["input"], sort_keys=True),
+                    json.dumps(row["config"], sort_keys=True),
+                    error_no,
+                    float(sum(costs)) / len(costs) if costs else float("inf"),
+                )
+            )
+        except (ValueError, KeyError, IndexError, TypeError):
+            logger.warning("Skip invalid record: %s", line[:256])
+    return ret
+
+
+def _iter_chunks(in_files, chunk_size):
+    for in_file in in_files:
+        with open(in_file) as fin:
+            while True:
+                chunk = list(itertools.islice(fin, chunk_size))
+                if not chunk:
+                    break
+                yield chunk
+
+
+def scan_log_files(in_files, n_jobs=None, chunk_size=4096):
+    """Generator: stream the rows of json log files with their keys, in file order.
+    Rows are parsed by chunks in a pool of processes, with a bounded number of chunks
+    in flight so that the memory usage does not depend on the size of the files.
+
+    Parameters
+    ----------
+    in_files: str or list of str
+        The json log files
+    n_jobs: int, optional
+        The number of processes. "None" will use all cpu cores, 1 parses in this process.
+    chunk_size: int, optional
+        The number of rows parsed by a task
+
+    Yields
+    ------
+    row: _ScannedRow
+        The raw line with its target string, workload, input key, config key,
+        error number and mean cost
+    """
+    if isinstance(in_files, str):
+        in_files = [in_files]
+    chunks = _iter_chunks(in_files, chunk_size)
+    n_jobs = n_jobs or multiprocessing.cpu_count()
+
+    if n_jobs == 1:
+        for chunk in chunks:
+            for row in _scan_rows(chunk):
+                yield row
+        return
+
+    pool = multiprocessing.Pool(n_jobs)
+    try:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.apply_async(_scan_rows, (chunk,)))
+            if len(pending) >= 2 * n_jobs:
+                for row in pending.pop(0).get():
+                    yield row
+        for res in pending:
+            for row in res.get():
+                yield row
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _dedupe_rows(rows):
+    """Drop the rows whose input and config were already seen.
+    Only a 16 bytes digest of the keys of each unique record is kept in memory."""
+    added = set()
+    for row in rows:
+        digest = hashlib.md5((row.input_key + row.config_key).encode()).digest()
+        if digest in added:
+            continue
+        added.add(digest)
+        yield row
+
+
+def dedupe_log(in_files, out_file, n_jobs=None):
+    """Merge json log files into one, deleting duplicated records
+
+    Parameters
+    ----------
+    in_files: str or list of str
+        The input log files
+    out_file: str or file
+        The output log file
+    n_jobs: int, optional
+        The number of processes used to parse the logs
+
+    Returns
+    -------
+    count: int
+        The number of written records
+    """
+    return merge_logs(in_files, out_file, clean=True, n_jobs=n_jobs)
+
+
+def merge_logs(in_files, out_file, clean=False, n_jobs=None):
+    """Concatenate json log files into one
+
+    Parameters
+    ----------
+    in_files: str or list of str
+        The input log files
+    out_file: str or file
+        The output log file
+    clean: bool, optional
+        whether delete duplicated items
+    n_jobs: int, optional
+        The number of processes used to parse the logs
+
+    Returns
+    -------
+    count: int
+        The number of written records
+    """
+    rows = scan_log_files(in_files, n_jobs)
+    if clean:
+        rows = _dedupe_rows(rows)
+    fout = open(out_file, "w") if isinstance(out_file, str) else out_file
+    count = 0
+    try:
+        for row in rows:
+            fout.write(row.line)
+            count += 1
+    finally:
+        if isinstance(out_file, str):
+            fout.close()
+    logger.info("Wrote %d records to %s", count, out_file)
+    return count
+
+
+def split_workload(in_file, clean=True, out_prefix=None, n_jobs=None):
     """Split a log file into separate files, each of which contains only a single workload
     This function can also delete duplicated records in log file
 
@@ -225,48 +443,57 @@ def split_workload(in_file, clean=True):
         input filename
     clean: bool
         whether delete duplicated items
+    out_prefix: str, optional
+        The prefix of the output files, named out_prefix + ".%03d.wkl".
+        By default, in_file is used.
+    n_jobs: int, optional
+        The number of processes used to parse the log
+
+    Returns
+    -------
+    out_files: list of str
+        The output files, in the order of the first record of their workload
     """
     tic = time.time()
-    lines = list(open(in_file).readlines())
-
-    logger.info("start converting...")
-    pool = multiprocessing.Pool()
-    lines = [rec for rec in pool.map(decode, lines) if rec is not None]
-    logger.info("map done %.2f", time.time() - tic)
-
-    wkl_dict = OrderedDict()
-    for inp, res in lines:
-        wkl = measure_str_key(inp, False)
-        if wkl not in wkl_dict:
-            wkl_dict[wkl] = []
-        wkl_dict[wkl].append([inp, res])
-
+    out_prefix = out_prefix or in_file
+    rows = scan_log_files(in_file, n_jobs)
     if clean:
-        for i, (k, v) in enumerate(wkl_dict.items()):
-            # clean duplicated items
-            added = set()
-            cleaned = []
-            for inp, res in v:
-                str_key = measure_str_key(inp)
-                if str_key in added:
-                    continue
-                added.add(str_key)
-                cleaned.append([inp, res])
-
-            # write to file
-            logger.info("Key: %s\tValid: %d\tDup: %d\t", k, len(cleaned), len(v) - len(cleaned))
-            with open(args.i + ".%03d.wkl" % i, "w") as fout:
-                for inp, res in cleaned:
-                    fout.write(encode(inp, res) + "\n")
-    else:
-        for i, (k, v) in enumerate(wkl_dict.items()):
-            logger.info("Key: %s\tNum: %d", k, len(v))
-            with open(args.i + ".%03d.wkl" % i, "w") as fout:
-                for inp, res in v:
-                    fout.write(encode(inp, res) + "\n")
-
-
-def pick_best(in_file, out_file):
+        rows = _dedupe_rows(rows)
+
+    wkl_index = OrderedDict()
+    counts = []
+    batch = OrderedDict()
+
+    def _flush():
+        for i, lines in batch.items():
+            with open(out_prefix + ".%03d.wkl" % i, "a") as fout:
+                fout.writelines(lines)
+        batch.clear()
+
+    n_batched = 0
+    for row in rows:
+        key = row.input_key
+        if key not in wkl_index:
+            wkl_index[key] = len(wkl_index)
+            counts.append(0)
+            # start from an empty file
+            open(out_prefix + ".%03d.wkl" % wkl_index[key], "w").close()
+        i = wkl_index[key]
+        counts[i] += 1
+        batch.setdefault(i, []).append(row.line)
+        n_batched += 1
+        if n_batched >= 65536:
+            _flush()
+            n_batched = 0
+    _flush()
+
+    for k, i in wkl_index.items():
+        logger.info("Key: %s\tNum: %d", k, counts[i])
+    logger.info("split done %.2f", time.time() - tic)
+    return [out_prefix + ".%03d.wkl" % i for i in wkl_index.values()]
+
+
+def pick_best(in_file, out_file, top_k=1, n_jobs=None):
     """
     Pick best entries from a file and store it to another file.
     This distill the useful log entries from a large log file.
@@ -275,32 +502,77 @@ def pick_best(in_file, out_file):
 
     Parameters
     ----------
-    in_file: str
-        The filename of input
+    in_file: str or list of str
+        The filename of input, either json log files or a RecordStore data file
     out_file: str or file
         The filename of output
+    top_k: int, optional
+        The number of best records kept for each target key or model and workload
+    n_jobs: int, optional
+        The number of processes used to parse the logs
     """
-    context = load_from_file(in_file)
-    if os.path.isfile(out_file):
-        out_context = load_from_file(out_file)
-        context = itertools.chain(context, out_context)
-    context, context_clone = itertools.tee(context)
-    best_context = ApplyHistoryBest(context)
-    best_set = set()
-
-    for v in best_context.best_by_model.values():
-        best_set.add(measure_str_key(v[0]))
-
-    for v in best_context.best_by_targetkey.values():
-        best_set.add(measure_str_key(v[0]))
-
-    logger.info("Extract %d best records from the %s", len(best_set), in_file)
-    fout = open(out_file, "w") if isinstance(out_file, str) else out_file
-
-    for inp, res in context_clone:
-        if measure_str_key(inp) in best_set:
+    # pylint: disable=import-outside-toplevel
+    from .record_store import RecordStore, is_record_store
+
+    if isinstance(in_file, str) and is_record_store(in_file):
+        # the index of the store already selects the best records
+        if top_k != 1:
+            raise ValueError("Record stores only index the best record")
+        records = list(RecordStore(in_file, mode="r").best_records())
+        fout = open(out_file, "w") if isinstance(out_file, str) else out_file
+        for inp, res in records:
             fout.write(encode(inp, res) + "\n")
-            best_set.remove(measure_str_key(inp))
+        if isinstance(out_file, str):
+            fout.close()
+        return
+
+    in_files = [in_file] if isinstance(in_file, str) else list(in_file)
+    if isinstance(out_file, str) and os.path.isfile(out_file):
+        in_files.append(out_file)
+
+    # (target key or model, workload) -> heap of the top_k (-cost, -seq, line, config key)
+    # only these heaps are kept in memory while streaming the logs
+    heaps = {}
+    targets = {}
+
+    def _push(key, item):
+        heap = heaps.setdefault(key, [])
+        for j, other in enumerate(heap):
+            if other[3] == item[3]:
+                # the same config measured again
+                if item > other:
+                    heap[j] = item
+                    heapq.heapify(heap)
+                return
+        if len(heap) < top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    for seq, row in enumerate(scan_log_files(in_files, n_jobs)):
+        if row.error_no != 0:
+            continue
+        if row.target not in targets:
+            tgt = Target(decode_target_str(row.target))
+            targets[row.target] = (tuple(tgt.keys), tgt.model)
+        keys, model = targets[row.target]
+        item = (-row.cost, -seq, row.line, row.input_key + row.config_key)
+        for k in keys:
+            _push((k, row.workload), item)
+        if model != "unknown":
+            _push((model, row.workload), item)
+
+    best = {}
+    for heap in heaps.values():
+        for _, neg_seq, line, _ in heap:
+            best[-neg_seq] = line
+
+    logger.info("Extract %d best records from the %s", len(best), in_file)
+    fout = open(out_file, "w") if isinstance(out_file, str) else out_file
+    for seq in sorted(best):
+        fout.write(best[seq])
+    if isinstance(out_file, str):
+        fout.close()
 
 
 """
@@ -351,4 +623,4 @@ if __name__ == "__main__":
                         func = build(s, arg_bufs)
                         print(func.imported_modules[0].get_source())
     elif args.mode == "split":
-        split_workload(args.i)
+        split_workload(args.i, out_prefix=args.o)
@@ -0,0 +1,418 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Indexed, append-only binary store of tuning records.
+
+A store is made of two files:
+
+* the data file, a magic header followed by length-prefixed records.
+  Each record is the row of the json log format, i.e. the JSON encoding of the
+  dictionary of :any:`autotvm.record.encode_json_dict`.
+* the index file (data file name + ".idx"), a sequence of length-prefixed entries.
+  Each entry packs the offset and size of a record in the data file with its
+  error number and mean cost, followed by its target string and the JSON encoding
+  of its workload.
+
+Both files only hold data: reading a store never executes code from it.
+
+Looking for the best records only reads the index and then decodes the selected
+records, while :any:`autotvm.record.load_from_file` decodes every row of a log.
+"""
+
+import json
+import logging
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from ..target import Target
+from . import record
+
+logger = logging.getLogger("autotvm")
+
+STORE_MAGIC = b"TVMARS02"
+_LENGTH = struct.Struct("<I")
+# offset, size, error number and mean cost of an index entry
+_ENTRY_HEAD = struct.Struct("<QIid")
+
+
+class IndexEntry(
+    namedtuple("IndexEntry", ["offset", "size", "target", "workload", "error_no", "cost"])
+):
+    """
+    Describes a record of a RecordStore without decoding it.
+
+    Parameters
+    ----------
+    offset : int
+        The offset of the record payload in the data file
+    size : int
+        The size of the record payload in bytes
+    target : str
+        The target string of the record
+    workload : tuple
+        The workload of the task of the record
+    error_no : int
+        The error number of the measurement
+    cost : float
+        The mean cost of the measurement
+    """
+
+
+def is_record_store(filename):
+    """Check whether a file is the data file of a RecordStore
+
+    Parameters
+    ----------
+    filename : str
+        The file name
+
+    Returns
+    -------
+    ret : bool
+    """
+    try:
+        with open(filename, "rb") as f:
+            return f.read(len(STORE_MAGIC)) == STORE_MAGIC
+    except (IOError, OSError):
+        return False
+
+
+def _read_chunks(f):
+    """Yield (offset, payload) of the length-prefixed chunks of f until EOF or a truncated tail"""
+    while True:
+        offset = f.tell()
+        head = f.read(_LENGTH.size)
+        if len(head) < _LENGTH.size:
+            return
+        (size,) = _LENGTH.unpack(head)
+        payload = f.read(size)
+        if len(payload) < size:
+            return
+        yield offset + _LENGTH.size, payload
+
+
+def _pack_entry(entry):
+    target = entry.target.encode("utf-8")
+    workload = json.dumps(entry.workload).encode("utf-8")
+    return b"".join(
+        [
+            _ENTRY_HEAD.pack(entry.offset, entry.size, entry.error_no, entry.cost),
+            _LENGTH.pack(len(target)),
+            target,
+            workload,
+        ]
+    )
+
+
+def _unpack_entry(payload):
+    offset, size, error_no, cost = _ENTRY_HEAD.unpack_from(payload)
+    pos = _ENTRY_HEAD.size
+    (target_size,) = _LENGTH.unpack_from(payload, pos)
+    pos += _LENGTH.size
+    target = payload[pos : pos + target_size].decode("utf-8")
+    workload = record.clean_json_to_python(json.loads(payload[pos + target_size :]))
+    return IndexEntry(offset, size, target, workload, error_no, cost)
+
+
+def _make_entry(offset, size, json_dict):
+    error_no = json_dict["result"][1]
+    cost = float(np.mean(json_dict["result"][0]))
+    return IndexEntry(
+        offset, size, str(json_dict["input"][0]), record.decode_workload(json_dict), error_no, cost
+    )
+
+
+class RecordStore(object):
+    """An indexed, append-only binary store of tuning records
+
+    Parameters
+    ----------
+    filename : str
+        The data file of the store. The index is kept in filename + ".idx".
+    mode : str, optional
+        "a" to open the store for appending, creating it if needed,
+        or "r" to only read an existing store.
+    """
+
+    def __init__(self, filename, mode="a"):
+        if mode not in ("a", "r"):
+            raise ValueError("Invalid mode: " + mode)
+        self.filename = str(filename)
+        self.index_filename = self.filename + ".idx"
+        self.mode = mode
+        self._entries = None
+        self._best = None
+        self._targets = {}
+
+        if not os.path.isfile(self.filename):
+            if mode == "r":
+                raise IOError("No such record store: " + self.filename)
+            with open(self.filename, "wb") as f:
+                f.write(STORE_MAGIC)
+            with open(self.index_filename, "wb"):
+                pass
+        elif not is_record_store(self.filename):
+            raise ValueError("%s is not a record store" % self.filename)
+
+    @property
+    def entries(self):
+        """The list of IndexEntry of all the records, in insertion order"""
+        if self._entries is None:
+            self._load_index()
+        return self._entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _load_index(self):
+        entries = []
+        if os.path.isfile(self.index_filename):
+            with open(self.index_filename, "rb") as f:
+                for _, payload in _read_chunks(f):
+                    entries.append(_unpack_entry(payload))
+
+        # records appended after the last index entry (e.g. after a crash) are indexed again
+        indexed_end = entries[-1].offset + entries[-1].size if entries else len(STORE_MAGIC)
+        if indexed_end < os.path.getsize(self.filename):
+            new_entries, data_end = [], indexed_end
+            with open(self.filename, "rb") as f:
+                f.seek(indexed_end)
+                for offset, payload in _read_chunks(f):
+                    new_entries.append(_make_entry(offset, len(payload), json.loads(payload)))
+                    data_end = offset + len(payload)
+            if self.mode == "a":
+                with open(self.filename, "ab") as f:
+                    f.truncate(data_end)
+                self._write_index(new_entries)
+            logger.info("Reindexed %d records of %s", len(new_entries), self.filename)
+            entries.extend(new_entries)
+        self._entries = entries
+
+    def _write_index(self, entries):
+        with open(self.index_filename, "ab") as f:
+            for entry in entries:
+                payload = _pack_entry(entry)
+                f.write(_LENGTH.pack(len(payload)))
+                f.write(payload)
+
+    def extend_json_dicts(self, json_dicts):
+        """Append records given as dictionaries of :any:`autotvm.record.encode_json_dict`
+
+        Parameters
+        ----------
+        json_dicts : iterable of dict
+            The records to append
+
+        Returns
+        -------
+        count : int
+            The number of appended records
+        """
+        if self.mode != "a":
+            raise RuntimeError("Record store %s is opened read-only" % self.filename)
+        # make sure the index is complete before appending to it
+        entries = self.entries
+        new_entries = []
+        with open(self.filename, "ab") as f:
+            for json_dict in json_dicts:
+                payload = json.dumps(json_dict).encode("utf-8")
+                f.write(_LENGTH.pack(len(payload)))
+                offset = f.tell()
+                f.write(payload)
+                new_entries.append(_make_entry(offset, len(payload), json_dict))
+        self._write_index(new_entries)
+        entries.extend(new_entries)
+        self._best = None
+        return len(new_entries)
+
+    def extend(self, records):
+        """Append (MeasureInput, MeasureResult) pairs to the store
+
+        Parameters
+        ----------
+        records : iterable of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
+            The records to append
+        """
+        return self.extend_json_dicts(record.encode_json_dict(inp, res) for inp, res in records)
+
+    def append(self, inp, result):
+        """Append one (MeasureInput, MeasureResult) pair to the store"""
+        self.extend([(inp, result)])
+
+    def read_json_dicts(self, entries=None):
+        """Generator: read the raw dictionaries of some records
+
+        Parameters
+        ----------
+        entries : list of IndexEntry, optional
+            The records to read. All the records by default.
+
+        Yields
+        ------
+        json_dict : dict
+        """
+        entries = self.entries if entries is None else entries
+        with open(self.filename, "rb") as f:
+            for entry in entries:
+                f.seek(entry.offset)
+                yield json.loads(f.read(entry.size))
+
+    def read(self, entries=None):
+        """Generator: decode some records.
+
+        Parameters
+        ----------
+        entries : list of IndexEntry, optional
+            The records to decode. All the records by default.
+
+        Yields
+        ------
+        input: autotvm.measure.MeasureInput
+        result: autotvm.measure.MeasureResult
+        """
+        for json_dict in self.read_json_dicts(entries):
+            ret = record.decode_json_dict(json_dict)
+            if ret is not None:
+                yield ret
+
+    def _target_info(self, target_str):
+        if target_str not in self._targets:
+            tgt = Target(record.decode_target_str(target_str))
+            self._targets[target_str] = (tuple(tgt.keys), tgt.model)
+        return self._targets[target_str]
+
+    def best_entries(self):
+        """Get the best valid record by (target key, workload) and by (model, workload)
+
+        Returns
+        -------
+        best_by_targetkey : dict of (str, tuple) to IndexEntry
+        best_by_model : dict of (str, tuple) to IndexEntry
+        """
+        if self._best is not None:
+            return self._best
+        best_by_targetkey = {}
+        best_by_model = {}
+        for entry in self.entries:
+            if entry.error_no != 0:
+                continue
+            keys, model = self._target_info(entry.target)
+            for k in keys:
+                key = (k, entry.workload)
+                if key not in best_by_targetkey or best_by_targetkey[key].cost > entry.cost:
+                    best_by_targetkey[key] = entry
+            key = (model, entry.workload)
+            if key in best_by_model:
+                if best_by_model[key].cost > entry.cost:
+                    best_by_model[key] = entry
+            elif model != "unknown":
+                best_by_model[key] = entry
+        self._best = (best_by_targetkey, best_by_model)
+        return self._best
+
+    def best_records(self):
+        """Generator: decode only the records that are the best for a target key or a model.
+
+        Yields
+        ------
+        input: autotvm.measure.MeasureInput
+        result: autotvm.measure.MeasureResult
+        """
+        best_by_targetkey, best_by_model = self.best_entries()
+        selected = {entry.offset: entry for entry in best_by_targetkey.values()}
+        selected.update((entry.offset, entry) for entry in best_by_model.values())
+        return self.read([selected[offset] for offset in sorted(selected)])
+
+    def query_best(self, target, workload):
+        """Decode the best record for a target and a workload
+
+        Parameters
+        ----------
+        target : Target
+            The target, matched by model first and then by target keys
+        workload : tuple
+            The workload
+
+        Returns
+        -------
+        ret : tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult), or None
+        """
+        best_by_targetkey, best_by_model = self.best_entries()
+        entry = best_by_model.get((target.model, workload))
+        if entry is None:
+            for k in target.keys:
+                entry = best_by_targetkey.get((k, workload))
+                if entry is not None:
+                    break
+        if entry is None:
+            return None
+        return next(self.read([entry]), None)
+
+
+def convert_from_json(json_file, store_file):
+    """Stream the rows of a json log file into a RecordStore.
+    Rows are not decoded into python objects, so no task needs to be registered.
+
+    Parameters
+    ----------
+    json_file : str
+        The input log file in the json protocol
+    store_file : str
+        The data file of the store. Records are appended if it exists.
+
+    Returns
+    -------
+    store : RecordStore
+    """
+
+    def _rows():
+        with open(json_file) as fin:
+            for row in fin:
+                if not row.strip() or row.startswith("#"):
+                    continue
+                json_dict = json.loads(row)
+                if "v" in json_dict and json_dict["v"] == 0.1:
+                    continue
+                yield json_dict
+
+    store = RecordStore(store_file)
+    count = store.extend_json_dicts(_rows())
+    logger.info("Converted %d records from %s to %s", count, json_file, store_file)
+    return store
+
+
+def convert_to_json(store_file, json_file):
+    """Stream the records of a RecordStore into a json log file
+
+    Parameters
+    ----------
+    store_file : str
+        The data file of the store
+    json_file : str or file
+        The output log file. Records are appended if it exists.
+    """
+    store = RecordStore(store_file, mode="r")
+    fout = open(json_file, "a") if isinstance(json_file, str) else json_file
+    try:
+        for json_dict in store.read_json_dicts():
+            fout.write(json.dumps(json_dict) + "\n")
+    finally:
+        if isinstance(json_file, str):
+            fout.close()
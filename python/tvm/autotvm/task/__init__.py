@@ -37,6 +37,7 @@ from .dispatcher import (
     DispatchContext,
     ApplyConfig,
     ApplyHistoryBest,
+    ApplyIndexedHistoryBest,
     FallbackContext,
     clear_fallback_cache,
     ApplyGraphBest,
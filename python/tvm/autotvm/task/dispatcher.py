@@ -30,11 +30,14 @@ of the DispatchContext base class.
 
 from __future__ import absolute_import as _abs
 
+import hashlib
+import json
 import logging
+import os
 
 import numpy as np
 
-from .space import FallbackConfigEntity
+from .space import ConfigEntity, FallbackConfigEntity
 from .. import env as _env
 
 logger = logging.getLogger("autotvm")
@@ -187,7 +190,8 @@ class ApplyHistoryBest(DispatchContext):
     records : str or iterator of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
         Collection of tuning records.
         If is str, then it should be the filename of a records log file.
-        Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+        Each row of this file is an encoded record pair. It can also be a
+        RecordStore or its data file. Otherwise, it is an iterator.
     """
 
     def __init__(self, records):
@@ -208,17 +212,25 @@ class ApplyHistoryBest(DispatchContext):
         records : str or iterator of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
             Collection of tuning records.
             If is str, then it should be the filename of a records log file.
-            Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+            Each row of this file is an encoded record pair. It can also be a
+            RecordStore or its data file. Otherwise, it is an iterator.
         """
         # pylint: disable=import-outside-toplevel
         from pathlib import Path
         from ..record import load_from_file
+        from ..record_store import RecordStore, is_record_store
 
         if isinstance(records, Path):
             records = str(records)
 
         if isinstance(records, str):
-            records = load_from_file(records)
+            if is_record_store(records):
+                records = RecordStore(records, mode="r")
+            else:
+                records = load_from_file(records)
+        if isinstance(records, RecordStore):
+            # only decode the records selected by the index
+            records = records.best_records()
         if not records:
             return
 
@@ -292,6 +304,208 @@ class ApplyHistoryBest(DispatchContext):
             self._best_user_defined[key] = cfg
 
 
+def _update_best(best, key, cost, config):
+    """Keep the (cost, config json) of lower cost of a key, the first one on ties"""
+    if key not in best or best[key][0] > cost:
+        best[key] = (cost, config)
+
+
+class ApplyIndexedHistoryBest(ApplyHistoryBest):
+    """
+    Apply the history best config, looked up in a compact index of the records.
+
+    The index maps (target key or model, workload) to the mean cost and the json
+    of the best config. Log files are only scanned at the first query, in one
+    streaming pass, and a config is only decoded when it is queried.
+
+    Parameters
+    ----------
+    records : str, list of str, or iterator of (MeasureInput, MeasureResult)
+        Collection of tuning records.
+        If is str or a list of str, they are the filenames of records log files.
+        A RecordStore or an iterator of records is also accepted.
+    index_cache : str, optional
+        A directory to save the index of each log file in. A saved index is reused
+        until the modification time or the size of its log file changes.
+    n_jobs : int, optional
+        The number of processes scanning a log file, see :any:`autotvm.record.scan_log_files`.
+    """
+
+    def __init__(self, records, index_cache=None, n_jobs=1):
+        self.index_cache = index_cache
+        self.n_jobs = n_jobs
+        # sources not indexed yet: log filenames, record stores or partial indexes
+        self._pending = []
+        # (target str, workload) -> (cost, config json)
+        self._by_target = {}
+        self._index = None
+        self._targets = {}
+        self._configs = {}
+        if index_cache and not os.path.isdir(index_cache):
+            os.makedirs(index_cache)
+        super(ApplyIndexedHistoryBest, self).__init__(records)
+
+    def load(self, records):
+        """Add records to this dispatch context. Log files are scanned at the first query.
+
+        Parameters
+        ----------
+        records : str, list of str, or iterator of (MeasureInput, MeasureResult)
+            Collection of tuning records.
+            If is str or a list of str, they are the filenames of records log files.
+            A RecordStore or an iterator of records is also accepted.
+        """
+        # pylint: disable=import-outside-toplevel
+        from pathlib import Path
+        from ..record_store import RecordStore, is_record_store
+
+        if isinstance(records, (str, Path)):
+            records = [records]
+        if isinstance(records, RecordStore):
+            self._pending.append(records)
+        elif isinstance(records, (list, tuple)) and all(
+            isinstance(x, (str, Path)) for x in records
+        ):
+            for filename in records:
+                filename = str(filename)
+                if is_record_store(filename):
+                    self._pending.append(RecordStore(filename, mode="r"))
+                else:
+                    self._pending.append(filename)
+        elif records:
+            # iterators can only be consumed once, index them now
+            index = {}
+            for inp, res in records:
+                if res.error_no == 0:
+                    config = json.dumps(inp.config.to_json_dict(), sort_keys=True)
+                    key = (str(inp.target), inp.task.workload)
+                    _update_best(index, key, float(np.mean(res.costs)), config)
+            self._pending.append(index)
+        self._index = None
+
+    def _file_index(self, filename):
+        """Get the index of a log file, from the index cache when it is up to date"""
+        # pylint: disable=import-outside-toplevel
+        from ..record import scan_log_files, clean_json_to_python
+
+        stat = os.stat(filename)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        cache_file = None
+        if self.index_cache:
+            digest = hashlib.md5(os.path.abspath(filename).encode("utf-8")).hexdigest()
+            cache_file = os.path.join(self.index_cache, digest + ".json")
+            try:
+                with open(cache_file) as f:
+                    cached = json.load(f)
+                if cached["stamp"] == stamp:
+                    return {
+                        (target, clean_json_to_python(workload)): (cost, config)
+                        for target, workload, cost, config in cached["index"]
+                    }
+            except (IOError, OSError, ValueError, KeyError, TypeError):
+                pass
+
+        index = {}
+        counter = 0
+        for row in scan_log_files(filename, n_jobs=self.n_jobs):
+            counter += 1
+            if row.error_no == 0:
+                _update_best(index, (row.target, row.workload), row.cost, row.config_key)
+        logger.debug("Finish indexing %d records of %s", counter, filename)
+
+        if cache_file:
+            tmp = "%s.%d.tmp" % (cache_file, os.getpid())
+            rows = [[key[0], key[1], cost, config] for key, (cost, config) in index.items()]
+            with open(tmp, "w") as f:
+                json.dump({"stamp": stamp, "index": rows}, f)
+            os.replace(tmp, cache_file)
+        return index
+
+    @staticmethod
+    def _store_index(store):
+        """Get the index of a RecordStore, reading only the configs of its best records"""
+        best = {}
+        for entry in store.entries:
+            if entry.error_no == 0:
+                _update_best(best, (entry.target, entry.workload), entry.cost, entry)
+        keys = list(best.keys())
+        json_dicts = store.read_json_dicts([best[k][1] for k in keys])
+        return {
+            k: (best[k][0], json.dumps(json_dict["config"], sort_keys=True))
+            for k, json_dict in zip(keys, json_dicts)
+        }
+
+    def _target_info(self, target_str):
+        # pylint: disable=import-outside-toplevel
+        from ...target import Target
+        from ..record import decode_target_str
+
+        if target_str not in self._targets:
+            tgt = Target(decode_target_str(target_str))
+            self._targets[target_str] = (tuple(tgt.keys), tgt.model)
+        return self._targets[target_str]
+
+    def _get_index(self):
+        """Index the pending sources, and get the best (cost, config json)
+        by (target key, workload) and by (model, workload)"""
+        if self._index is not None:
+            return self._index
+
+        for source in self._pending:
+            if isinstance(source, dict):
+                index = source
+            elif isinstance(source, str):
+                index = self._file_index(source)
+            else:
+                index = self._store_index(source)
+            for key, (cost, config) in index.items():
+                _update_best(self._by_target, key, cost, config)
+        self._pending = []
+
+        best_by_targetkey = {}
+        best_by_model = {}
+        for (target_str, workload), (cost, config) in self._by_target.items():
+            keys, model = self._target_info(target_str)
+            for k in keys:
+                _update_best(best_by_targetkey, (k, workload), cost, config)
+            if model != "unknown":
+                _update_best(best_by_model, (model, workload), cost, config)
+        self._index = (best_by_targetkey, best_by_model)
+        return self._index
+
+    def _decode_config(self, entry):
+        cost, config = entry
+        if config not in self._configs:
+            cfg = ConfigEntity.from_json_dict(json.loads(config))
+            cfg.cost = cost
+            self._configs[config] = cfg
+        return self._configs[config]
+
+    def _query_inside(self, target, workload):
+        if target is None:
+            # raise the error with the hint about the target context
+            return super(ApplyIndexedHistoryBest, self)._query_inside(target, workload)
+
+        best_by_targetkey, best_by_model = self._get_index()
+
+        # first try matching by model
+        key = (target.model, workload)
+        if key in self._best_user_defined:
+            return self._best_user_defined[key]
+        if key in best_by_model:
+            return self._decode_config(best_by_model[key])
+
+        # then try matching by target key
+        for k in target.keys:
+            key = (k, workload)
+            if key in self._best_user_defined:
+                return self._best_user_defined[key]
+            if key in best_by_targetkey:
+                return self._decode_config(best_by_targetkey[key])
+
+        return None
+
+
 class FallbackContext(DispatchContext):
     """
     A fallback dispatch context.
@@ -191,7 +191,12 @@ def get_pow2s(n):
 
 
 class SplitSpace(TransformSpace):
-    """Split an axis for several times"""
+    """Split an axis for several times
+
+    The entities of the factor based policies are not enumerated. The space keeps
+    tables counting the valid factor combinations, and an entity is computed on
+    demand from its index by walking these tables in the enumeration order.
+    """
 
     def __init__(self, axes, policy, **kwargs):
         super(SplitSpace, self).__init__()
@@ -199,9 +204,11 @@ class SplitSpace(TransformSpace):
 
         self.policy = policy
         self.entities = []
+        self._counts = {}
+        self._filtered = None
 
         max_factor = kwargs.get("max_factor", 1 << 31)
-        fil = kwargs.get("filter", lambda x: True)
+        fil = kwargs.get("filter", None)
         self.product = axis.length
         self.num_output = kwargs.get("num_outputs", 0)
         assert self.num_output > 0
@@ -210,42 +217,103 @@ class SplitSpace(TransformSpace):
             for size in kwargs["candidate"]:
                 assert len(size) == self.num_output
                 self.entities.append(SplitEntity(size))
-        else:
-            if policy == "verbose":
-                # Include factors and power-of-twos. May generate tails.
-                divisibles = get_factors(self.product)
-                pow2s = get_pow2s(self.product)
-                factors = [x for x in list(set(divisibles) | set(pow2s)) if x <= max_factor]
-            elif policy == "factors":
-                # Include divisible factors. Guarantee no tails.
-                factors = [x for x in get_factors(self.product) if x <= max_factor]
-            elif policy == "power2":
-                # Include less, equal, and round-up power-of-two numbers. May generate tails.
-                factors = [x for x in get_pow2s(self.product) if x <= max_factor]
-            else:
-                raise RuntimeError("Invalid policy: %s" % policy)
+            if fil is not None:
+                self.entities = list(filter(fil, self.entities))
+            return
 
-            # Enforce the product of all split factors equals to the axis length
-            no_tail = kwargs.get("no_tail", policy == "factors")
+        if policy == "verbose":
+            # Include factors and power-of-twos. May generate tails.
+            divisibles = get_factors(self.product)
+            pow2s = get_pow2s(self.product)
+            factors = [x for x in list(set(divisibles) | set(pow2s)) if x <= max_factor]
+        elif policy == "factors":
+            # Include divisible factors. Guarantee no tails.
+            factors = [x for x in get_factors(self.product) if x <= max_factor]
+        elif policy == "power2":
+            # Include less, equal, and round-up power-of-two numbers. May generate tails.
+            factors = [x for x in get_pow2s(self.product) if x <= max_factor]
+        else:
+            raise RuntimeError("Invalid policy: %s" % policy)
+
+        # Enforce the product of all split factors equals to the axis length
+        self.no_tail = kwargs.get("no_tail", policy == "factors")
+        self.factors = factors
+        self.entities = None
+
+        if fil is not None:
+            # a filter is an arbitrary predicate: keep the indices of accepted entities only
+            self._filtered = np.array(
+                [i for i in range(self._num_candidates()) if fil(self._get_candidate(i))],
+                dtype=np.int64,
+            )
 
-            # Generate split entity by enumerating candidate factors.
-            self.factors = factors
-            self._generate_space(0, [None] * (self.num_output - 1), enforce_no_tail=no_tail)
+    @property
+    def entities(self):
+        """The list of all entities. Factor based policies build it on demand."""
+        if self._entities is None:
+            return [self[i] for i in range(len(self))]
+        return self._entities
+
+    @entities.setter
+    def entities(self, value):
+        self._entities = value
+
+    def _children(self, rem):
+        """Valid next factors with the remaining extent, in enumeration order.
+        Without tail, rem is the exact quotient of the axis length by the chosen factors.
+        Otherwise it is the floor quotient, so that the product stays below the length.
+        """
+        for factor in self.factors:
+            if self.no_tail:
+                if rem % factor == 0:
+                    yield factor, rem // factor
+            elif factor <= rem:
+                yield factor, rem // factor
+
+    def _count(self, k, rem):
+        """Number of valid combinations of k factors given the remaining extent"""
+        if k == 0:
+            return 1
+        key = (k, rem)
+        if key not in self._counts:
+            self._counts[key] = sum(self._count(k - 1, nxt) for _, nxt in self._children(rem))
+        return self._counts[key]
+
+    def _num_candidates(self):
+        return self._count(self.num_output - 1, self.product)
+
+    def _get_candidate(self, index):
+        """Get the entity at an index of the unfiltered space by mixed-radix arithmetic"""
+        stack = []
+        rem = self.product
+        for k in range(self.num_output - 1, 0, -1):
+            for factor, nxt in self._children(rem):
+                cnt = self._count(k - 1, nxt)
+                if index < cnt:
+                    stack.append(factor)
+                    rem = nxt
+                    break
+                index -= cnt
+        return SplitEntity([-1] + stack[::-1])
 
-        self.entities = list(filter(fil, self.entities))
+    def __len__(self):
+        if self._entities is not None:
+            return len(self._entities)
+        if self._filtered is not None:
+            return len(self._filtered)
+        return self._num_candidates()
 
-    def _generate_space(self, now, tmp_stack, enforce_no_tail=False):
-        """Generate space by DFS"""
-        if now == self.num_output - 1:
-            prod = functools.reduce(lambda x, y: x * y, tmp_stack)
-            if prod > self.product:
-                return
-            if self.product % prod == 0 or (not enforce_no_tail and prod < self.product):
-                self.entities.append(SplitEntity([-1] + tmp_stack[::-1]))
-        else:
-            for factor in self.factors:
-                tmp_stack[now] = factor
-                self._generate_space(now + 1, tmp_stack, enforce_no_tail)
+    def __getitem__(self, index):
+        if self._entities is not None:
+            return self._entities[index]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("split space index out of range")
+        if self._filtered is not None:
+            index = int(self._filtered[index])
+        return self._get_candidate(index)
 
     @staticmethod
     def get_num_output(axes, policy, **kwargs):
@@ -26,5 +26,6 @@ from . import callback
 from .tuner import Tuner
 
 from .index_based_tuner import GridSearchTuner, RandomTuner
-from .ga_tuner import GATuner
+from .ga_tuner import GATuner, VectorizedGATuner
 from .xgboost_tuner import XGBTuner
+from .model_based_tuner import LRUFeatureCache
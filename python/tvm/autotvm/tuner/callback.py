@@ -64,6 +64,32 @@ def log_to_file(file_out, protocol="json"):
     return _callback
 
 
+def log_to_store(store):
+    """Append the tuning records to an indexed binary RecordStore.
+
+    Parameters
+    ----------
+    store: RecordStore or str
+        The store or the filename of its data file.
+
+    Returns
+    -------
+    callback : callable
+        Callback function to do the logging.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ..record_store import RecordStore
+
+    if not isinstance(store, RecordStore):
+        store = RecordStore(str(store))
+
+    def _callback(_, inputs, results):
+        """Callback implementation"""
+        store.extend(zip(inputs, results))
+
+    return _callback
+
+
 def log_to_database(db):
     """Save the tuning records to a database object.
 
@@ -75,6 +101,9 @@ def log_to_database(db):
 
     def _callback(_, inputs, results):
         """Callback implementation"""
+        if hasattr(db, "save_batch"):
+            db.save_batch(zip(inputs, results), extend=False)
+            return
         for inp, result in zip(inputs, results):
             db.save(inp, result)
 
@@ -149,3 +149,168 @@ class GATuner(Tuner):
 
     def load_history(self, data_set):
         pass
+
+
+class VectorizedGATuner(Tuner):
+    """Tuner with genetic algorithm, where a generation is an int matrix of knob indices.
+    Selection, crossover, mutation and the dedupe against visited configs are batched
+    numpy operations, so that large populations remain cheap to evolve.
+
+    Parameters
+    ----------
+    pop_size: int
+        number of genes in one generation
+    elite_num: int
+        number of elite to keep
+    mutation_prob: float
+        probability of mutation of a knob in a gene
+    kmod: boolean
+        force a gene at fallback config to steer search in this direction
+    max_retry: int
+        number of rounds of single-knob mutation applied to the children that
+        duplicate visited configs, before replacing them by random configs
+    """
+
+    def __init__(
+        self, task, pop_size=1000, elite_num=30, mutation_prob=0.1, kmod=False, max_retry=8
+    ):
+        super(VectorizedGATuner, self).__init__(task)
+
+        assert elite_num <= pop_size, "The number of elites must be less than population size"
+
+        # space info
+        self.space = task.config_space
+        self.dim_keys = list(self.space.space_map.keys())
+        self.dims = np.array([len(v) for v in self.space.space_map.values()], dtype=np.int64)
+        self.strides = np.concatenate(([1], np.cumprod(self.dims)[:-1])).astype(np.int64)
+        self.space_size = len(self.space)
+        assert self.space_size < 2 ** 62, "The space is too large for int64 points"
+
+        # algorithm configurations
+        self.pop_size = min(pop_size, self.space_size)
+        self.elite_num = min(self.pop_size, elite_num)
+        self.mutation_prob = mutation_prob
+        self.max_retry = max_retry
+
+        # sorted array of the visited points
+        self.visited = np.empty((0,), dtype=np.int64)
+
+        # current generation
+        self.genes = np.empty((0, len(self.dims)), dtype=np.int64)
+        self.points = np.empty((0,), dtype=np.int64)
+        self.scores = []
+        self.elites = np.empty((0, len(self.dims)), dtype=np.int64)
+        self.elite_scores = np.empty((0,))
+        self.trial_pt = 0
+
+        # random initialization
+        points = self._sample_unvisited(self.pop_size - 1 if kmod else self.pop_size)
+        if kmod:
+            points = np.concatenate(([0], points[points != 0]))[: self.pop_size]
+        self._set_generation(points)
+
+    def _points2knobs(self, points):
+        return (points[:, None] // self.strides[None, :]) % self.dims[None, :]
+
+    def _knobs2points(self, knobs):
+        return knobs.dot(self.strides)
+
+    def _set_generation(self, points):
+        self.points = points
+        self.genes = self._points2knobs(points)
+        self.visited = np.union1d(self.visited, points)
+        self.trial_pt = 0
+        self.scores = []
+
+    def _unvisited_mask(self, points):
+        """Mask of the points that are neither visited nor repeated earlier in the array"""
+        mask = ~np.isin(points, self.visited)
+        _, first = np.unique(points, return_index=True)
+        unique = np.zeros(len(points), dtype=bool)
+        unique[first] = True
+        return mask & unique
+
+    def _sample_unvisited(self, n):
+        """Sample up to n distinct random points that are not visited"""
+        n = min(n, self.space_size - len(self.visited))
+        if n <= 0:
+            return np.empty((0,), dtype=np.int64)
+        if self.space_size - len(self.visited) <= 4 * n:
+            # most of the space is visited: draw from the complement directly
+            rest = np.setdiff1d(np.arange(self.space_size, dtype=np.int64), self.visited)
+            return np.random.choice(rest, size=n, replace=False)
+        ret = np.empty((0,), dtype=np.int64)
+        while len(ret) < n:
+            cand = np.random.randint(0, self.space_size, size=2 * n, dtype=np.int64)
+            cand = np.concatenate((ret, cand))
+            ret = cand[self._unvisited_mask(cand)]
+        return ret[:n]
+
+    def next_batch(self, batch_size):
+        # never propose a gene twice: the next generation needs the scores of this one
+        points = self.points[self.trial_pt : self.trial_pt + batch_size]
+        self.trial_pt += len(points)
+        return [self.space.get(int(point)) for point in points]
+
+    def update(self, inputs, results):
+        for inp, res in zip(inputs, results):
+            if res.error_no == 0:
+                y = inp.task.flop / np.mean(res.costs)
+                self.scores.append(y)
+            else:
+                self.scores.append(0.0)
+
+        if len(self.scores) >= len(self.points) and len(self.visited) < self.space_size:
+            genes = np.concatenate((self.genes, self.elites))
+            scores = np.concatenate((np.array(self.scores[: len(self.points)]), self.elite_scores))
+
+            # reserve elite
+            elite_num = min(self.elite_num, len(scores))
+            elite_indexes = np.argpartition(scores, -elite_num)[-elite_num:]
+            self.elites, self.elite_scores = genes[elite_indexes], scores[elite_indexes]
+
+            # selection
+            n_child = min(self.pop_size, self.space_size - len(self.visited))
+            scores = scores + 1e-8
+            probs = scores / np.sum(scores)
+            parents = np.random.choice(len(genes), size=(n_child, 2), p=probs)
+            if len(genes) > 1:
+                same = parents[:, 0] == parents[:, 1]
+                while np.any(same):
+                    parents[same, 1] = np.random.choice(len(genes), size=np.sum(same), p=probs)
+                    same = parents[:, 0] == parents[:, 1]
+
+            # cross over
+            cut = np.random.randint(len(self.dims), size=n_child)
+            mask = np.arange(len(self.dims))[None, :] < cut[:, None]
+            children = np.where(mask, genes[parents[:, 0]], genes[parents[:, 1]])
+
+            # mutation
+            mutate = np.random.random(children.shape) < self.mutation_prob
+            values = (np.random.random(children.shape) * self.dims[None, :]).astype(np.int64)
+            children = np.where(mutate, values, children)
+
+            # dedupe against the visited configs by mutating one more knob of the duplicates
+            points = self._knobs2points(children)
+            for _ in range(self.max_retry):
+                dup = ~self._unvisited_mask(points)
+                n_dup = np.sum(dup)
+                if n_dup == 0:
+                    break
+                rows = np.nonzero(dup)[0]
+                cols = np.random.randint(len(self.dims), size=n_dup)
+                children[rows, cols] = (np.random.random(n_dup) * self.dims[cols]).astype(np.int64)
+                points[rows] = self._knobs2points(children[rows])
+
+            points = points[self._unvisited_mask(points)]
+            if len(points) < n_child:
+                # replace the remaining duplicates by random configs
+                self.visited = np.union1d(self.visited, points)
+                points = np.concatenate((points, self._sample_unvisited(n_child - len(points))))
+            self._set_generation(points)
+
+    def has_next(self):
+        return len(self.visited) - (len(self.points) - self.trial_pt) < self.space_size
+
+    def load_history(self, data_set):
+        pass
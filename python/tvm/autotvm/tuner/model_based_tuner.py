@@ -20,16 +20,24 @@ This type of tuner will fit a cost model and use some optimization methods to
 find optimums points of cost model in space.
 """
 import gc
+import logging
+import os
+from collections import OrderedDict
 
 import numpy as np
 
 from .tuner import Tuner
 from ..env import GLOBAL_SCOPE
 
+logger = logging.getLogger("autotvm")
+
 
 class FeatureCache(object):
     """Feature cache manager for cache sharing between different cost models"""
 
+    # whether the cache limits its own size
+    bounded = False
+
     def __init__(self):
         self.feature_cache = {}
 
@@ -78,6 +86,171 @@ class FeatureCache(object):
         gc.collect()
 
 
+class _LRUFeatureDict(object):
+    """Dictionary from config index to feature of one cache key, with a bounded number
+    of entries in memory and an optional memory-mapped table loaded from disk.
+
+    The table on disk is made of two numpy files:
+    prefix + ".index.npy", a sorted int64 array of (config index, row) pairs where
+    row -1 denotes a failed extraction, and prefix + ".feature.npy", a float32 matrix.
+    With a table on disk, the entries evicted from memory are kept until `capacity` of
+    them are merged into the table, so that no feature is lost before :any:`save`.
+    """
+
+    def __init__(self, capacity, prefix=None):
+        self.capacity = capacity
+        self.prefix = prefix
+        self.memory = OrderedDict()
+        # evicted entries not merged into the table on disk yet
+        self.evicted = {}
+        self.disk_index = np.empty((0, 2), dtype=np.int64)
+        self.disk_feature = None
+        if prefix and os.path.isfile(prefix + ".index.npy"):
+            try:
+                self.disk_index = np.load(prefix + ".index.npy")
+                self.disk_feature = np.load(prefix + ".feature.npy", mmap_mode="r")
+            except (IOError, OSError, ValueError):
+                logger.warning("Ignore invalid feature cache %s", prefix)
+                self.disk_index = np.empty((0, 2), dtype=np.int64)
+                self.disk_feature = None
+
+    def _disk_row(self, index):
+        pos = np.searchsorted(self.disk_index[:, 0], index)
+        if pos < len(self.disk_index) and self.disk_index[pos, 0] == index:
+            return int(self.disk_index[pos, 1])
+        return None
+
+    def __contains__(self, index):
+        return index in self.memory or index in self.evicted or self._disk_row(index) is not None
+
+    def __getitem__(self, index):
+        if index in self.memory:
+            self.memory.move_to_end(index)
+            return self.memory[index]
+        if index in self.evicted:
+            return self.evicted[index]
+        row = self._disk_row(index)
+        if row is None:
+            raise KeyError(index)
+        return None if row < 0 else self.disk_feature[row]
+
+    def __setitem__(self, index, fea):
+        self.evicted.pop(index, None)
+        self.memory[index] = fea
+        self.memory.move_to_end(index)
+        while len(self.memory) > self.capacity:
+            old_index, old_fea = self.memory.popitem(last=False)
+            if self.prefix:
+                self.evicted[old_index] = old_fea
+        if len(self.evicted) >= self.capacity:
+            self._merge(self.evicted)
+            self.evicted = {}
+
+    def __len__(self):
+        # the entries in memory may be in the table on disk as well
+        indexes = np.fromiter(
+            list(self.memory) + list(self.evicted),
+            dtype=np.int64,
+            count=len(self.memory) + len(self.evicted),
+        )
+        return len(self.disk_index) + int(np.sum(~np.isin(indexes, self.disk_index[:, 0])))
+
+    def save(self):
+        """Merge the entries in memory into the table on disk"""
+        if not self.prefix or not (self.memory or self.evicted):
+            return
+        entries = dict(self.evicted)
+        entries.update(self.memory)
+        self._merge(entries)
+        self.memory = OrderedDict()
+        self.evicted = {}
+
+    def _merge(self, entries):
+        """Merge some entries into the table on disk"""
+        features = []
+        rows = {}
+        for index, row in self.disk_index:
+            rows[int(index)] = None if row < 0 else self.disk_feature[row]
+        rows.update((int(k), v) for k, v in entries.items())
+        fea_len = None
+        for fea in rows.values():
+            if fea is not None:
+                fea_len = len(fea)
+                break
+        index_table = []
+        for index in sorted(rows):
+            fea = rows[index]
+            if fea is None or len(fea) != fea_len:
+                index_table.append((index, -1))
+            else:
+                index_table.append((index, len(features)))
+                features.append(fea)
+        feature_table = np.array(features, dtype=np.float32).reshape((len(features), fea_len or 0))
+        index_table = np.array(index_table, dtype=np.int64).reshape((len(index_table), 2))
+
+        # write to temporary files first so that concurrent readers never see partial tables
+        for suffix, table in ((".feature.npy", feature_table), (".index.npy", index_table)):
+            tmp = "%s%s.%d.tmp" % (self.prefix, suffix, os.getpid())
+            with open(tmp, "wb") as f:
+                np.save(f, table)
+            os.replace(tmp, self.prefix + suffix)
+
+        self.disk_index = index_table
+        self.disk_feature = np.load(self.prefix + ".feature.npy", mmap_mode="r")
+
+
+class LRUFeatureCache(FeatureCache):
+    """Feature cache with a bounded number of features in memory per key,
+    least recently used features being evicted first.
+    When a cache directory is given, the features are persisted there with :any:`save`,
+    and memory-mapped back by later sessions on the same task, so that restarted
+    or transfer learning sessions skip feature extraction.
+
+    Parameters
+    ----------
+    capacity: int, optional
+        The maximum number of features kept in memory for a key
+    cache_dir: str, optional
+        The directory holding the persisted features
+    """
+
+    bounded = True
+
+    def __init__(self, capacity=100000, cache_dir=None):
+        super(LRUFeatureCache, self).__init__()
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        if cache_dir and not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+    def get(self, key):
+        if key not in self.feature_cache:
+            prefix = os.path.join(self.cache_dir, str(key)) if self.cache_dir else None
+            self.feature_cache[key] = _LRUFeatureDict(self.capacity, prefix)
+        return self.feature_cache[key]
+
+    def clear(self, key):
+        if key in self.feature_cache:
+            # keep the features that are persisted
+            self.feature_cache[key].save()
+            self.feature_cache[key].memory = OrderedDict()
+            self.feature_cache[key].evicted = {}
+        gc.collect()
+
+    def save(self, key=None):
+        """Persist the features of a key, or of all keys, to the cache directory
+
+        Parameters
+        ----------
+        key: str, optional
+            The key of a feature type
+        """
+        keys = [key] if key is not None else list(self.feature_cache.keys())
+        for k in keys:
+            if k in self.feature_cache:
+                self.feature_cache[k].save()
+
+
 class CostModel(object):
     """Cost model to predict the speed of a config"""
 
@@ -287,6 +460,7 @@ class ModelBasedTuner(Tuner):
 
     def load_history(self, data_set):
         # set in_tuning as True to make the feature extraction consistent
+        old_in_tuning = GLOBAL_SCOPE.in_tuning
         GLOBAL_SCOPE.in_tuning = True
 
         # fit base model
@@ -294,7 +468,7 @@ class ModelBasedTuner(Tuner):
         success = base_model.fit_log(data_set, self.plan_size)
 
         if not success:
-            GLOBAL_SCOPE.in_tuning = False
+            GLOBAL_SCOPE.in_tuning = old_in_tuning
             return
 
         # use base model to select initial points
@@ -305,7 +479,7 @@ class ModelBasedTuner(Tuner):
             self.trial_pt = 0
 
         self.cost_model.load_basemodel(base_model)
-        GLOBAL_SCOPE.in_tuning = False
+        GLOBAL_SCOPE.in_tuning = old_in_tuning
 
     def has_next(self):
         return len(self.visited) < len(self.space)
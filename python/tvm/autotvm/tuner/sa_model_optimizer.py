@@ -186,3 +186,172 @@ def random_walk(p, dims):
 
     # transform to index form
     return knob2point(new, dims)
+
+
+class BatchSimulatedAnnealingOptimizer(ModelOptimizer):
+    """parallel simulated annealing optimization algorithm where all the points of
+    an iteration are mutated as an array, scored by one call to the cost model and
+    merged into the candidate set of best points kept in numpy arrays
+
+    Parameters
+    ----------
+    task: Task
+        The tuning task
+    n_iter: int
+        The number of iterations of simulated annealing
+    temp: float or Array of float
+        If is a single float, then use a constant temperature.
+        If is an Array, then perform linear cooling from temp[0] to temp[1]
+    persistent: bool, optional
+        Whether to restart from the points of the previous call
+    parallel_size: int, optional
+        The number of points walked in parallel
+    early_stop: int, optional
+        Stop iteration if the optimal set do not change in `early_stop` rounds
+    log_interval: int, optional
+        Print log every `log_interval` iterations
+    """
+
+    def __init__(
+        self,
+        task,
+        n_iter=500,
+        temp=(1, 0),
+        persistent=True,
+        parallel_size=2048,
+        early_stop=50,
+        log_interval=50,
+    ):
+        super(BatchSimulatedAnnealingOptimizer, self).__init__()
+
+        self.task = task
+        self.space_len = len(self.task.config_space)
+        assert self.space_len < 2 ** 62, "The space is too large for int64 points"
+        self.dims = np.array(
+            [len(x) for x in self.task.config_space.space_map.values()], dtype=np.int64
+        )
+        self.strides = np.concatenate(([1], np.cumprod(self.dims)[:-1])).astype(np.int64)
+        # only the knobs with several options can move
+        self.walk_dims = np.nonzero(self.dims > 1)[0]
+
+        self.n_iter = n_iter
+        self.temp = temp
+        self.persistent = persistent
+        self.parallel_size = min(parallel_size, self.space_len)
+        self.early_stop = early_stop or 1e9
+        self.log_interval = log_interval
+        self.points = None
+
+    def random_walk(self, points):
+        """Change one knob of every point to another value
+
+        Parameters
+        ----------
+        points: Array of int
+            indexes of the ConfigEntity
+
+        Returns
+        -------
+        new_points: Array of int
+            new neighborhood indexes
+        """
+        if len(self.walk_dims) == 0:
+            return points.copy()
+        knob_i = self.walk_dims[np.random.randint(len(self.walk_dims), size=len(points))]
+        dims, strides = self.dims[knob_i], self.strides[knob_i]
+        old = (points // strides) % dims
+        # draw among the dim - 1 other values
+        new = (np.random.random(len(points)) * (dims - 1)).astype(np.int64)
+        new += new >= old
+        return points + (new - old) * strides
+
+    def find_maximums(self, model, num, exclusive):
+        if num <= 0:
+            return []
+        tic = time.time()
+        temp, n_iter, early_stop, log_interval = (
+            self.temp,
+            self.n_iter,
+            self.early_stop,
+            self.log_interval,
+        )
+
+        if self.persistent and self.points is not None:
+            points = self.points
+        else:
+            points = np.array(sample_ints(0, self.space_len, self.parallel_size), dtype=np.int64)
+        excluded = np.fromiter(exclusive, dtype=np.int64, count=len(exclusive))
+
+        scores = np.asarray(model.predict(points), dtype=np.float64)
+
+        # the best points with placeholders that are never returned
+        best_points = -1 - np.arange(num, dtype=np.int64)
+        best_scores = np.full(num, -np.inf)
+
+        def _merge(best_points, best_scores, new_points, new_scores):
+            """Keep the top-num of the best set and the new points. Returns whether it changed."""
+            new_points, first = np.unique(new_points, return_index=True)
+            new_scores = new_scores[first]
+            keep = ~np.isin(new_points, excluded) & ~np.isin(new_points, best_points)
+            keep &= new_scores > best_scores.min()
+            if not np.any(keep):
+                return best_points, best_scores, False
+            all_points = np.concatenate((best_points, new_points[keep]))
+            all_scores = np.concatenate((best_scores, new_scores[keep]))
+            top = np.argpartition(-all_scores, num - 1)[:num]
+            return all_points[top], all_scores[top], True
+
+        best_points, best_scores, _ = _merge(best_points, best_scores, points, scores)
+
+        k = 0
+        k_last_modify = 0
+
+        if isinstance(temp, (tuple, list, np.ndarray)):
+            t = temp[0]
+            cool = 1.0 * (temp[0] - temp[1]) / (n_iter + 1)
+        else:
+            t = temp
+            cool = 0
+
+        while k < n_iter and k < k_last_modify + early_stop:
+            new_points = self.random_walk(points)
+            new_scores = np.asarray(model.predict(new_points), dtype=np.float64)
+
+            ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
+            ac_index = np.random.random(len(ac_prob)) < ac_prob
+
+            points[ac_index] = new_points[ac_index]
+            scores[ac_index] = new_scores[ac_index]
+
+            best_points, best_scores, modified = _merge(
+                best_points, best_scores, new_points, new_scores
+            )
+            if modified:
+                k_last_modify = k
+
+            k += 1
+            t -= cool
+
+            if log_interval and k % log_interval == 0:
+                t_str = "%.2f" % t
+                logger.debug(
+                    "SA iter: %d\tlast_update: %d\tmax-0: %.2f\tmax-1: %.2f\ttemp: %s\t"
+                    "elapsed: %.2f",
+                    k,
+                    k_last_modify,
+                    best_scores.min(),
+                    best_scores.max(),
+                    t_str,
+                    time.time() - tic,
+                )
+
+        order = np.argsort(-best_scores, kind="stable")
+        order = order[best_points[order] >= 0]
+        logger.debug(
+            "SA iter: %d\tlast_update: %d\telapsed: %.2f", k, k_last_modify, time.time() - tic
+        )
+
+        if self.persistent:
+            self.points = points
+
+        return [int(x) for x in best_points[order]]
@@ -17,7 +17,10 @@
 # pylint: disable=unused-argument, no-self-use, invalid-name
 """Base class of tuner"""
 import logging
+import queue
+import shutil
 import tempfile
+import threading
 
 import numpy as np
 
@@ -88,7 +91,16 @@ class Tuner(object):
             result for measurement
         """
 
-    def tune(self, n_trial, measure_option, early_stopping=None, callbacks=(), si_prefix="G"):
+    def tune(
+        self,
+        n_trial,
+        measure_option,
+        early_stopping=None,
+        callbacks=(),
+        si_prefix="G",
+        pipeline=False,
+        pipeline_depth=1,
+    ):
         """Begin tuning
 
         Parameters
@@ -107,6 +119,12 @@ class Tuner(object):
             every measurement pair. See autotvm/tuner/callback.py for some examples.
         si_prefix: str
             One of tvm.autotvm.util.SI_PREFIXES. The SI prefix to use when reporting FLOPS.
+        pipeline: bool, optional
+            Overlap build and measurement: the next batches are proposed and compiled
+            while the previous one is being measured. The tuner is then updated with
+            a lag of `pipeline_depth` batches.
+        pipeline_depth: int, optional
+            The number of built batches allowed to wait for measurement in pipeline mode.
         """
         measure_batch = create_measure_batch(self.task, measure_option)
         n_parallel = getattr(measure_batch, "n_parallel", 1)
@@ -119,81 +137,171 @@ class Tuner(object):
 
         old_level = logger.level
 
+        # restore the previous value, the flag can be set for several tuners running at once
+        old_in_tuning = GLOBAL_SCOPE.in_tuning
         GLOBAL_SCOPE.in_tuning = True
-        i = error_ct = 0
-        errors = []
-        while i < n_trial:
-            if not self.has_next():
-                break
-
-            configs = self.next_batch(min(n_parallel, n_trial - i))
-            #logger.debug("Config list to test: %s", str(configs))
-            print("Testing config: {}".format(str(configs)))
-            inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
-            results = measure_batch(inputs)
-            logger.debug("Got inputs of length %d and results of length %d", len(inputs), len(results))
-            # keep best config
-            for k, (inp, res) in enumerate(zip(inputs, results)):
-                config = inp.config
-                if res.error_no == 0:
-                    flops = inp.task.flop / np.mean(res.costs)
-                    error_ct = 0
-                else:
-                    flops = 0
-                    error_ct += 1
-                    error = res.costs[0]
-                    if isinstance(error, str):
-                        errors.append(error)
-                    else:
-                        errors.append(str(error))
-
-                if flops > self.best_flops:
-                    self.best_flops = flops
-                    self.best_config = config
-                    self.best_measure_pair = (inp, res)
-                    self.best_iter = i + k
-
-                logger.debug(
-                    "No: %d\t%sFLOPS: %.2f/%.2f\tresult: %s\t%s",
-                    i + k + 1,
-                    si_prefix,
-                    format_si_prefix(flops, si_prefix),
-                    format_si_prefix(self.best_flops, si_prefix),
-                    res,
-                    config,
-                )
-
-            i += len(results)
-            self.ttl = min(early_stopping + self.best_iter, n_trial) - i
-
-            self.update(inputs, results)
-            for callback in callbacks:
-                callback(self, inputs, results)
-
-            if i >= self.best_iter + early_stopping:
-                logger.debug("Early stopped. Best iter: %d.", self.best_iter)
-                break
-
-            if error_ct > 150:
-                logging.basicConfig()
-                logger.warning("Too many errors happen in the tuning. Now is in debug mode")
-                logger.setLevel(logging.DEBUG)
-            else:
-                logger.setLevel(old_level)
-
-        if error_ct == i:
+        state = _TuneState(early_stopping, si_prefix, old_level)
+        if pipeline:
+            self._tune_pipelined(measure_batch, n_parallel, state, callbacks, pipeline_depth)
+        else:
+            while state.i < n_trial:
+                if not self.has_next():
+                    break
+
+                configs = self.next_batch(min(n_parallel, n_trial - state.i))
+                #logger.debug("Config list to test: %s", str(configs))
+                print("Testing config: {}".format(str(configs)))
+                inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
+                results = measure_batch(inputs)
+                if not self._process_batch(inputs, results, state, callbacks):
+                    break
+
+        if state.error_ct == state.i:
             _, f = tempfile.mkstemp(prefix="tvm_tuning_errors_", suffix=".log", text=True)
             with open(f, "w") as file:
-                file.write("\n".join(errors))
+                file.write("\n".join(state.errors))
             logging.warning(
                 "Could not find any valid schedule for task %s. "
                 "A file containing the errors has been written to %s.",
                 self.task,
                 f,
             )
-        GLOBAL_SCOPE.in_tuning = False
+        GLOBAL_SCOPE.in_tuning = old_in_tuning
         del measure_batch
 
+    def _tune_pipelined(self, measure_batch, n_parallel, state, callbacks, pipeline_depth):
+        """Tuning loop overlapping the build of the next batches with the current run.
+
+        Builds happen in the calling thread and runs in a single background thread,
+        connected by a bounded queue. Results are consumed in submission order and
+        always with the same lag, so the sequence of proposals, updates and callbacks
+        does not depend on timing. Every batch is built into its own directory, which
+        is removed once the batch has been measured.
+        """
+        build_queue = queue.Queue(maxsize=pipeline_depth)
+        result_queue = queue.Queue()
+        batch_dirs = set()
+
+        def _run_loop():
+            while True:
+                item = build_queue.get()
+                if item is None:
+                    break
+                inputs, build_results, batch_dir = item
+                try:
+                    results = measure_batch.run(inputs, build_results)
+                except Exception as exc:  # pylint: disable=broad-except
+                    results = exc
+                result_queue.put((inputs, results, batch_dir))
+
+        def _consume_one():
+            inputs, results, batch_dir = result_queue.get()
+            shutil.rmtree(batch_dir, ignore_errors=True)
+            batch_dirs.discard(batch_dir)
+            if isinstance(results, Exception):
+                raise results
+            return self._process_batch(inputs, results, state, callbacks)
+
+        runner_thread = threading.Thread(target=_run_loop)
+        runner_thread.daemon = True
+        runner_thread.start()
+
+        n_proposed = in_flight = 0
+        keep_going = True
+        try:
+            while keep_going and n_proposed < self.n_trial and self.has_next():
+                configs = self.next_batch(min(n_parallel, self.n_trial - n_proposed))
+                if not configs:
+                    # the tuner needs feedback before proposing more configs
+                    if in_flight == 0:
+                        break
+                    keep_going = _consume_one()
+                    in_flight -= 1
+                    continue
+
+                logger.debug("Config list to test: %s", configs)
+                inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
+                batch_dir = tempfile.mkdtemp(prefix="tvm_tuning_batch_")
+                batch_dirs.add(batch_dir)
+                build_results = measure_batch.build(inputs, tmp_dir=batch_dir)
+                build_queue.put((inputs, build_results, batch_dir))
+                n_proposed += len(inputs)
+                in_flight += 1
+
+                if in_flight > pipeline_depth:
+                    keep_going = _consume_one()
+                    in_flight -= 1
+
+            # batches already sent to the device are still recorded
+            while in_flight > 0:
+                _consume_one()
+                in_flight -= 1
+        finally:
+            build_queue.put(None)
+            runner_thread.join()
+            for batch_dir in batch_dirs:
+                shutil.rmtree(batch_dir, ignore_errors=True)
+
+    def _process_batch(self, inputs, results, state, callbacks):
+        """Keep the best config, update the tuner and run the callbacks for one batch.
+
+        Returns
+        -------
+        keep_going: bool
+            False if the early stopping criterion is reached
+        """
+        logger.debug("Got inputs of length %d and results of length %d", len(inputs), len(results))
+        si_prefix = state.si_prefix
+        # keep best config
+        for k, (inp, res) in enumerate(zip(inputs, results)):
+            config = inp.config
+            if res.error_no == 0:
+                flops = inp.task.flop / np.mean(res.costs)
+                state.error_ct = 0
+            else:
+                flops = 0
+                state.error_ct += 1
+                error = res.costs[0]
+                if isinstance(error, str):
+                    state.errors.append(error)
+                else:
+                    state.errors.append(str(error))
+
+            if flops > self.best_flops:
+                self.best_flops = flops
+                self.best_config = config
+                self.best_measure_pair = (inp, res)
+                self.best_iter = state.i + k
+
+            logger.debug(
+                "No: %d\t%sFLOPS: %.2f/%.2f\tresult: %s\t%s",
+                state.i + k + 1,
+                si_prefix,
+                format_si_prefix(flops, si_prefix),
+                format_si_prefix(self.best_flops, si_prefix),
+                res,
+                config,
+            )
+
+        state.i += len(results)
+        self.ttl = min(state.early_stopping + self.best_iter, self.n_trial) - state.i
+
+        self.update(inputs, results)
+        for callback in callbacks:
+            callback(self, inputs, results)
+
+        if state.i >= self.best_iter + state.early_stopping:
+            logger.debug("Early stopped. Best iter: %d.", self.best_iter)
+            return False
+
+        if state.error_ct > 150:
+            logging.basicConfig()
+            logger.warning("Too many errors happen in the tuning. Now is in debug mode")
+            logger.setLevel(logging.DEBUG)
+        else:
+            logger.setLevel(state.old_level)
+        return True
+
     def reset(self):
         """reset the status of tuner"""
         self.best_config = None
@@ -209,3 +317,15 @@ class Tuner(object):
             Previous tuning records
         """
         raise NotImplementedError()
+
+
+class _TuneState(object):
+    """Counters shared by the tuning loops of Tuner.tune"""
+
+    def __init__(self, early_stopping, si_prefix, old_level):
+        self.early_stopping = early_stopping
+        self.si_prefix = si_prefix
+        self.old_level = old_level
+        self.i = 0
+        self.error_ct = 0
+        self.errors = []
@@ -17,8 +17,10 @@
 # pylint: disable=invalid-name
 """XGBoost as cost model"""
 
+import hashlib
 import multiprocessing
 import logging
+import threading
 import time
 
 import numpy as np
@@ -70,10 +72,27 @@ class XGBoostCostModel(CostModel):
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    feature_cache: FeatureCache, optional
+        The cache of extracted features, e.g. a persistent LRUFeatureCache.
+        Ignored when upper_model is given, whose cache is shared.
+    incremental: bool, optional
+        If is True, each fit continues boosting from the previous booster
+        instead of training a new one from scratch.
+    window_size: int, optional
+        If is not None, fit only on the `window_size` most recent samples.
     """
 
     def __init__(
-        self, task, feature_type, loss_type, num_threads=None, log_interval=25, upper_model=None
+        self,
+        task,
+        feature_type,
+        loss_type,
+        num_threads=None,
+        log_interval=25,
+        upper_model=None,
+        feature_cache=None,
+        incremental=False,
+        window_size=None,
     ):
         super(XGBoostCostModel, self).__init__()
 
@@ -92,6 +111,11 @@ class XGBoostCostModel(CostModel):
         self.loss_type = loss_type
         self.num_threads = num_threads
         self.log_interval = log_interval
+        self.incremental = incremental
+        self.window_size = window_size
+        # the training time of every fit, in seconds
+        self.train_times = []
+        self._fitted_on_margin = False
 
         if loss_type == "reg":
             self.xgb_params = {
@@ -135,7 +159,8 @@ class XGBoostCostModel(CostModel):
         if upper_model:  # share a same feature cache with upper model
             self.feature_cache = upper_model.feature_cache
         else:
-            self.feature_cache = FeatureCache()
+            self.feature_cache = feature_cache or FeatureCache()
+        self.cache_key = _feature_cache_key(task, feature_type)
         self.upper_model = upper_model
         self.feature_extra_ct = 0
         self.pool = None
@@ -153,12 +178,15 @@ class XGBoostCostModel(CostModel):
 
         self._close_pool()
 
-        # use global variable to pass common arguments
+        # use global variable to pass common arguments.
+        # The lock keeps models created by concurrent threads from forking with the
+        # arguments of one another.
         global _extract_space, _extract_target, _extract_task
-        _extract_space = space
-        _extract_target = target
-        _extract_task = task
-        self.pool = multiprocessing.Pool(self.num_threads)
+        with _extract_lock:
+            _extract_space = space
+            _extract_target = target
+            _extract_task = task
+            self.pool = multiprocessing.Pool(self.num_threads)
 
     def _close_pool(self):
         if self.pool:
@@ -178,6 +206,10 @@ class XGBoostCostModel(CostModel):
         tic = time.time()
         self._reset_pool(self.space, self.target, self.task)
 
+        self._sample_size = len(xs)
+        if self.window_size and len(xs) > self.window_size:
+            xs, ys = xs[-self.window_size :], ys[-self.window_size :]
+
         x_train = self._get_feature(xs)
         y_train = np.array(ys)
         y_max = np.max(y_train)
@@ -186,7 +218,13 @@ class XGBoostCostModel(CostModel):
         valid_index = y_train > 1e-6
         index = np.random.permutation(len(x_train))
         dtrain = xgb.DMatrix(x_train[index], y_train[index])
-        self._sample_size = len(x_train)
+
+        # continue from the previous booster, unless it was fitted on the margin of a base model
+        xgb_model = None
+        if self.incremental and self.bst is not None and not self._fitted_on_margin:
+            xgb_model = self.bst
+            # restart early stopping on the new training data
+            xgb_model.set_attr(best_score=None, best_iteration=None, best_msg=None)
 
         if self.base_model:
             discount = self._base_model_discount()
@@ -195,11 +233,13 @@ class XGBoostCostModel(CostModel):
                 self.base_model = None
             else:
                 dtrain.set_base_margin(discount * self.base_model.predict(xs, output_margin=True))
+        self._fitted_on_margin = self.base_model is not None
 
         self.bst = xgb.train(
             self.xgb_params,
             dtrain,
             num_boost_round=8000,
+            xgb_model=xgb_model,
             callbacks=[
                 custom_callback(
                     stopping_rounds=20,
@@ -214,12 +254,14 @@ class XGBoostCostModel(CostModel):
             ],
         )
 
+        self.train_times.append(time.time() - tic)
         logger.debug(
-            "XGB train: %.2f\tobs: %d\terror: %d\tn_cache: %d",
-            time.time() - tic,
+            "XGB train: %.2f\tobs: %d\terror: %d\tn_cache: %d\twarm start: %s",
+            self.train_times[-1],
             len(xs),
             len(xs) - np.sum(valid_index),
-            self.feature_cache.size(self.fea_type),
+            self.feature_cache.size(self.cache_key),
+            xgb_model is not None,
         )
 
     def fit_log(self, records, plan_size):
@@ -313,30 +355,39 @@ class XGBoostCostModel(CostModel):
 
     def _get_feature(self, indexes):
         """get features for indexes, run extraction if we do not have cache for them"""
-        # free feature cache
-        if self.feature_cache.size(self.fea_type) >= 100000:
-            self.feature_cache.clear(self.fea_type)
+        # free feature cache, bounded caches evict by themselves
+        if not self.feature_cache.bounded and self.feature_cache.size(self.cache_key) >= 100000:
+            self.feature_cache.clear(self.cache_key)
 
-        fea_cache = self.feature_cache.get(self.fea_type)
+        fea_cache = self.feature_cache.get(self.cache_key)
 
+        # keep the features of this call locally, a bounded cache may evict some of them
         indexes = np.array(indexes)
-        need_extract = [x for x in indexes if x not in fea_cache]
+        feas = {}
+        need_extract = []
+        for x in indexes:
+            if x in feas:
+                continue
+            if x in fea_cache:
+                feas[x] = fea_cache[x]
+            else:
+                feas[x] = None
+                need_extract.append(x)
 
         if need_extract:
             pool = self._get_pool()
-            feas = pool.map(self.feature_extract_func, need_extract)
-            for i, fea in zip(need_extract, feas):
-                fea_cache[i] = fea
+            for i, fea in zip(need_extract, pool.map(self.feature_extract_func, need_extract)):
+                fea_cache[i] = feas[i] = fea
 
         feature_len = None
         for idx in indexes:
-            if fea_cache[idx] is not None:
-                feature_len = fea_cache[idx].shape[-1]
+            if feas[idx] is not None:
+                feature_len = feas[idx].shape[-1]
                 break
 
         ret = np.empty((len(indexes), feature_len), dtype=np.float32)
         for i, ii in enumerate(indexes):
-            t = fea_cache[ii]
+            t = feas[ii]
             ret[i, :] = t if t is not None else 0
         return ret
 
@@ -344,9 +395,16 @@ class XGBoostCostModel(CostModel):
         self._close_pool()
 
 
+def _feature_cache_key(task, feature_type):
+    """Key of the features of a task in a feature cache, stable across sessions"""
+    ident = str((task.name, task.args, str(task.target), repr(task.config_space)))
+    return "%s.%s" % (feature_type, hashlib.md5(ident.encode("utf-8")).hexdigest())
+
+
 _extract_space = None
 _extract_target = None
 _extract_task = None
+_extract_lock = threading.Lock()
 
 
 def _extract_itervar_feature_index(index):
@@ -18,7 +18,7 @@
 
 from .model_based_tuner import ModelBasedTuner, ModelOptimizer
 from .xgboost_cost_model import XGBoostCostModel
-from .sa_model_optimizer import SimulatedAnnealingOptimizer
+from .sa_model_optimizer import SimulatedAnnealingOptimizer, BatchSimulatedAnnealingOptimizer
 
 
 class XGBTuner(ModelBasedTuner):
@@ -57,6 +57,8 @@ class XGBTuner(ModelBasedTuner):
     num_threads: int, optional
         The number of threads.  optimizer: str or ModelOptimizer, optional
         If is 'sa', use a default simulated annealing optimizer.
+        If is 'batch_sa', use the simulated annealing optimizer that walks
+        the points as numpy arrays.
         Otherwise it should be a ModelOptimizer object.
 
     diversity_filter_ratio: int or float, optional
@@ -68,6 +70,18 @@ class XGBTuner(ModelBasedTuner):
         The verbose level.
         If is 0, output nothing.
         Otherwise, output debug information every `verbose` iterations.
+
+    feature_cache: FeatureCache, optional
+        The cache of extracted features. With a LRUFeatureCache that has a cache directory,
+        the features are saved there at the end of tuning and reused by later sessions.
+
+    incremental: bool, optional
+        If is True, the cost model continues boosting from its previous booster
+        at every refit instead of training from scratch.
+
+    window_size: int, optional
+        If is not None, the cost model is refitted only on the `window_size`
+        most recent measurements.
     """
 
     def __init__(
@@ -80,6 +94,9 @@ class XGBTuner(ModelBasedTuner):
         optimizer="sa",
         diversity_filter_ratio=None,
         log_interval=50,
+        feature_cache=None,
+        incremental=False,
+        window_size=None,
     ):
         cost_model = XGBoostCostModel(
             task,
@@ -87,9 +104,14 @@ class XGBTuner(ModelBasedTuner):
             loss_type=loss_type,
             num_threads=num_threads,
             log_interval=log_interval // 2,
+            feature_cache=feature_cache,
+            incremental=incremental,
+            window_size=window_size,
         )
         if optimizer == "sa":
             optimizer = SimulatedAnnealingOptimizer(task, log_interval=log_interval)
+        elif optimizer == "batch_sa":
+            optimizer = BatchSimulatedAnnealingOptimizer(task, log_interval=log_interval)
         else:
             assert isinstance(optimizer, ModelOptimizer), (
                 "Optimizer must be " "a supported name string" "or a ModelOptimizer object."
@@ -104,3 +126,6 @@ class XGBTuner(ModelBasedTuner):
 
         # manually close pool to avoid multiprocessing issues
         self.cost_model._close_pool()
+
+        if hasattr(self.cost_model.feature_cache, "save"):
+            self.cost_model.feature_cache.save(self.cost_model.cache_key)
@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """Minimum graph runtime that executes graph containing TVM PackedFunc."""
+import os
 import numpy as np
 import tvm._ffi
 
@@ -22,6 +23,7 @@ from tvm.rpc import _ffi_api as _rpc_ffi_api
 from tvm.rpc import base as rpc_base
 from tvm._ffi.base import string_types
 from tvm._ffi.runtime_ctypes import TVMContext
+from tvm.runtime import param_file as _param_file
 
 
 def create(graph_json_str, libmod, ctx):
@@ -159,6 +161,8 @@ class GraphModule(object):
         self._get_num_inputs = module["get_num_inputs"]
         self._load_params = module["load_params"]
         self._share_params = module["share_params"]
+        # the arrays the runtime refers to without copying them
+        self._zero_copy_params = {}
 
     def set_input(self, key=None, value=None, **params):
         """Set inputs to the module via kwargs
@@ -281,6 +285,45 @@ class GraphModule(object):
         """
         self._load_params(bytearray(params_bytes))
 
+    def load_params_from_file(self, path, zero_copy=False):
+        """Load parameters from a file, without reading the whole file in memory when it is
+        an aligned parameter file saved by :any:`tvm.relay.save_param_dict_to_file`.
+
+        The tensors of an aligned parameter file are copied one by one from the
+        memory-mapped file to the storage of the runtime. A file holding the blob of
+        :any:`tvm.relay.save_param_dict` is read and loaded with :any:`load_params`.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+
+        zero_copy : bool
+            Whether the runtime refers to the memory-mapped tensors of an aligned
+            parameter file instead of copying them, when its storage is on CPU.
+            The parameters must not be set again afterwards.
+        """
+        if not _param_file.is_param_file(path):
+            with open(path, "rb") as f:
+                params_bytes = bytearray(os.path.getsize(path))
+                f.readinto(params_bytes)
+            self._load_params(params_bytes)
+            return
+
+        params = _param_file.ParamFile(path)
+        cpu = TVMContext.STR2MASK["cpu"]
+        for name in params.names:
+            arr = self._get_input(name)
+            if arr is None:
+                continue
+            if zero_copy and arr.ctx.device_type == cpu:
+                view = params.get(name)
+                self.module["set_input_zero_copy"](name, view)
+                self._zero_copy_params[name] = view
+            else:
+                arr.copyfrom(params.asnumpy(name))
+                self._zero_copy_params.pop(name, None)
+
     def share_params(self, other, params_bytes):
         """Share parameters from pre-existing GraphRuntime instance.
 
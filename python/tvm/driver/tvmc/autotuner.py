@@ -17,9 +17,14 @@
 """
 Provides support to auto-tuning networks using AutoTVM.
 """
+import json
 import os.path
 import logging
+import queue
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from urllib.parse import urlparse
 
@@ -84,12 +89,25 @@ def add_tune_parser(subparsers):
         type=int,
         help="the maximum number of parallel devices to use when tuning",
     )
+    parser.add_argument(
+        "--parallel-tasks",
+        default=1,
+        type=int,
+        help="the number of tasks tuned at the same time. The tasks share the local builder "
+        "and split the --parallel devices between them. Defaults to 1",
+    )
     parser.add_argument(
         "--repeat",
         type=int,
         default=1,
         help="how many times to repeat each measurement",
     )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="file recording the tasks whose tuning is finished. The tasks already recorded "
+        "in it are skipped, which resumes an interrupted tuning",
+    )
     parser.add_argument(
         "--rpc-key",
         nargs=1,
@@ -184,35 +202,51 @@ def drive_tune(args):
         alter_layout=args.desired_layout,
     )
 
-    if args.rpc_tracker:
-
-        runner = autotvm.RPCRunner(
-            key=args.rpc_key,
-            host=rpc_hostname,
-            port=rpc_port,
+    parallel_tasks = max(1, args.parallel_tasks)
+
+    def _make_runner():
+        if args.rpc_tracker:
+            # the devices are split between the tasks tuned at the same time
+            return autotvm.RPCRunner(
+                key=args.rpc_key,
+                host=rpc_hostname,
+                port=rpc_port,
+                number=args.number,
+                repeat=args.repeat,
+                n_parallel=max(1, args.parallel // parallel_tasks),
+                timeout=args.timeout,
+                min_repeat_ms=min_repeat_ms,
+            )
+        return autotvm.LocalRunner(
             number=args.number,
             repeat=args.repeat,
-            n_parallel=args.parallel,
             timeout=args.timeout,
             min_repeat_ms=min_repeat_ms,
         )
-    else:
+
+    if not args.rpc_tracker:
         logger.info("starting localhost tuning")
-        runner = autotvm.LocalRunner(
-            number=args.number,
-            repeat=args.repeat,
-            timeout=args.timeout,
-            min_repeat_ms=min_repeat_ms,
-        )
+        if parallel_tasks > 1:
+            logger.warning(
+                "tuning %d tasks at the same time on localhost, "
+                "the measurements of a task may be disturbed by the others",
+                parallel_tasks,
+            )
+
+    # a single builder is shared by the tasks tuned at the same time
+    builder = autotvm.LocalBuilder(build_func="default")
+    measure_options = [
+        autotvm.measure_option(builder=builder, runner=_make_runner())
+        for _ in range(parallel_tasks)
+    ]
 
     tuning_option = {
         "tuner": args.tuner,
         "trials": args.trials,
         "early_stopping": args.early_stopping,
-        "measure_option": autotvm.measure_option(
-            builder=autotvm.LocalBuilder(build_func="default"), runner=runner
-        ),
+        "measure_option": measure_options[0] if parallel_tasks == 1 else measure_options,
         "tuning_records": args.tuning_records,
+        "checkpoint": args.checkpoint,
     }
     logger.debug(" tuning options: %s", tuning_option)
 
@@ -255,6 +289,61 @@ def get_tuning_tasks(mod, params, target, target_host=None, alter_layout=None):
     return tasks
 
 
+class _SharedBuilder(autotvm.measure.Builder):
+    """The builder of one of the tasks tuned at the same time.
+
+    The tasks build through the same builder, one batch at a time, since a batch
+    already keeps all its build processes busy. Each task keeps its own build
+    directory, so that a batch is not removed while it is being measured.
+
+    Parameters
+    ----------
+    builder : autotvm.LocalBuilder
+        The shared builder.
+    lock : threading.Lock
+        The lock of the shared builder.
+    """
+
+    def __init__(self, builder, lock):
+        super(_SharedBuilder, self).__init__(builder.timeout, builder.n_parallel)
+        self._builder = builder
+        self._lock = lock
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def build(self, measure_inputs):
+        with self._lock:
+            # the builder then only removes the directory of the previous batch of this task
+            self._builder.tmp_dir = self._tmp_dir
+            self._builder.set_task(self.task, self.build_kwargs)
+            results = self._builder.build(measure_inputs)
+            self._tmp_dir = self._builder.tmp_dir
+        return results
+
+
+def _task_key(task):
+    """Identify a task in the checkpoint file"""
+    return json.dumps({"target": str(task.target), "workload": str(task.workload)})
+
+
+def load_checkpoint(checkpoint):
+    """Load the keys of the tasks whose tuning is finished.
+
+    Parameters
+    ----------
+    checkpoint : str
+        Path to the checkpoint file.
+
+    Returns
+    -------
+    finished : set of str
+        The keys of the finished tasks, empty if the file does not exist.
+    """
+    if not checkpoint or not os.path.exists(checkpoint):
+        return set()
+    with open(checkpoint) as f:
+        return set(line.strip() for line in f if line.strip())
+
+
 def tune_tasks(
     tasks,
     log_file,
@@ -263,6 +352,7 @@ def tune_tasks(
     trials,
     early_stopping=None,
     tuning_records=None,
+    checkpoint=None,
 ):
     """Tune a list of tasks and output the history to a log file.
 
@@ -272,8 +362,10 @@ def tune_tasks(
         A list of autotvm.Tasks to tune.
     log_file : str
         A file to output the tuning history, in JSON.
-    measure_option : autotvm.measure_option
-        Options to build and run a tuning task.
+    measure_option : autotvm.measure_option or list of autotvm.measure_option
+        Options to build and run a tuning task. Given a list, as many tasks
+        as options are tuned at the same time, each with its own runner.
+        The tasks whose options have the same builder share it.
     tuner : str
         Which tuner to use.
     trials : int
@@ -284,6 +376,9 @@ def tune_tasks(
     tuning_records: str, optional
         Path to the file produced by the tuning, to be used during
         tuning.
+    checkpoint: str, optional
+        Path to a file recording the tasks whose tuning is finished.
+        The tasks already recorded in it are not tuned again.
     """
     if not tasks:
         logger.warning("there were no tasks found to be tuned")
@@ -292,8 +387,49 @@ def tune_tasks(
     if not early_stopping:
         early_stopping = trials
 
-    for i, tsk in enumerate(tasks):
+    measure_options = measure_option if isinstance(measure_option, list) else [measure_option]
+    if len(measure_options) > 1:
+        builder_locks = {}
+        shared_options = []
+        for option in measure_options:
+            lock = builder_locks.setdefault(id(option["builder"]), threading.Lock())
+            shared_options.append(dict(option, builder=_SharedBuilder(option["builder"], lock)))
+        measure_options = shared_options
+
+    # If transfer learning is being used, load the existing results once,
+    # they are then given to the tasks of the same name
+    history = {}
+    if tuning_records and os.path.exists(tuning_records):
+        logger.info("loading tuning records from %s", tuning_records)
+        start_time = time.time()
+        for inp, res in autotvm.record.load_from_file(tuning_records):
+            history.setdefault(inp.task.name, []).append((inp, res))
+        logger.info("loaded history in %.2f sec(s)", time.time() - start_time)
+
+    # the records of this run are used by the tasks tuned next when they are logged to
+    # tuning_records, as if it were loaded again for each task
+    share_records = bool(tuning_records) and os.path.abspath(tuning_records) == os.path.abspath(
+        log_file
+    )
+    finished = load_checkpoint(checkpoint)
+    lock = threading.Lock()
+
+    def _log_and_share(tuner_obj, inputs, results):
+        with lock:
+            log_callback(tuner_obj, inputs, results)
+            if share_records:
+                history.setdefault(tuner_obj.task.name, []).extend(zip(inputs, results))
+
+    log_callback = autotvm.callback.log_to_file(log_file)
+    free_options = queue.Queue()
+    for option in measure_options:
+        free_options.put(option)
+
+    def _tune_task(i, tsk):
         prefix = "[Task %2d/%2d] " % (i + 1, len(tasks))
+        if _task_key(tsk) in finished:
+            logger.info("%sskipped, already tuned according to %s", prefix, checkpoint)
+            return
 
         # Create a tuner
         if tuner in ("xgb", "xgb-rank"):
@@ -309,19 +445,47 @@ def tune_tasks(
         else:
             raise TVMCException("invalid tuner: %s " % tuner)
 
-        # If transfer learning is being used, load the existing results
-        if tuning_records and os.path.exists(tuning_records):
-            logger.info("loading tuning records from %s", tuning_records)
-            start_time = time.time()
-            tuner_obj.load_history(autotvm.record.load_from_file(tuning_records))
-            logging.info("loaded history in %.2f sec(s)", time.time() - start_time)
-
-        tuner_obj.tune(
-            n_trial=min(trials, len(tsk.config_space)),
-            early_stopping=early_stopping,
-            measure_option=measure_option,
-            callbacks=[
-                autotvm.callback.progress_bar(trials, prefix=prefix),
-                autotvm.callback.log_to_file(log_file),
-            ],
-        )
+        with lock:
+            task_history = list(history.get(tsk.name, []))
+        if task_history:
+            tuner_obj.load_history(task_history)
+
+        callbacks = [_log_and_share]
+        if len(measure_options) == 1:
+            callbacks.insert(0, autotvm.callback.progress_bar(trials, prefix=prefix))
+
+        option = free_options.get()
+        try:
+            tuner_obj.tune(
+                n_trial=min(trials, len(tsk.config_space)),
+                early_stopping=early_stopping,
+                measure_option=option,
+                callbacks=callbacks,
+            )
+        finally:
+            free_options.put(option)
+
+        if len(measure_options) > 1:
+            logger.info("%sfinished, best: %.2f GFLOPS", prefix, tuner_obj.best_flops / 1e9)
+        if checkpoint:
+            with lock:
+                with open(checkpoint, "a") as f:
+                    f.write(_task_key(tsk) + "\n")
+
+    if len(measure_options) == 1:
+        for i, tsk in enumerate(tasks):
+            _tune_task(i, tsk)
+        return
+
+    # the tuners running at once share the global in_tuning flag, so it is set once for all
+    # of them and the tuners leave it set
+    old_in_tuning = autotvm.GLOBAL_SCOPE.in_tuning
+    autotvm.GLOBAL_SCOPE.in_tuning = True
+    try:
+        with ThreadPoolExecutor(max_workers=len(measure_options)) as executor:
+            futures = [executor.submit(_tune_task, i, tsk) for i, tsk in enumerate(tasks)]
+            for future in futures:
+                # raise the errors of the tasks
+                future.result()
+    finally:
+        autotvm.GLOBAL_SCOPE.in_tuning = old_in_tuning
@@ -22,6 +22,9 @@ import logging
 import os
 import tarfile
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import tvm
@@ -29,6 +32,7 @@ from tvm import rpc
 from tvm.autotvm.measure import request_remote
 from tvm.contrib import graph_runtime as runtime
 from tvm.contrib.debugger import debug_runtime
+from tvm.runtime import param_file
 
 from . import common
 from .common import TVMCException
@@ -93,6 +97,54 @@ def add_run_parser(subparsers):
         help="hostname (required) and port (optional, defaults to 9090) of the RPC tracker, "
         "e.g. '192.168.0.100:9999'",
     )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="run in benchmark mode: after warm-up runs, report the latency percentiles "
+        "and the throughput of the module instead of its outputs. "
+        "Use a large --repeat to get meaningful percentiles",
+    )
+    parser.add_argument(
+        "--warmup",
+        metavar="N",
+        type=int,
+        default=5,
+        help="number of runs before measuring in benchmark mode. Defaults to '5'",
+    )
+    parser.add_argument(
+        "--number",
+        metavar="N",
+        type=int,
+        default=1,
+        help="number of runs averaged in each repeat in benchmark mode. Defaults to '1'",
+    )
+    parser.add_argument(
+        "--concurrency",
+        metavar="N",
+        type=int,
+        default=1,
+        help="number of module instances run concurrently in benchmark mode, "
+        "sharing their params. Only supported for local runs. Defaults to '1'",
+    )
+    parser.add_argument(
+        "--threads",
+        metavar="N",
+        type=int,
+        default=0,
+        help="number of threads of each module instance in benchmark mode. "
+        "Defaults to '0', the runtime default",
+    )
+    parser.add_argument(
+        "--pin-threads",
+        choices=["big", "little"],
+        help="pin the threads of each module instance to the big or little cores "
+        "in benchmark mode",
+    )
+    parser.add_argument(
+        "--benchmark-output",
+        metavar="PATH",
+        help="path to save the benchmark report as JSON",
+    )
     parser.add_argument("FILE", help="path to the compiled module file")
 
 
@@ -107,6 +159,29 @@ def drive_run(args):
 
     rpc_hostname, rpc_port = common.tracker_host_port_from_cli(args.rpc_tracker)
 
+    if args.benchmark:
+        report = benchmark_module(
+            args.FILE,
+            rpc_hostname,
+            rpc_port,
+            args.rpc_key,
+            inputs_file=args.inputs,
+            device=args.device,
+            fill_mode=args.fill_mode,
+            warmup=args.warmup,
+            number=args.number,
+            repeat=args.repeat,
+            concurrency=args.concurrency,
+            num_threads=args.threads,
+            pin_threads=args.pin_threads,
+        )
+        # print here is intentional
+        print(format_benchmark(report))
+        if args.benchmark_output:
+            with open(args.benchmark_output, "w") as f:
+                json.dump(report, f, indent=2)
+        return
+
     outputs, times = run_module(
         args.FILE,
         rpc_hostname,
@@ -150,8 +225,8 @@ def get_input_info(graph_str, params):
     ----------
     graph_str : str
         JSON graph of the module serialized as a string.
-    params : bytearray
-        Params serialized as a bytearray.
+    params : bytearray or list of str
+        Params serialized as a bytearray, or the names of the params.
 
     Returns
     -------
@@ -164,8 +239,11 @@ def get_input_info(graph_str, params):
     shape_dict = {}
     dtype_dict = {}
     # Use a special function to load the binary params back into a dict
-    load_arr = tvm.get_global_func("tvm.relay._load_param_dict")(params)
-    param_names = [v.name for v in load_arr]
+    if isinstance(params, (bytes, bytearray)):
+        load_arr = tvm.get_global_func("tvm.relay._load_param_dict")(params)
+        param_names = [v.name for v in load_arr]
+    else:
+        param_names = list(params)
     graph = json.loads(graph_str)
     for node_id in graph["arg_nodes"]:
         node = graph["nodes"][node_id]
@@ -286,6 +364,38 @@ def make_inputs_dict(inputs_file, shape_dict, dtype_dict, fill_mode):
     return inputs_dict
 
 
+def create_session(hostname, port=9090, rpc_key=None):
+    """Create the RPC session to run a module in.
+
+    Parameters
+    ----------
+    hostname : str
+        The hostname of the target device on which to run,
+        or None to run locally.
+    port : int, optional
+        The port of the target device on which to run.
+    rpc_key : str, optional
+        The tracker key of the target device. If this is set, it
+        will be assumed that remote points to a tracker.
+
+    Returns
+    -------
+    session : RPCSession
+        The remote session, or a local session.
+    """
+    if hostname:
+        # Remote RPC
+        if rpc_key:
+            logger.debug("running on remote RPC tracker with key %s", rpc_key)
+            return request_remote(rpc_key, hostname, port, timeout=1000)
+        logger.debug("running on remote RPC with no key")
+        return rpc.connect(hostname, port)
+
+    # Local
+    logger.debug("running a local session")
+    return rpc.LocalSession()
+
+
 def run_module(
     module_file,
     hostname,
@@ -341,21 +451,9 @@ def run_module(
         t = tarfile.open(module_file)
         t.extractall(tmp_dir)
         graph = open(os.path.join(tmp_dir, "mod.json")).read()
-        params = bytearray(open(os.path.join(tmp_dir, "mod.params"), "rb").read())
-
-        if hostname:
-            # Remote RPC
-            if rpc_key:
-                logger.debug("running on remote RPC tracker with key %s", rpc_key)
-                session = request_remote(rpc_key, hostname, port, timeout=1000)
-            else:
-                logger.debug("running on remote RPC with no key")
-                session = rpc.connect(hostname, port)
-        else:
-            # Local
-            logger.debug("running a local session")
-            session = rpc.LocalSession()
+        params_file = os.path.join(tmp_dir, "mod.params")
 
+        session = create_session(hostname, port, rpc_key)
         session.upload(os.path.join(tmp_dir, "mod.so"))
         lib = session.load_module("mod.so")
 
@@ -371,9 +469,9 @@ def run_module(
             module = runtime.create(graph, lib, ctx)
 
         logger.debug("load params into the runtime module")
-        module.load_params(params)
+        module.load_params_from_file(params_file)
 
-        shape_dict, dtype_dict = get_input_info(graph, params)
+        shape_dict, dtype_dict = get_input_info(graph, param_file.load_param_names(params_file))
         inputs_dict = make_inputs_dict(inputs_file, shape_dict, dtype_dict, fill_mode)
 
         logger.debug("setting inputs to the module")
@@ -401,6 +499,197 @@ def run_module(
         return outputs, times
 
 
+def benchmark_module(
+    module_file,
+    hostname,
+    port=9090,
+    rpc_key=None,
+    device=None,
+    inputs_file=None,
+    fill_mode="random",
+    warmup=5,
+    number=1,
+    repeat=10,
+    concurrency=1,
+    num_threads=0,
+    pin_threads=None,
+):
+    """Measure the steady-state latency and the throughput of a compiled
+    graph runtime module, locally or remotely.
+
+    With a concurrency of 1, the latencies are measured on the device with
+    the time evaluator. Otherwise, `concurrency` instances of the module sharing
+    their params are run at the same time from as many threads, each thread
+    timing its own runs.
+
+    Parameters
+    ----------
+    module_file : str
+        The path to the module file (a .tar file).
+    hostname : str
+        The hostname of the target device on which to run.
+    port : int, optional
+        The port of the target device on which to run.
+    rpc_key : str, optional
+        The tracker key of the target device. If this is set, it
+        will be assumed that remote points to a tracker.
+    device: str, optional
+        the device (e.g. "cpu" or "gpu") to be targeted by the RPC
+        session, local or remote).
+    inputs_file : str, optional
+        Path to an .npz file containing the inputs.
+    fill_mode : str, optional
+        The fill-mode to use when generating data for input tensors.
+        Valid options are "zeros", "ones" and "random".
+        Defaults to "random".
+    warmup : int, optional
+        The number of runs of each instance before measuring.
+    number : int, optional
+        The number of runs averaged in each measured latency.
+    repeat : int, optional
+        The number of latencies measured by each instance.
+    concurrency : int, optional
+        The number of module instances run at the same time.
+    num_threads : int, optional
+        The number of threads of each instance, 0 for the runtime default.
+    pin_threads : str, optional
+        "big" or "little" to pin the threads of each instance to these cores.
+
+    Returns
+    -------
+    report : dict
+        The benchmark configuration, the latency statistics (in seconds),
+        the throughput (in runs per second) and the measured latencies.
+    """
+    if concurrency > 1 and hostname:
+        raise TVMCException("concurrent benchmark is only supported for local runs")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        logger.debug("extracting module file %s", module_file)
+        t = tarfile.open(module_file)
+        t.extractall(tmp_dir)
+        graph = open(os.path.join(tmp_dir, "mod.json")).read()
+        params = bytearray(open(os.path.join(tmp_dir, "mod.params"), "rb").read())
+
+        session = create_session(hostname, port, rpc_key)
+        session.upload(os.path.join(tmp_dir, "mod.so"))
+        lib = session.load_module("mod.so")
+
+    ctx = session.cpu() if device == "cpu" else session.gpu()
+    shape_dict, dtype_dict = get_input_info(graph, params)
+    inputs_dict = make_inputs_dict(inputs_file, shape_dict, dtype_dict, fill_mode)
+
+    # the instances after the first one share its params instead of copying them
+    modules = []
+    for _ in range(concurrency):
+        module = runtime.create(graph, lib, ctx)
+        if modules:
+            module.share_params(modules[0], params)
+        else:
+            module.load_params(params)
+        module.set_input(**inputs_dict)
+        modules.append(module)
+
+    def _config_threads():
+        # the thread pool of the runtime is configured per thread
+        if num_threads or pin_threads:
+            affinity = {"big": 1, "little": -1}.get(pin_threads, 0)
+            session.get_function("runtime.config_threadpool")(affinity, num_threads)
+
+    if concurrency == 1:
+        _config_threads()
+        for _ in range(warmup):
+            modules[0].run()
+        ctx.sync()
+        tic = time.time()
+        timer = modules[0].module.time_evaluator("run", ctx, number=number, repeat=repeat)
+        times = list(timer().results)
+        wall_time = time.time() - tic
+        throughput = 1.0 / np.mean(times)
+    else:
+        barrier = threading.Barrier(concurrency + 1)
+
+        def _worker(module):
+            try:
+                _config_threads()
+                for _ in range(warmup):
+                    module.run()
+                ctx.sync()
+            except Exception:
+                # do not leave the other threads waiting for this one
+                barrier.abort()
+                raise
+            latencies = []
+            barrier.wait()
+            for _ in range(repeat):
+                tic = time.perf_counter()
+                for _ in range(number):
+                    module.run()
+                ctx.sync()
+                latencies.append((time.perf_counter() - tic) / number)
+            return latencies
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(_worker, m) for m in modules]
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                # raise the error of the worker that broke the barrier
+                for future in futures:
+                    error = future.exception()
+                    if error is not None and not isinstance(error, threading.BrokenBarrierError):
+                        raise error
+                raise
+            tic = time.perf_counter()
+            times = [latency for future in futures for latency in future.result()]
+            wall_time = time.perf_counter() - tic
+        throughput = concurrency * number * repeat / wall_time
+
+    report = {
+        "config": {
+            "module": module_file,
+            "device": device,
+            "warmup": warmup,
+            "number": number,
+            "repeat": repeat,
+            "concurrency": concurrency,
+            "threads": num_threads,
+            "pin_threads": pin_threads,
+        },
+        "latency": get_latency_stats(times),
+        "throughput": float(throughput),
+        "wall_time": float(wall_time),
+        "times": [float(x) for x in times],
+    }
+    return report
+
+
+def get_latency_stats(times):
+    """Compute the statistics of latencies.
+
+    Parameters
+    ----------
+    times : list
+        A list of latencies (in seconds).
+
+    Returns
+    -------
+    stats : dict
+        The mean, std, min, p50, p90, p99 and max of the latencies (in seconds).
+    """
+    times = np.asarray(times, dtype="float64")
+    p50, p90, p99 = np.percentile(times, [50, 90, 99])
+    return {
+        "mean": float(np.mean(times)),
+        "std": float(np.std(times)),
+        "min": float(np.min(times)),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(np.max(times)),
+    }
+
+
 def get_top_results(outputs, max_results):
     """Return the top n results from the output tensor.
 
@@ -460,3 +749,33 @@ def format_times(times):
     )
     stats = "{0:^10.5f} {1:^10.5f} {2:^10.5f} {3:^10.5f}".format(mean_ts, max_ts, min_ts, std_ts)
     return "%s\n%s\n" % (header, stats)
+
+
+def format_benchmark(report):
+    """Format the latency statistics and the throughput of a benchmark report.
+
+    This has the effect of producing a small table that looks like:
+
+        Benchmark summary (concurrency 1):
+        mean (s)   p50 (s)    p90 (s)    p99 (s)    max (s)   throughput (/s)
+        0.14310    0.14201    0.15011    0.16002    0.16161      6.98812
+
+    Parameters
+    ----------
+    report : dict
+        The report returned by benchmark_module.
+
+    Returns
+    -------
+    str
+        A formatted string containing the statistics.
+    """
+    stats = report["latency"]
+    header = "Benchmark summary (concurrency {0}):\n".format(report["config"]["concurrency"])
+    header += "{0:^10} {1:^10} {2:^10} {3:^10} {4:^10} {5:^15}".format(
+        "mean (s)", "p50 (s)", "p90 (s)", "p99 (s)", "max (s)", "throughput (/s)"
+    )
+    values = "{0:^10.5f} {1:^10.5f} {2:^10.5f} {3:^10.5f} {4:^10.5f} {5:^15.5f}".format(
+        stats["mean"], stats["p50"], stats["p90"], stats["p99"], stats["max"], report["throughput"]
+    )
+    return "%s\n%s\n" % (header, values)
@@ -15,45 +15,81 @@
 # specific language governing permissions and limitations
 # under the License.
 # pylint: disable=invalid-name
-"""Pick best log entries from a large file and store them to a small file"""
+"""Edit large autotvm log files with bounded memory: pick the best entries,
+dedupe, split by workload and merge.
+
+e.g.
+python -m tvm.exec.autotvm_log_editor --act pick-best --i collect.log --top-k 3
+python -m tvm.exec.autotvm_log_editor --act split --i collect.log --jobs 8
+python -m tvm.exec.autotvm_log_editor --act merge --i logs/ --o all.log --clean
+"""
 
 import argparse
 import os
 import logging
-import warnings
 
 from .. import autotvm
 
-if __name__ == "__main__":
+
+def _input_files(path):
+    if os.path.isfile(path):
+        return [path]
+    if os.path.isdir(path):
+        return sorted(
+            os.path.join(path, filename)
+            for filename in os.listdir(path)
+            if filename.endswith(".log")
+        )
+    raise ValueError("Invalid input file: " + path)
+
+
+def main():
+    """Main function"""
     parser = argparse.ArgumentParser()
-    parser.add_argument("--act", type=str, choices=["pick-best"], required=True, help="The action")
+    parser.add_argument(
+        "--act",
+        type=str,
+        choices=["pick-best", "dedupe", "split", "merge"],
+        required=True,
+        help="The action",
+    )
     parser.add_argument("--i", type=str, help="The input file or directory", required=True)
-    parser.add_argument("--o", type=str, help="The output file")
+    parser.add_argument("--o", type=str, help="The output file, or prefix for split")
+    parser.add_argument(
+        "--top-k", type=int, default=1, help="The number of best entries kept by pick-best"
+    )
+    parser.add_argument(
+        "--clean", action="store_true", help="Delete duplicated entries when merging"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="The number of processes, all cpu cores by default"
+    )
 
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
 
     if args.act == "pick-best":
         if os.path.isfile(args.i):
+            # a single file may also be a record store
             args.o = args.o or args.i + ".best.log"
-            autotvm.record.pick_best(args.i, args.o)
-        elif os.path.isdir(args.i):
-            args.o = args.o or "best.log"
-            tmp_filename = args.o + ".tmp"
-
-            with open(tmp_filename, "w") as tmp_fout:
-                for filename in os.listdir(args.i):
-                    if filename.endswith(".log"):
-                        try:
-                            autotvm.record.pick_best(filename, tmp_fout)
-                        except Exception:  # pylint: disable=broad-except
-                            warnings.warn("Ignore invalid file %s" % filename)
-
-            logging.info("Run final filter...")
-            autotvm.record.pick_best(tmp_filename, args.o)
-            os.remove(tmp_filename)
-            logging.info("Output to %s ...", args.o)
+            autotvm.record.pick_best(args.i, args.o, args.top_k, args.jobs)
         else:
+            args.o = args.o or "best.log"
+            autotvm.record.pick_best(_input_files(args.i), args.o, args.top_k, args.jobs)
+    elif args.act == "dedupe":
+        args.o = args.o or args.i.rstrip("/") + ".dedupe.log"
+        autotvm.record.dedupe_log(_input_files(args.i), args.o, args.jobs)
+    elif args.act == "merge":
+        args.o = args.o or "merged.log"
+        autotvm.record.merge_logs(_input_files(args.i), args.o, args.clean, args.jobs)
+    elif args.act == "split":
+        if not os.path.isfile(args.i):
             raise ValueError("Invalid input file: " + args.i)
+        autotvm.record.split_workload(args.i, out_prefix=args.o, n_jobs=args.jobs)
     else:
         raise ValueError("Invalid action " + args.act)
+    logging.info("Output to %s ...", args.o or args.i)
+
+
+if __name__ == "__main__":
+    main()
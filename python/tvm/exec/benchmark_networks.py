@@ -0,0 +1,357 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Track the end-to-end latency of the relay.testing networks on the local CPU.
+
+The networks are compiled with the best records of a tuning log and run with the
+graph runtime. The latencies are appended to a JSON history and compared to a
+baseline run of the history to detect regressions.
+
+e.g.
+python3 -m tvm.exec.benchmark_networks --log-file tuning.log --history bench.json
+python3 -m tvm.exec.benchmark_networks --networks resnet-18 mobilenet \
+        --target "llvm -mcpu=skylake-avx512" --threshold 0.05 --fail-on-regression
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+import tvm
+from tvm import autotvm, relay
+from tvm.contrib import graph_runtime
+from tvm.driver.tvmc.runner import get_latency_stats
+from tvm.relay import testing
+
+logger = logging.getLogger("benchmark")
+
+NETWORKS = [
+    "resnet-18",
+    "resnet-50",
+    "mobilenet",
+    "inception_v3",
+    "densenet-121",
+    "squeezenet_v1.1",
+    "vgg-16",
+    "lstm",
+    "dcgan",
+    "mlp",
+]
+
+
+def get_network(name, batch_size, dtype="float32"):
+    """Get the definition and random weights of a relay.testing network
+
+    Parameters
+    ----------
+    name: str
+        The name of the network, one of NETWORKS
+    batch_size: int
+        The batch size
+    dtype: str
+        The data type
+
+    Returns
+    -------
+    mod: tvm.IRModule
+        The module of the network
+    params: dict of str to NDArray
+        The random weights of the network
+    """
+    if "resnet" in name:
+        n_layer = int(name.split("-")[1])
+        return testing.resnet.get_workload(num_layers=n_layer, batch_size=batch_size, dtype=dtype)
+    if "vgg" in name:
+        n_layer = int(name.split("-")[1])
+        return testing.vgg.get_workload(num_layers=n_layer, batch_size=batch_size, dtype=dtype)
+    if "densenet" in name:
+        n_layer = int(name.split("-")[1])
+        return testing.densenet.get_workload(
+            densenet_size=n_layer, batch_size=batch_size, dtype=dtype
+        )
+    if "squeezenet" in name:
+        version = name.split("_v")[1]
+        return testing.squeezenet.get_workload(batch_size=batch_size, version=version, dtype=dtype)
+    if name == "mobilenet":
+        return testing.mobilenet.get_workload(batch_size=batch_size, dtype=dtype)
+    if name == "inception_v3":
+        return testing.inception_v3.get_workload(batch_size=batch_size, dtype=dtype)
+    if name == "lstm":
+        return testing.lstm.get_workload(
+            iterations=10, num_hidden=512, batch_size=batch_size, dtype=dtype
+        )
+    if name == "dcgan":
+        return testing.dcgan.get_workload(batch_size=batch_size, dtype=dtype)
+    if name == "mlp":
+        return testing.mlp.get_workload(batch_size=batch_size, dtype=dtype)
+    raise ValueError("Unsupported network: " + name)
+
+
+def _input_info(mod, params):
+    """Get the (name, shape, dtype) of the inputs of a network that are not weights"""
+    mod = relay.transform.InferType()(mod)
+    inputs = []
+    for param in mod["main"].params:
+        if param.name_hint not in params:
+            ttype = param.checked_type
+            inputs.append((param.name_hint, [int(x) for x in ttype.shape], ttype.dtype))
+    return inputs
+
+
+def benchmark_network(
+    name, batch_size=1, target="llvm", log_file=None, warmup=10, number=10, repeat=30, opt_level=3
+):
+    """Compile a network and measure its latency on the local CPU
+
+    Parameters
+    ----------
+    name: str
+        The name of the network, one of NETWORKS
+    batch_size: int
+        The batch size
+    target: str
+        The compilation target, for the local CPU
+    log_file: str, optional
+        The tuning log whose best records are applied during compilation
+    warmup: int
+        The number of runs before measuring
+    number: int
+        The number of runs averaged in each latency
+    repeat: int
+        The number of latencies measured
+    opt_level: int
+        The optimization level of the compilation
+
+    Returns
+    -------
+    result: dict
+        The latency statistics in milliseconds, with the compilation time in seconds
+    """
+    mod, params = get_network(name, batch_size)
+    inputs = _input_info(mod, params)
+
+    tic = time.time()
+    with tvm.transform.PassContext(opt_level=opt_level):
+        if log_file:
+            with autotvm.apply_history_best(log_file):
+                lib = relay.build(mod, target=target, params=params)
+        else:
+            lib = relay.build(mod, target=target, params=params)
+    compile_time = time.time() - tic
+
+    ctx = tvm.cpu(0)
+    module = graph_runtime.GraphModule(lib["default"](ctx))
+    for input_name, shape, dtype in inputs:
+        module.set_input(input_name, np.random.uniform(size=shape).astype(dtype))
+
+    for _ in range(warmup):
+        module.run()
+    ctx.sync()
+    ftimer = module.module.time_evaluator("run", ctx, number=number, repeat=repeat)
+    # the results are in milliseconds
+    result = get_latency_stats([t * 1000 for t in ftimer().results])
+    result["compile_time"] = compile_time
+    return result
+
+
+def load_history(history_file):
+    """Load the runs of a benchmark history
+
+    Parameters
+    ----------
+    history_file: str
+        The JSON history
+
+    Returns
+    -------
+    runs: list of dict
+        The runs, from the oldest one, empty if the file does not exist
+    """
+    if not os.path.isfile(history_file):
+        return []
+    with open(history_file) as f:
+        return json.load(f)
+
+
+def append_history(history_file, run):
+    """Append a run to a benchmark history, replacing the file atomically
+
+    Parameters
+    ----------
+    history_file: str
+        The JSON history
+    run: dict
+        The run to append
+    """
+    runs = load_history(history_file)
+    runs.append(run)
+    tmp_file = history_file + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(runs, f, indent=2)
+    os.replace(tmp_file, history_file)
+
+
+def find_baseline(runs, config, baseline="last"):
+    """Find the baseline run of a history with the same configuration
+
+    Parameters
+    ----------
+    runs: list of dict
+        The runs of the history
+    config: dict
+        The target and batch size of the runs to compare
+    baseline: str
+        "last" for the latest matching run, "first" for the oldest one
+
+    Returns
+    -------
+    run: dict or None
+    """
+    matching = [run for run in runs if run["config"] == config]
+    if not matching:
+        return None
+    return matching[0] if baseline == "first" else matching[-1]
+
+
+def detect_regressions(results, baseline, threshold=0.05, metric="p50"):
+    """Compare the latencies of a run to a baseline run
+
+    Parameters
+    ----------
+    results: dict of str to dict
+        The latency statistics by network
+    baseline: dict of str to dict
+        The latency statistics by network of the baseline
+    threshold: float
+        The relative slowdown above which a network regressed
+    metric: str
+        The statistic compared
+
+    Returns
+    -------
+    regressions: list of (str, float, float)
+        The name, baseline latency and latency of the networks that regressed
+    """
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name][metric], stats[metric]
+        if after > before * (1 + threshold):
+            regressions.append((name, before, after))
+    return regressions
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--networks", type=str, nargs="+", default=NETWORKS, help="The networks to benchmark"
+    )
+    parser.add_argument("--batch-size", type=int, default=1, help="The batch size")
+    parser.add_argument("--target", type=str, default="llvm", help="The local CPU target")
+    parser.add_argument("--log-file", type=str, default=None, help="The tuning log to apply")
+    parser.add_argument("--warmup", type=int, default=10, help="The number of warm-up runs")
+    parser.add_argument(
+        "--number", type=int, default=10, help="The number of runs averaged in a latency"
+    )
+    parser.add_argument("--repeat", type=int, default=30, help="The number of latencies")
+    parser.add_argument(
+        "--history",
+        type=str,
+        default="benchmark_history.json",
+        help="The JSON history the results are appended to",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        choices=["last", "first"],
+        default="last",
+        help="The run of the history with the same target and batch size to compare to",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="The relative slowdown of the median latency reported as a regression",
+    )
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="Exit with an error on regressions"
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    config = {"target": args.target, "batch_size": args.batch_size}
+    baseline = find_baseline(load_history(args.history), config, args.baseline)
+
+    results = {}
+    for name in args.networks:
+        logger.info("Benchmarking %s", name)
+        results[name] = benchmark_network(
+            name,
+            args.batch_size,
+            args.target,
+            args.log_file,
+            args.warmup,
+            args.number,
+            args.repeat,
+        )
+        logger.info(
+            "%s: mean %.2f ms, p50 %.2f ms, p90 %.2f ms, p99 %.2f ms",
+            name,
+            results[name]["mean"],
+            results[name]["p50"],
+            results[name]["p90"],
+            results[name]["p99"],
+        )
+
+    append_history(
+        args.history,
+        {
+            "timestamp": time.time(),
+            "config": config,
+            "log_file": args.log_file,
+            "results": results,
+        },
+    )
+
+    if baseline is None:
+        logger.info("No baseline in %s, nothing to compare to", args.history)
+        return
+    regressions = detect_regressions(results, baseline["results"], args.threshold)
+    for name, before, after in regressions:
+        logger.warning(
+            "Regression of %s: p50 %.2f ms -> %.2f ms (+%.1f%%)",
+            name,
+            before,
+            after,
+            (after / before - 1) * 100,
+        )
+    if not regressions:
+        logger.info("No regression against the run of %s", time.ctime(baseline["timestamp"]))
+    elif args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
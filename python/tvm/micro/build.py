@@ -18,10 +18,13 @@
 """Defines top-level glue functions for building microTVM artifacts."""
 
 import copy
+import hashlib
+import json
 import logging
 import os
 import re
 from tvm.contrib import util
+from . import artifact
 
 
 _LOG = logging.getLogger(__name__)
@@ -108,8 +111,135 @@ def default_options(target_include_dir):
     return {"bin_opts": bin_opts, "lib_opts": lib_opts}
 
 
+# A directory where the runtime libraries built by build_static_runtime can be cached, e.g. by
+# autotuning, which builds the same runtime for every candidate. Caching is off by default.
+RUNTIME_LIB_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".tvm", "micro", "runtime_libs")
+
+
+# The number of cached archives kept per runtime library, the least recently used are removed.
+RUNTIME_LIB_CACHE_SIZE = 8
+
+
+# Digests of the files hashed into the cache keys, by (path, mtime, size).
+_FILE_DIGESTS = {}
+
+
+def _file_digest(path):
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _FILE_DIGESTS:
+        _FILE_DIGESTS[key] = artifact.sha256_hexdigest(path)
+    return _FILE_DIGESTS[key]
+
+
+_HEADER_REGEX = re.compile(r"^.*\.(h|hh|hpp|inc)$", re.IGNORECASE)
+
+
+def _runtime_lib_cache_key(compiler_key, lib_src_dir, lib_srcs, lib_opts):
+    """Compute the key of a runtime library from everything its compilation depends on.
+
+    Parameters
+    ----------
+    compiler_key : str
+        The value returned by Compiler.library_cache_key().
+
+    lib_src_dir : str
+        The directory of the library sources, whose headers are hashed as well.
+
+    lib_srcs : List[str]
+        The sources of the library.
+
+    lib_opts : dict
+        The `options` parameter passed to compiler.library().
+
+    Returns
+    -------
+    str :
+        A hex digest identifying the library.
+    """
+    key = hashlib.sha256()
+    key.update(compiler_key.encode("utf-8"))
+    key.update(json.dumps(lib_opts, sort_keys=True, default=str).encode("utf-8"))
+
+    files = list(lib_srcs)
+    for include_dir in [lib_src_dir] + list(lib_opts.get("include_dirs", [])):
+        for dir_path, _, file_names in os.walk(include_dir):
+            files.extend(os.path.join(dir_path, f) for f in file_names if _HEADER_REGEX.match(f))
+
+    for path in sorted(set(files)):
+        key.update(path.encode("utf-8"))
+        key.update(_file_digest(path).encode("utf-8"))
+    return key.hexdigest()
+
+
+def _build_runtime_lib(compiler, lib_build_dir, lib_src_dir, lib_opts, cache_dir):
+    """Build a runtime library with compiler.library(), or copy it from the cache."""
+    lib_srcs = []
+    for p in os.listdir(lib_src_dir):
+        if RUNTIME_SRC_REGEX.match(p):
+            lib_srcs.append(os.path.join(lib_src_dir, p))
+
+    compiler_key = compiler.library_cache_key() if cache_dir is not None else None
+    if compiler_key is None:
+        os.makedirs(lib_build_dir)
+        return compiler.library(lib_build_dir, lib_srcs, lib_opts)
+
+    lib_name = os.path.basename(lib_build_dir)
+    key = _runtime_lib_cache_key(compiler_key, lib_src_dir, lib_srcs, lib_opts)
+    cache_path = os.path.join(cache_dir, f"{lib_name}-{key}.tar")
+    if os.path.exists(cache_path):
+        # pylint: disable=import-outside-toplevel
+        from .micro_library import MicroLibrary
+
+        _LOG.debug("Using cached %s: %s", lib_name, cache_path)
+        # the modification time of an entry is the time of its last use
+        os.utime(cache_path)
+        os.makedirs(os.path.dirname(lib_build_dir), exist_ok=True)
+        return MicroLibrary.unarchive(cache_path, lib_build_dir)
+
+    os.makedirs(lib_build_dir)
+    lib = compiler.library(lib_build_dir, lib_srcs, lib_opts)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Builds running at the same time may cache the same library, so it is replaced atomically.
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        lib.archive(temp_path)
+        os.replace(temp_path, cache_path)
+    except artifact.ImmobileArtifactError:
+        _LOG.debug("Not caching %s, which can't be moved", lib_name)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+    _prune_runtime_lib_cache(cache_dir, lib_name)
+    return lib
+
+
+def _prune_runtime_lib_cache(cache_dir, lib_name):
+    """Remove the least recently used archives of a runtime library beyond RUNTIME_LIB_CACHE_SIZE."""
+    entries = []
+    for file_name in os.listdir(cache_dir):
+        if file_name.startswith(f"{lib_name}-") and file_name.endswith(".tar"):
+            path = os.path.join(cache_dir, file_name)
+            try:
+                entries.append((os.stat(path).st_mtime, path))
+            except FileNotFoundError:  # removed by a concurrent build
+                pass
+    entries.sort(reverse=True)
+    for _, path in entries[RUNTIME_LIB_CACHE_SIZE:]:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
 def build_static_runtime(
-    workspace, compiler, module, lib_opts=None, bin_opts=None, generated_lib_opts=None
+    workspace,
+    compiler,
+    module,
+    lib_opts=None,
+    bin_opts=None,
+    generated_lib_opts=None,
+    runtime_lib_cache_dir=None,
 ):
     """Build the on-device runtime, statically linking the given modules.
 
@@ -131,6 +261,13 @@ def build_static_runtime(
         The `options` parameter passed to compiler.library() when compiling the generated TVM C
         source module.
 
+    runtime_lib_cache_dir : Optional[str]
+        The directory where the runtime libraries are cached, keyed by the compiler, lib_opts and
+        the content of their sources and headers, e.g. RUNTIME_LIB_CACHE_DIR. Only the generated
+        module is compiled when the runtime libraries are found there. At most
+        RUNTIME_LIB_CACHE_SIZE archives are kept per library. If None (the default), or if the
+        compiler doesn't support caching, the runtime libraries are always compiled.
+
     Returns
     -------
     MicroBinary :
@@ -153,14 +290,11 @@ def build_static_runtime(
     for lib_src_dir in RUNTIME_LIB_SRC_DIRS:
         lib_name = os.path.basename(lib_src_dir)
         lib_build_dir = workspace.relpath(f"build/{lib_name}")
-        os.makedirs(lib_build_dir)
-
-        lib_srcs = []
-        for p in os.listdir(lib_src_dir):
-            if RUNTIME_SRC_REGEX.match(p):
-                lib_srcs.append(os.path.join(lib_src_dir, p))
-
-        libs.append(compiler.library(lib_build_dir, lib_srcs, lib_opts))
+        libs.append(
+            _build_runtime_lib(
+                compiler, lib_build_dir, lib_src_dir, lib_opts, runtime_lib_cache_dir
+            )
+        )
 
     libs.append(compiler.library(mod_build_dir, [mod_src_path], generated_lib_opts))
 
@@ -18,6 +18,8 @@
 """Defines interfaces and default implementations for compiling and flashing code."""
 
 import abc
+import concurrent.futures
+import functools
 import glob
 import os
 import re
@@ -176,6 +178,17 @@ class Compiler(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    def library_cache_key(self):
+        """Identify the libraries built by this Compiler, to reuse them across builds.
+
+        Returns
+        -------
+        Optional[str] :
+            A string which changes whenever the same sources and options would produce different
+            libraries, or None when the libraries built by this Compiler can't be cached.
+        """
+        return None
+
     @property
     def flasher_factory(self):
         """Produce a FlasherFactory for a Flasher instance suitable for this Compiler."""
@@ -186,6 +199,11 @@ class Compiler(metaclass=abc.ABCMeta):
         return self.flasher_factory.override_kw(**kw).instantiate()
 
 
+@functools.lru_cache(maxsize=None)
+def _toolchain_version(compiler_name):
+    return binutil.run_cmd([compiler_name, "--version"])
+
+
 class IncompatibleTargetError(Exception):
     """Raised when source files specify a target that differs from the compiler target."""
 
@@ -193,11 +211,13 @@ class IncompatibleTargetError(Exception):
 class DefaultCompiler(Compiler):
     """A Compiler implementation that attempts to use the system-installed GCC."""
 
-    def __init__(self, target=None):
+    def __init__(self, target=None, jobs=None):
         super(DefaultCompiler, self).__init__()
         self.target = target
         if isinstance(target, str):
             self.target = tvm.target.create(target)
+        # The number of sources compiled at the same time by library().
+        self.jobs = jobs if jobs is not None else os.cpu_count()
 
     def library(self, output, sources, options=None):
         options = options if options is not None else {}
@@ -218,6 +238,7 @@ class DefaultCompiler(Compiler):
 
         prefix = self._autodetect_toolchain_prefix(target)
         outputs = []
+        commands = []
         for src in sources:
             src_base, src_ext = os.path.splitext(os.path.basename(src))
 
@@ -232,9 +253,13 @@ class DefaultCompiler(Compiler):
 
             output_filename = f"{src_base}.o"
             output_abspath = os.path.join(output, output_filename)
-            binutil.run_cmd(args + ["-c", "-o", output_abspath, src])
+            commands.append(args + ["-c", "-o", output_abspath, src])
             outputs.append(output_abspath)
 
+        # Each source is compiled by its own process, so threads are enough to run them at once.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, self.jobs)) as executor:
+            list(executor.map(binutil.run_cmd, commands))
+
         output_filename = f"{os.path.basename(output)}.a"
         output_abspath = os.path.join(output, output_filename)
         binutil.run_cmd([prefix + "ar", "-r", output_abspath] + outputs)
@@ -276,6 +301,15 @@ class DefaultCompiler(Compiler):
         binutil.run_cmd(args)
         return tvm.micro.MicroBinary(output, output_filename, [])
 
+    def library_cache_key(self):
+        if self.target is None:
+            return None
+
+        prefix = self._autodetect_toolchain_prefix(self.target)
+        return "\n".join(
+            [type(self).__name__, str(self.target), _toolchain_version(prefix + "gcc")]
+        )
+
     @property
     def flasher_factory(self):
         return FlasherFactory(HostFlasher, [], {})
@@ -137,3 +137,5 @@ ScopeBuilder = scope_builder.ScopeBuilder
 # Param Serialization
 save_param_dict = param_dict.save_param_dict
 load_param_dict = param_dict.load_param_dict
+save_param_dict_to_file = param_dict.save_param_dict_to_file
+load_param_dict_from_file = param_dict.load_param_dict_from_file
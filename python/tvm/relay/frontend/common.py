@@ -18,6 +18,9 @@
 """Common utilities"""
 from __future__ import absolute_import as _abs
 import logging
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
 import tvm
@@ -29,6 +32,8 @@ from .. import function as _function
 from .. import transform as _transform
 from .. import op as _op
 from .. import analysis
+from .. import ty as _ty
+from ..expr_functor import ExprMutator
 
 
 class RequiredAttr(object):
@@ -467,8 +472,119 @@ def get_name(node):
     return name
 
 
+def _is_concrete_type(checked_type):
+    """Whether a type can stand for the expression it was inferred for"""
+    if isinstance(checked_type, _ty.TensorType):
+        return True
+    if isinstance(checked_type, _ty.TupleType):
+        return all(_is_concrete_type(field) for field in checked_type.fields)
+    return False
+
+
+class _TypedExprReplacer(ExprMutator):
+    """Replace the subexpressions whose type is known with variables of that type"""
+
+    def __init__(self, types, root):
+        super(_TypedExprReplacer, self).__init__()
+        self._types = types
+        self._root = root
+
+    def visit(self, expr):
+        if expr in self.memo_map:
+            return self.memo_map[expr]
+        if not expr.same_as(self._root):
+            checked_type = self._types.get(expr)
+            if checked_type is not None:
+                ret = _expr.var("_typed_%d" % len(self.memo_map), type_annotation=checked_type)
+                self.memo_map[expr] = ret
+                return ret
+        return super(_TypedExprReplacer, self).visit(expr)
+
+
+class TypeInferenceContext(object):
+    """A context in which :py:func:`infer_type` types the graph being imported incrementally.
+
+    Frontends query the types of the nodes of the graph while building it. Outside of a
+    context, each query runs InferType over the whole subgraph of the node, so that the
+    import time grows with the square of the graph depth. Inside a context, the types of
+    the queried nodes are kept, and a node is typed with its already typed subexpressions
+    replaced by variables of their types. Only the part of the graph built since the
+    previous queries is typed again.
+
+    The expression returned by :py:func:`infer_type` in a context may contain these
+    variables, it should only be used for its types.
+
+    The compiled functions of :py:func:`infer_value` are kept in the
+    :py:class:`ConstantEvaluator` of the context, and dropped with it.
+
+    Parameters
+    ----------
+    constant_evaluator : Optional[ConstantEvaluator]
+        The evaluator of :py:func:`infer_value` in the context. By default, the one of the
+        enclosing context, or a new one.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with TypeInferenceContext():
+            mod, params = g.from_onnx(graph, opset)
+    """
+
+    current = None
+
+    def __init__(self, constant_evaluator=None):
+        self._types = {}
+        self._old_ctx = None
+        self.constant_evaluator = constant_evaluator
+
+    def __enter__(self):
+        self._old_ctx = TypeInferenceContext.current
+        if self.constant_evaluator is None:
+            if self._old_ctx is not None:
+                self.constant_evaluator = self._old_ctx.constant_evaluator
+            else:
+                self.constant_evaluator = ConstantEvaluator()
+        TypeInferenceContext.current = self
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        TypeInferenceContext.current = self._old_ctx
+        self._types = {}
+
+    def replace_typed(self, node):
+        """Replace the typed subexpressions of a node with variables of their types."""
+        if not self._types:
+            return node
+        return _TypedExprReplacer(self._types, node).visit(node)
+
+    def add(self, node, replaced_node, typed_node):
+        """Keep the type of a node, inferred in typed_node from replaced_node."""
+        if isinstance(node, (_expr.Var, _expr.Constant, _expr.GlobalVar)):
+            return
+        checked_type = typed_node.checked_type
+        if not _is_concrete_type(checked_type):
+            return
+        # the type could change with the types inferred for unannotated inputs
+        for var in analysis.free_vars(replaced_node):
+            if not _is_concrete_type(var.type_annotation):
+                return
+        self._types[node] = checked_type
+
+
 def infer_type(node, mod=None):
     """A method to infer the type of an intermediate node in the relay graph."""
+    ctx = TypeInferenceContext.current
+    if ctx is not None:
+        replaced_node = ctx.replace_typed(node)
+        ret = _infer_type(replaced_node, mod)
+        ctx.add(node, replaced_node, ret)
+        return ret
+    return _infer_type(node, mod)
+
+
+def _infer_type(node, mod=None):
+    """Infer the type of a node by typing its whole subgraph"""
     if isinstance(mod, IRModule):
         mod["main"] = _function.Function(tvm.relay.analysis.free_vars(node), node)
         mod = _transform.InferType()(mod)
@@ -507,21 +623,128 @@ def infer_shape(inputs, mod=None):
     return checked_type
 
 
+class ConstantEvaluator(object):
+    """Evaluate the expressions of infer_value with compiled functions reused by structure.
+
+    Frontends evaluate many small expressions, often with the same structure, e.g. the
+    shape computations of the layers of a network. The functions are compiled without
+    binding their inputs and kept in a LRU cache keyed by their structural hash. The
+    value of functions without inputs is kept as well.
+
+    :py:func:`infer_value` uses the evaluator of the current :py:class:`TypeInferenceContext`,
+    so that the cache lives as long as an import. The evaluations are serialized, since
+    the compiled modules are run in place.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of compiled functions kept.
+    """
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        # structural hash -> list of [func, module, value]
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Drop the compiled functions and the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _lookup(self, func):
+        key = tvm.ir.structural_hash(func, map_free_vars=True)
+        entries = self._cache.get(key)
+        if entries is not None:
+            self._cache.move_to_end(key)
+            for entry in entries:
+                if tvm.ir.structural_equal(entry[0], func, map_free_vars=True):
+                    return key, entry
+        return key, None
+
+    def evaluate(self, func, params):
+        """Evaluate a function whose free variables are all in params.
+
+        Parameters
+        ----------
+        func : relay.Function
+            The function to evaluate.
+        params : dict of str to NDArray
+            The values of the parameters of the function by name.
+
+        Returns
+        -------
+        value : NDArray
+            The first output of the function.
+        """
+        with self._lock:
+            return self._evaluate(func, params)
+
+    def _evaluate(self, func, params):
+        # pylint: disable=import-outside-toplevel
+        from tvm.contrib import graph_runtime
+
+        key, entry = self._lookup(func)
+        if entry is None:
+            self.misses += 1
+            with tvm.transform.PassContext(opt_level=0):
+                lib = tvm.relay.build(func, target="llvm")
+            entry = [func, graph_runtime.GraphModule(lib["default"](tvm.cpu(0))), None]
+            self._cache.setdefault(key, []).append(entry)
+            if len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            if entry[2] is not None:
+                return tvm.nd.array(entry[2].asnumpy())
+
+        cached_func, module, _ = entry
+        # the inputs of the compiled function are named after its own parameters
+        for cached_param, param in zip(cached_func.params, func.params):
+            module.set_input(cached_param.name_hint, params[param.name_hint])
+        module.run()
+        # the output buffer is reused by the next evaluation
+        value = tvm.nd.array(module.get_output(0).asnumpy())
+        if not func.params:
+            # keep a copy, the caller owns the returned array
+            entry[2] = tvm.nd.array(value.asnumpy())
+        return value
+
+
 def infer_value(input_val, params, mod=None):
     """A hack for getting the value of an expression by evaluating a
     portion of the relay graph. This is often needed for functions that
     whose output shape depends on the value of a tensor.
     """
+    if isinstance(input_val, _expr.Constant):
+        # the caller owns the returned array
+        return tvm.nd.array(input_val.data.asnumpy())
+    free_vars = analysis.free_vars(input_val)
     # Check that all free variables have associated parameters.
     assert all(
-        var.name_hint in params.keys() for var in analysis.free_vars(input_val)
+        var.name_hint in params.keys() for var in free_vars
     ), "All inputs to infer must be available in params."
     try:
+        func = _function.Function(free_vars, input_val)
+        ctx = TypeInferenceContext.current
+        evaluator = ctx.constant_evaluator if ctx is not None else None
+        # the compiled inputs are set by name
+        if (
+            evaluator is not None
+            and evaluator.enabled
+            and len(set(v.name_hint for v in free_vars)) == len(free_vars)
+        ):
+            return evaluator.evaluate(func, params)
+
         # TODO(kevinthesun): Use VM for all cases.
         # pylint: disable=import-outside-toplevel
         from tvm.contrib import graph_runtime
 
-        func = _function.Function(analysis.free_vars(input_val), input_val)
         with tvm.transform.PassContext(opt_level=0):
             lib = tvm.relay.build(func, target="llvm", params=params)
         ctx = tvm.cpu(0)
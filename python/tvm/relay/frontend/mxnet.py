@@ -36,6 +36,7 @@ from .common import infer_type as _infer_type
 from .common import infer_shape as _infer_shape
 from .common import infer_value as _infer_value
 from .common import get_name as _get_name
+from .common import TypeInferenceContext
 from .nnvm_common import _rename, _binop_scalar, _rbinop_scalar, _reduce
 from .nnvm_common import _arg_reduce, _init_op, _softmax_op, _cast
 from .nnvm_common import _clip, _transpose, _upsampling
@@ -2866,7 +2867,8 @@ def from_mxnet(symbol, shape=None, dtype="float32", arg_params=None, aux_params=
         for k, v in aux_params.items():
             params[k] = _nd.array(v.asnumpy())
         shape, dtype = _update_shape_dtype(shape, dtype, params)
-        func = _from_mxnet_impl(symbol, shape, dtype, params, mod)
+        with TypeInferenceContext():
+            func = _from_mxnet_impl(symbol, shape, dtype, params, mod)
     elif isinstance(symbol, mx.gluon.HybridBlock):
         if arg_params is not None or aux_params is not None:
             raise ValueError("arg_params and aux_params ae not used when importing HybridBlock")
@@ -2880,7 +2882,8 @@ def from_mxnet(symbol, shape=None, dtype="float32", arg_params=None, aux_params=
         if isinstance(sym, (list, tuple)):
             sym = mx.sym.Group(sym)
         shape, dtype = _update_shape_dtype(shape, dtype, params)
-        func = _from_mxnet_impl(sym, shape, dtype, params, mod)
+        with TypeInferenceContext():
+            func = _from_mxnet_impl(sym, shape, dtype, params, mod)
     elif isinstance(symbol, mx.gluon.Block):
         raise NotImplementedError("Only Hybrid Blocks are supported now.")
     else:
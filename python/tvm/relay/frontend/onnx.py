@@ -34,7 +34,7 @@ from .. import ty as _ty
 
 from .common import AttrCvt, Renamer
 from .common import get_relay_op, new_var, infer_shape, infer_channels
-from .common import infer_type, get_name
+from .common import infer_type, get_name, TypeInferenceContext
 
 
 __all__ = ["from_onnx"]
@@ -2702,6 +2702,6 @@ def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=Fals
         except AttributeError:
             opset = 1
     # Use the graph proto as a scope so that ops can access other nodes if needed.
-    with g:
+    with g, TypeInferenceContext():
         mod, params = g.from_onnx(graph, opset, freeze_params)
     return mod, params
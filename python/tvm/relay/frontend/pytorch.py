@@ -39,6 +39,7 @@ from .common import infer_value as _infer_value
 from .common import try_infer_value
 from .common import infer_value_simulated as _infer_value_simulated
 from .common import infer_type as _infer_type
+from .common import TypeInferenceContext
 from ..prelude import Prelude, StaticTensorArrayOps
 
 from . import qnn_torch
@@ -3390,14 +3391,15 @@ def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dt
         qnn_torch.add_quant_params(tvm_params, weight_quant_params)
         convert_map.update(qnn_torch.convert_map)
 
-    ret = convert_operators(
-        _get_operator_nodes(graph.nodes()),
-        outputs,
-        ret_name,
-        convert_map,
-        prelude,
-        default_dtype=default_dtype,
-    )
+    with TypeInferenceContext():
+        ret = convert_operators(
+            _get_operator_nodes(graph.nodes()),
+            outputs,
+            ret_name,
+            convert_map,
+            prelude,
+            default_dtype=default_dtype,
+        )
 
     mod["main"] = tvm.relay.Function(_analysis.free_vars(ret[0]), ret[0])
 
@@ -40,6 +40,7 @@ from .common import infer_type as _infer_type
 from .common import infer_shape as _infer_shape
 from .common import infer_channels as _infer_channels
 from .common import infer_value as _infer_value
+from .common import TypeInferenceContext
 
 __all__ = ["from_tensorflow"]
 
@@ -3562,5 +3563,6 @@ def from_tensorflow(graph, layout="NHWC", shape=None, outputs=None):
     """
 
     g = GraphProto()
-    mod, params = g.from_tensorflow(graph, layout, shape, outputs)
+    with TypeInferenceContext():
+        mod, params = g.from_tensorflow(graph, layout, shape, outputs)
     return mod, params
@@ -18,6 +18,7 @@
 """Helper utility to save parameter dicts."""
 import tvm
 import tvm._ffi
+from tvm.runtime import param_file as _param_file
 
 
 _save_param_dict = tvm._ffi.get_global_func("tvm.relay._save_param_dict")
@@ -76,3 +77,57 @@ def load_param_dict(param_bytes):
         param_bytes = bytearray(param_bytes)
     load_arr = _load_param_dict(param_bytes)
     return {v.name: v.array for v in load_arr}
+
+
+def save_param_dict_to_file(params, path):
+    """Save parameter dictionary to an aligned parameter file.
+
+    Unlike the bytes of :any:`save_param_dict`, the file can be memory-mapped: it is loaded
+    by :any:`load_param_dict_from_file` or by the GraphModule with API
+    "load_params_from_file" without reading it in memory.
+
+    Parameters
+    ----------
+    params : dict of str to NDArray
+        The parameter dictionary.
+
+    path : str
+        The path of the file.
+
+    Examples
+    --------
+    .. code-block:: python
+
+       tvm.relay.save_param_dict_to_file(params, "deploy.params")
+       graph_runtime_mod.load_params_from_file("deploy.params")
+    """
+    _param_file.save_param_file(params, path)
+
+
+def load_param_dict_from_file(path, ctx=None):
+    """Load parameter dictionary from a file.
+
+    Parameters
+    ----------
+    path : str
+        The path of an aligned parameter file saved by :any:`save_param_dict_to_file`,
+        or of a file holding the bytes of :any:`save_param_dict`.
+
+    ctx : TVMContext, optional
+        The context of the arrays, CPU by default. On CPU, the arrays of an aligned
+        parameter file are views of the memory-mapped file. Otherwise they are
+        copied one by one to the device.
+
+    Returns
+    -------
+    params : dict of str to NDArray
+        The parameter dictionary.
+    """
+    ctx = ctx or tvm.cpu(0)
+    if _param_file.is_param_file(path):
+        return _param_file.ParamFile(path).get_params(ctx)
+    with open(path, "rb") as f:
+        params = load_param_dict(f.read())
+    if ctx.device_type == tvm.cpu(0).device_type:
+        return params
+    return {k: v.copyto(ctx) for k, v in params.items()}
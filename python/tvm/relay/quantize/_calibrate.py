@@ -30,7 +30,7 @@ from .. import expr as _expr
 from .. import analysis as _analysis
 from .. import build_module as _build_module
 from ...contrib import graph_runtime
-from .kl_divergence import _find_scale_by_kl
+from .kl_divergence import _find_scale_by_kl, StreamingHistogram
 
 
 def _get_profile_runtime(mod):
@@ -90,15 +90,46 @@ def collect_stats(mod, dataset, chunk_by=-1):
         yield [np.concatenate(output).reshape(-1) for output in outputs]
 
 
-def _kl_scale(mod, dataset):
-    cfg = quantize.current_qconfig()
-    chunk_by = cfg.calibrate_chunk_by
-    scales = []
-    for samples in collect_stats(mod, dataset, chunk_by):
-        logging.info("finding threshold with kl for calibration...")
-        with mp.Pool() as pool:
-            scales += list(pool.map(_find_scale_by_kl, samples))
+def collect_histograms(mod, dataset, num_bins=8001):
+    """Given an annotated graph, create a profile graph and update a histogram of the
+    input of every simulated_quantize op with each batch of the calibration dataset.
+    Unlike :any:`collect_stats`, the dataset is run once and the outputs are not kept,
+    so the memory usage does not depend on the size of the dataset.
+
+    Parameters
+    ----------
+    mod: Module
+        The simulation graph after annotation.
+
+    dataset: Iterable[NDArray]
+        The calibration dataset.
+
+    num_bins: optional, int
+        The number of bins of the histograms.
 
+    Returns
+    -------
+    ret: list of StreamingHistogram
+        The histogram of each layer
+    """
+    logging.info("collecting histograms for calibration...")
+    runtime = _get_profile_runtime(mod)
+    num_outputs = runtime.get_num_outputs()
+    hists = [StreamingHistogram(num_bins) for _ in range(num_outputs)]
+
+    for batch in dataset:
+        runtime.set_input(**batch)
+        runtime.run()
+        for i, hist in enumerate(hists):
+            hist.update(runtime.get_output(i).asnumpy())
+    return hists
+
+
+def _find_scale_by_hist(hist):
+    return hist.find_scale()
+
+
+def _make_scale_func(scales):
     def func(_):
         scale = scales[func.scale_idx]
         func.scale_idx += 1
@@ -109,6 +140,25 @@ def _kl_scale(mod, dataset):
     return func
 
 
+def _kl_scale_streaming(mod, dataset):
+    hists = collect_histograms(mod, dataset)
+    logging.info("finding threshold with kl for calibration...")
+    with mp.Pool() as pool:
+        scales = list(pool.map(_find_scale_by_hist, hists))
+    return _make_scale_func(scales)
+
+
+def _kl_scale(mod, dataset):
+    cfg = quantize.current_qconfig()
+    chunk_by = cfg.calibrate_chunk_by
+    scales = []
+    for samples in collect_stats(mod, dataset, chunk_by):
+        logging.info("finding threshold with kl for calibration...")
+        with mp.Pool() as pool:
+            scales += list(pool.map(_find_scale_by_kl, samples))
+    return _make_scale_func(scales)
+
+
 def _set_params(mod, input_scale_func, weight_scale_func):
     quantize_op = _op.get("relay.op.annotation.simulated_quantize")
     cfg = quantize.current_qconfig()
@@ -193,6 +243,8 @@ def calibrate(dataset=None):
 
         if cfg.calibrate_mode == "kl_divergence":
             input_scale_func = _kl_scale(mod, dataset)
+        elif cfg.calibrate_mode == "kl_divergence_streaming":
+            input_scale_func = _kl_scale_streaming(mod, dataset)
         elif cfg.calibrate_mode == "global_scale":
             input_scale_func = _global_scale
         else:
@@ -22,6 +22,47 @@ import numpy as np
 from . import _quantize
 
 
+def _find_scale_by_kl_hist(hist, hist_edges, num_quantized_bins=255):
+    """Given the histogram of a tensor over a symmetric range, find the optimal threshold
+    for quantizing it.
+
+    Parameters
+    ----------
+    hist: numpy.ndarray
+        The counts of the bins, the number of bins must be odd.
+
+    hist_edges: numpy.ndarray
+        The edges of the bins, symmetric around 0.
+
+    num_quantized_bins: int
+        The number of bins of the quantized distribution.
+
+    Returns
+    -------
+    threshold: float
+    """
+    num_bins = len(hist)
+    hist = np.asarray(hist)
+    total = int(hist.sum())
+    int_max = np.iinfo(np.int32).max
+    if total > int_max:
+        # the bins are summed in int32, only the shape of the distribution matters
+        hist = hist * (int_max / total)
+    hist = np.ascontiguousarray(hist, dtype=np.int32)
+    hist_edges = np.ascontiguousarray(hist_edges, dtype=np.float32)
+
+    def get_pointer(arr, ctypes_type):
+        ptr = arr.ctypes.data_as(ctypes.POINTER(ctypes_type))
+        return ctypes.cast(ptr, ctypes.c_void_p)
+
+    return _quantize.FindScaleByKLMinimization(
+        get_pointer(hist, ctypes.c_int),
+        get_pointer(hist_edges, ctypes.c_float),
+        num_bins,
+        num_quantized_bins,
+    )
+
+
 def _find_scale_by_kl(arr, quantized_dtype="int8", num_bins=8001, num_quantized_bins=255):
     """Given a tensor, find the optimal threshold for quantizing it.
     The reference distribution is `q`, and the candidate distribution is `p`.
@@ -39,14 +80,78 @@ def _find_scale_by_kl(arr, quantized_dtype="int8", num_bins=8001, num_quantized_
         # We need to move negative bins to positive bins to fit uint8 range.
         num_quantized_bins = num_quantized_bins * 2 + 1
 
-    def get_pointer(arr, ctypes_type):
-        ptr = arr.ctypes.data_as(ctypes.POINTER(ctypes_type))
-        return ctypes.cast(ptr, ctypes.c_void_p)
-
     hist, hist_edges = np.histogram(arr, bins=num_bins, range=(-thres, thres))
-    hist_ptr = get_pointer(hist.astype(np.int32), ctypes.c_int)
-    hist_edges_ptr = get_pointer(hist_edges, ctypes.c_float)
+    return _find_scale_by_kl_hist(hist, hist_edges, num_quantized_bins)
 
-    return _quantize.FindScaleByKLMinimization(
-        hist_ptr, hist_edges_ptr, num_bins, num_quantized_bins
-    )
+
+class StreamingHistogram(object):
+    """Histogram of a tensor with a fixed number of bins, updated batch by batch.
+
+    The range of the histogram is symmetric around 0. When a batch exceeds it, the range
+    is tripled until it covers the batch, and every 3 bins are merged into one. With an odd
+    number of bins the merged bins align exactly with the new ones, so no count is moved
+    between bins. The range is at most 3 times the maximum absolute value of the tensor.
+
+    Parameters
+    ----------
+    num_bins: int
+        The number of bins, odd so that 0 is the center of a bin.
+    """
+
+    def __init__(self, num_bins=8001):
+        if num_bins % 2 != 1:
+            raise ValueError("The number of bins must be odd, got {}".format(num_bins))
+        self.num_bins = num_bins
+        self.hist = np.zeros(num_bins, dtype=np.int64)
+        self.thres = 0.0
+        self.min_val = np.inf
+
+    @property
+    def hist_edges(self):
+        """The edges of the bins"""
+        return np.linspace(-self.thres, self.thres, self.num_bins + 1)
+
+    def _grow(self, thres):
+        if self.thres == 0:
+            # every value so far is 0, which is in the center bin at any range
+            count = self.hist.sum()
+            self.hist[:] = 0
+            self.hist[self.num_bins // 2] = count
+            self.thres = thres
+            return
+        while self.thres < thres:
+            padded = np.zeros(3 * self.num_bins, dtype=np.int64)
+            padded[self.num_bins : 2 * self.num_bins] = self.hist
+            self.hist = padded.reshape(self.num_bins, 3).sum(axis=1)
+            self.thres *= 3
+
+    def update(self, arr):
+        """Add the values of a batch to the histogram
+
+        Parameters
+        ----------
+        arr: numpy.ndarray
+            The values
+        """
+        if arr.size == 0:
+            return
+        min_val = float(np.min(arr))
+        max_val = float(np.max(arr))
+        self.min_val = min(self.min_val, min_val)
+        thres = max(abs(min_val), abs(max_val))
+        if thres > self.thres:
+            self._grow(thres)
+        hist, _ = np.histogram(arr, bins=self.num_bins, range=(-self.thres, self.thres))
+        self.hist += hist
+
+    def find_scale(self, quantized_dtype="int8", num_quantized_bins=255):
+        """Find the optimal threshold for quantizing the values added to the histogram,
+        as :any:`_find_scale_by_kl` does with all of them at once.
+
+        Returns
+        -------
+        threshold: float
+        """
+        if self.min_val >= 0 and quantized_dtype in ["uint8"]:
+            num_quantized_bins = num_quantized_bins * 2 + 1
+        return _find_scale_by_kl_hist(self.hist, self.hist_edges, num_quantized_bins)
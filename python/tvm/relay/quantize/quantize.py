@@ -146,9 +146,11 @@ def qconfig(**kwargs):
         Number of bit for every kind of annotate field.
 
     calibrate_mode: str
-        The calibration mode. 'global_scale' or 'kl_divergence'.
+        The calibration mode. 'global_scale', 'kl_divergence' or 'kl_divergence_streaming'.
         global_scale: use global scale
         kl_divergence: find scales by kl divergence on the dataset.
+        kl_divergence_streaming: find scales by kl divergence on histograms of the layers
+        updated after each batch, in a single pass over the dataset with a bounded memory usage.
 
     global_scale: float
         The global scale for calibration.
@@ -22,7 +22,7 @@ import struct
 import time
 
 import tvm._ffi
-from tvm.contrib import util
+from tvm.contrib import util, tar as _tar
 from tvm._ffi.base import TVMError
 from tvm.runtime import ndarray as nd
 
@@ -43,6 +43,15 @@ class RPCSession(object):
         self._tbl_index = _ffi_api.SessTableIndex(sess)
         self._remote_funcs = {}
 
+    def close(self):
+        """Close the session, which cannot be used anymore.
+
+        The connection is closed once the remote modules and arrays got from the session
+        are freed as well.
+        """
+        self._remote_funcs = {}
+        self._sess = None
+
     def system_lib(self):
         """Get system-wide library module.
 
@@ -116,6 +125,47 @@ class RPCSession(object):
             self._remote_funcs["upload"] = self.get_function("tvm.rpc.server.upload")
         self._remote_funcs["upload"](target, blob)
 
+    def upload_archive(self, files, target=None):
+        """Upload several files to remote runtime temp folder at once.
+
+        The files are packed in one compressed archive which is unpacked by the remote,
+        saving a round trip per file. The files are uploaded one by one when the remote
+        cannot unpack archives.
+
+        Parameters
+        ----------
+        files : list of str
+            The file names in local to upload, with distinct base names.
+
+        target : str, optional
+            The path of the archive in remote, removed once unpacked.
+
+        Returns
+        -------
+        names : list of str
+            The paths of the files in remote.
+        """
+        names = [os.path.basename(x) for x in files]
+        if "unpack_archive" not in self._remote_funcs:
+            try:
+                self._remote_funcs["unpack_archive"] = self.get_function(
+                    "tvm.rpc.server.unpack_archive"
+                )
+            except AttributeError:
+                self._remote_funcs["unpack_archive"] = None
+        if self._remote_funcs["unpack_archive"] is None or len(files) < 2:
+            for name in files:
+                self.upload(name)
+            return names
+
+        temp = util.tempdir()
+        archive = temp.relpath("upload.tar.gz")
+        _tar.tar(archive, files)
+        remote_name = target or os.path.basename(archive)
+        self.upload(archive, remote_name)
+        self._remote_funcs["unpack_archive"](remote_name)
+        return names
+
     def download(self, path):
         """Download file from remote temp folder.
 
@@ -442,6 +492,107 @@ class TrackerSession(object):
             "Failed to run on %s after %d retry, last_error:%s" % (key, max_retry, str(last_err))
         )
 
+    def lease(self, key, priority=1, session_timeout=0, max_uses=0):
+        """Lease a device from the tracker for several uses.
+
+        Parameters
+        ----------
+        key : str
+            The type key of the device.
+
+        priority : int, optional
+            The priority of the requests.
+
+        session_timeout : float, optional
+            The duration of the lease, after which the session is requested again.
+            It also allows the server to kill the connection when it lasts longer.
+            When duration is zero, the session is kept as long as it is used.
+
+        max_uses : int, optional
+            The number of uses of the session before it is requested again.
+            When it is zero, the number of uses is not limited.
+
+        Returns
+        -------
+        lease : RPCLease
+            The lease, the session is only requested at its first use.
+        """
+        return RPCLease(self, key, priority, session_timeout, max_uses)
+
+
+class RPCLease(object):
+    """A device session leased from the tracker and reused across several measurements,
+    instead of requesting a session from the tracker and connecting to the device each time.
+
+    Parameters
+    ----------
+    tracker : TrackerSession
+        The tracker to request the session from.
+
+    key : str
+        The type key of the device.
+
+    priority : int, optional
+        The priority of the requests.
+
+    session_timeout : float, optional
+        The duration of the lease, zero to keep the session as long as it is used.
+
+    max_uses : int, optional
+        The number of uses of the session, zero for no limit.
+    """
+
+    def __init__(self, tracker, key, priority=1, session_timeout=0, max_uses=0):
+        self._tracker = tracker
+        self.key = key
+        self.priority = priority
+        self.session_timeout = session_timeout
+        self.max_uses = max_uses
+        self._session = None
+        self._expire = None
+        self._uses = 0
+
+    def session(self):
+        """Get the leased session for one use, requesting a new one
+        when the lease is expired or used up.
+
+        Returns
+        -------
+        sess : RPCSession
+            The leased session.
+        """
+        if self._session is not None and (
+            (self.max_uses and self._uses >= self.max_uses)
+            or (self._expire is not None and time.time() >= self._expire)
+        ):
+            self.release()
+        if self._session is None:
+            self._session = self._tracker.request(
+                self.key, priority=self.priority, session_timeout=self.session_timeout
+            )
+            # leave some margin before the server kills the session
+            if self.session_timeout:
+                self._expire = time.time() + self.session_timeout * 0.9
+            self._uses = 0
+        self._uses += 1
+        return self._session
+
+    def release(self):
+        """Give the session back, e.g. after an error left it in an unknown state.
+        The session is closed so that the server can serve the next request,
+        which is made by the next use."""
+        if self._session is not None:
+            self._session.close()
+        self._session = None
+        self._expire = None
+        self._uses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.release()
+
 
 def connect(url, port, key="", session_timeout=0, session_constructor_args=None):
     """Connect to RPC Server
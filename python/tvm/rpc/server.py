@@ -70,6 +70,17 @@ def _server_env(load_library, work_path=None):
         logger.info("load_module %s", path)
         return m
 
+    @tvm._ffi.register_func("tvm.rpc.server.unpack_archive", override=True)
+    def unpack_archive(file_name):
+        """Unpack an uploaded archive in the temp folder and remove it."""
+        # pylint: disable=import-outside-toplevel
+        from tvm.contrib import tar as _tar
+
+        path = temp.relpath(file_name)
+        _tar.untar(path, temp.temp_dir)
+        os.remove(path)
+        logger.info("unpack_archive %s", path)
+
     @tvm._ffi.register_func("tvm.rpc.server.download_linked_module", override=True)
     def download_linked_module(file_name):
         """Load module from remote side."""
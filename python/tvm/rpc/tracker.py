@@ -112,39 +112,65 @@ class Scheduler(object):
 
 
 class PriorityScheduler(Scheduler):
-    """Priority based scheduler, FIFO based on time"""
+    """Priority based scheduler, FIFO based on time.
+
+    Both the free resources and the requests are kept in heaps, and removed resources
+    are discarded lazily, so that every operation takes O(log n) time.
+    """
 
     def __init__(self, key):
         self._key = key
+        # heap of (sequence number, value), the oldest free value first
         self._values = []
+        # value -> sequence number of its entry in _values, for the values still free
+        self._free = {}
         self._requests = []
+        self._seq = 0
+
+    def _push_value(self, value):
+        self._seq += 1
+        self._free[value] = self._seq
+        heapq.heappush(self._values, (self._seq, value))
+
+    def _pop_value(self):
+        while self._values:
+            seq, value = heapq.heappop(self._values)
+            if self._free.get(value) == seq:
+                del self._free[value]
+                return value
+        return None
 
     def _schedule(self):
-        while self._requests and self._values:
-            value = self._values.pop(0)
+        while self._requests and self._free:
+            value = self._pop_value()
             item = heapq.heappop(self._requests)
             callback = item[-1]
             if callback(value[1:]):
                 value[0].pending_matchkeys.remove(value[-1])
             else:
-                self._values.append(value)
+                self._push_value(value)
 
     def put(self, value):
-        self._values.append(value)
+        self._push_value(value)
         self._schedule()
 
     def request(self, user, priority, callback):
-        heapq.heappush(self._requests, (-priority, time.time(), callback))
+        self._seq += 1
+        heapq.heappush(self._requests, (-priority, time.time(), self._seq, callback))
         self._schedule()
 
     def remove(self, value):
-        if value in self._values:
-            self._values.remove(value)
+        if value in self._free:
+            # the entry in the heap is skipped when it is popped
+            del self._free[value]
+            if len(self._values) > 2 * len(self._free) + 16:
+                self._values = [(seq, v) for seq, v in self._values if self._free.get(v) == seq]
+                heapq.heapify(self._values)
             self._schedule()
 
     def summary(self):
         """Get summary information of the scheduler."""
-        return {"free": len(self._values), "pending": len(self._requests)}
+        return {"free": len(self._free), "pending": len(self._requests)}
 
 
 class TCPEventHandler(tornado_util.TCPHandler):
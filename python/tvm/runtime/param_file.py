@@ -0,0 +1,229 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Aligned parameter files that can be memory-mapped.
+
+A parameter file is made of:
+
+* the magic PARAM_FILE_MAGIC,
+* the size of the header as a little-endian uint64,
+* the header, a JSON object with the alignment and the name, dtype, shape,
+  offset and size in bytes of every tensor,
+* the data of the tensors, each one at an offset of the file that is a multiple
+  of the alignment.
+
+Unlike the blob of :any:`tvm.relay.save_param_dict`, a file can be loaded without
+reading it in memory: the tensors are views of the memory-mapped file on CPU, or
+are copied one by one to the device.
+"""
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from . import ndarray as _nd
+
+PARAM_FILE_MAGIC = b"TVMPRM01"
+# the alignment of the storage allocated by the runtime (kAllocAlignment)
+PARAM_FILE_ALIGNMENT = 128
+# the magic of the blob of tvm.relay.save_param_dict (kTVMNDArrayListMagic)
+_NDARRAY_LIST_MAGIC = 0xF7E58D4F05049CB7
+_UINT64 = struct.Struct("<Q")
+
+
+def _align(offset, alignment):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def save_param_file(params, path, alignment=PARAM_FILE_ALIGNMENT):
+    """Save a parameter dictionary to an aligned parameter file.
+    The tensors are written one at a time.
+
+    Parameters
+    ----------
+    params : dict of str to NDArray or numpy.ndarray
+        The parameter dictionary.
+
+    path : str
+        The path of the file.
+
+    alignment : int
+        The alignment of the tensors in the file, in bytes.
+    """
+    entries = []
+    for name, value in params.items():
+        dtype = value.dtype if isinstance(value, _nd.NDArray) else str(np.dtype(value.dtype))
+        shape = [int(x) for x in value.shape]
+        nbytes = int(np.prod(shape, dtype="int64")) * np.dtype(dtype).itemsize
+        entries.append({"name": name, "dtype": dtype, "shape": shape, "nbytes": nbytes})
+
+    def _header():
+        return json.dumps({"alignment": alignment, "params": entries}).encode("utf-8")
+
+    # the offsets depend on the size of the header, which depends on the offsets
+    data_start = 0
+    while True:
+        offset = data_start
+        for entry in entries:
+            entry["offset"] = offset
+            offset = _align(offset + entry["nbytes"], alignment)
+        header = _header()
+        header_end = len(PARAM_FILE_MAGIC) + _UINT64.size + len(header)
+        if header_end <= data_start:
+            break
+        data_start = _align(header_end, alignment)
+
+    with open(path, "wb") as f:
+        f.write(PARAM_FILE_MAGIC)
+        f.write(_UINT64.pack(len(header)))
+        f.write(header)
+        for entry in entries:
+            value = params[entry["name"]]
+            if isinstance(value, _nd.NDArray):
+                value = value.asnumpy()
+            f.seek(entry["offset"])
+            f.write(np.ascontiguousarray(value).tobytes())
+
+
+def is_param_file(path):
+    """Check whether a file is an aligned parameter file
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    ret : bool
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(PARAM_FILE_MAGIC)) == PARAM_FILE_MAGIC
+    except (IOError, OSError):
+        return False
+
+
+class ParamFile(object):
+    """A memory-mapped parameter file.
+
+    The file is mapped copy-on-write: writing to a tensor does not modify the file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if f.read(len(PARAM_FILE_MAGIC)) != PARAM_FILE_MAGIC:
+                raise ValueError("%s is not a parameter file" % path)
+            (header_size,) = _UINT64.unpack(f.read(_UINT64.size))
+            header = json.loads(f.read(header_size).decode("utf-8"))
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.path = path
+        self.alignment = header["alignment"]
+        self.entries = {entry["name"]: entry for entry in header["params"]}
+
+    @property
+    def names(self):
+        """The names of the tensors, in the order of the file"""
+        return list(self.entries)
+
+    def asnumpy(self, name):
+        """Get a tensor as a numpy array, which is a view of the file
+
+        Parameters
+        ----------
+        name : str
+            The name of the tensor.
+
+        Returns
+        -------
+        arr : numpy.ndarray
+        """
+        entry = self.entries[name]
+        arr = np.frombuffer(
+            self._mmap, dtype="uint8", count=entry["nbytes"], offset=entry["offset"]
+        )
+        return arr.view(entry["dtype"]).reshape(entry["shape"])
+
+    def get(self, name, ctx=_nd.cpu(0)):
+        """Get a tensor as an NDArray
+
+        Parameters
+        ----------
+        name : str
+            The name of the tensor.
+
+        ctx : TVMContext
+            The context of the array. On CPU, the array is a view of the file when
+            numpy supports DLPack, and a copy otherwise.
+
+        Returns
+        -------
+        arr : NDArray
+        """
+        arr = self.asnumpy(name)
+        if ctx.device_type == _nd.TVMContext.STR2MASK["cpu"] and hasattr(arr, "__dlpack__"):
+            # the DLPack tensor keeps the numpy view, and so the mapping, alive
+            return _nd.from_dlpack(arr.__dlpack__())
+        entry = self.entries[name]
+        return _nd.empty(entry["shape"], entry["dtype"], ctx).copyfrom(arr)
+
+    def get_params(self, ctx=_nd.cpu(0)):
+        """Get all the tensors as a parameter dictionary
+
+        Parameters
+        ----------
+        ctx : TVMContext
+            The context of the arrays, see :any:`ParamFile.get`.
+
+        Returns
+        -------
+        params : dict of str to NDArray
+        """
+        return {name: self.get(name, ctx) for name in self.entries}
+
+
+def load_param_names(path):
+    """Read the names of the tensors of a parameter file or of a file holding the
+    blob of :any:`tvm.relay.save_param_dict`, without reading the tensors.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    names : list of str
+    """
+    if is_param_file(path):
+        return ParamFile(path).names
+    with open(path, "rb") as f:
+        (header,) = _UINT64.unpack(f.read(_UINT64.size))
+        if header != _NDARRAY_LIST_MAGIC:
+            raise ValueError("%s is not a parameter file" % path)
+        f.read(_UINT64.size)  # reserved
+        (count,) = _UINT64.unpack(f.read(_UINT64.size))
+        names = []
+        for _ in range(count):
+            (size,) = _UINT64.unpack(f.read(_UINT64.size))
+            names.append(f.read(size).decode("utf-8"))
+        return names
@@ -26,6 +26,7 @@
 #include <tvm/runtime/registry.h>
 
 #include <algorithm>
+#include <mutex>
 
 #include "utils.h"
 
@@ -254,8 +255,11 @@ Array<MeasureResult> ProgramMeasurerNode::Measure(const SearchTask& task,
                        << input_batch[j]->state << "\n";
     }
 
-    // Call callback functions
+    // Call callback functions. The measurers of the tasks tuned concurrently by the task
+    // scheduler share their callbacks (e.g. RecordToFile), so the calls are serialized.
     if (callbacks) {
+      static std::mutex callback_mutex;
+      std::lock_guard<std::mutex> lock(callback_mutex);
       for (const auto& callback : callbacks.value()) {
         callback->Callback(policy, input_batch, result_batch);
       }
@@ -29,6 +29,7 @@
 #include <tvm/runtime/registry.h>
 
 #include <fstream>
+#include <limits>
 #include <sstream>
 #include <string>
 #include <utility>
@@ -257,10 +258,27 @@ void ReadMeasureRecord(const std::string& str, MeasureInputNode* inp, MeasureRes
   }
 }
 
+void WriteRecordIndexEntry(std::ostream* os, int64_t offset, size_t size,
+                           const MeasureInput& input, const MeasureResult& result) {
+  *os << offset << "\t" << size << "\t" << result->error_no << "\t"
+      << FloatArrayMean(result->costs) << "\t" << input->task->target->str() << "\t"
+      << input->task->workload_key << "\n";
+}
+
 void RecordToFileNode::Callback(const SearchPolicy& policy, const Array<MeasureInput>& inputs,
                                 const Array<MeasureResult>& results) {
   std::ofstream ofs(filename, std::ofstream::app);
-  WriteMeasureRecords(&ofs, inputs, results);
+  std::ofstream index_ofs(std::string(filename) + ".idx", std::ofstream::app);
+  ofs.seekp(0, std::ofstream::end);
+  index_ofs.precision(std::numeric_limits<double>::max_digits10);
+  for (size_t i = 0; i < inputs.size(); ++i) {
+    // write records one by one to index their offsets in the log file
+    std::ostringstream record;
+    WriteMeasureRecords(&record, {inputs[i]}, {results[i]});
+    int64_t offset = ofs.tellp();
+    ofs << record.str();
+    WriteRecordIndexEntry(&index_ofs, offset, record.str().size(), inputs[i], results[i]);
+  }
 }
 
 RecordReader::RecordReader(String filename) {
@@ -335,6 +353,14 @@ TVM_REGISTER_GLOBAL("auto_scheduler.RecordReaderReadNext").set_body_typed([](Rec
   }
 });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.ReadMeasureRecord").set_body_typed([](const String& str) {
+  auto inp = make_object<MeasureInputNode>();
+  auto res = make_object<MeasureResultNode>();
+  std::string log_version;
+  ReadMeasureRecord(str, inp.get(), res.get(), &log_version);
+  return Array<ObjectRef>{ObjectRef(inp), ObjectRef(res)};
+});
+
 TVM_REGISTER_GLOBAL("auto_scheduler.SaveRecords")
     .set_body_typed([](String filename, Array<MeasureInput> in, Array<MeasureResult> res) {
       std::ofstream ofs(filename, std::ofstream::app);
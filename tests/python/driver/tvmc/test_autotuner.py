@@ -148,3 +148,36 @@ def test_tune_tasks__invalid_tuner(onnx_resnet50, tmpdir_factory):
 
     with pytest.raises(tvmc.common.TVMCException):
         tvmc.autotuner.tune_tasks(tasks, log_file, _get_measure_options(), "invalid_tuner", 1, 1)
+
+
+def test_tune_tasks__parallel_tasks__checkpoint(onnx_resnet50, tmpdir_factory):
+    pytest.importorskip("onnx")
+
+    tasks = _get_tasks(onnx_resnet50)[:2]
+    tmpdir_name = tmpdir_factory.mktemp("data")
+    log_file = os.path.join(tmpdir_name, "log_parallel.txt")
+    checkpoint = os.path.join(tmpdir_name, "checkpoint.txt")
+
+    builder = autotvm.LocalBuilder(build_func="default")
+    measure_options = [
+        autotvm.measure_option(builder=builder, runner="local") for _ in range(len(tasks))
+    ]
+
+    def _tune():
+        tvmc.autotuner.tune_tasks(
+            tasks=tasks,
+            log_file=log_file,
+            measure_option=measure_options,
+            tuner="random",
+            trials=1,
+            early_stopping=1,
+            checkpoint=checkpoint,
+        )
+
+    _tune()
+    assert len(tvmc.autotuner.load_checkpoint(checkpoint)) == len(tasks)
+    log_size = os.path.getsize(log_file)
+
+    # the finished tasks are not tuned again
+    _tune()
+    assert os.path.getsize(log_file) == log_size
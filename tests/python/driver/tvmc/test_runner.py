@@ -54,6 +54,27 @@ def test_format_times__contains_header():
     assert "std (s)" in sut
 
 
+def test_get_latency_stats():
+    sut = tvmc.runner.get_latency_stats([0.1 * x for x in range(1, 101)])
+
+    assert sut["min"] == pytest.approx(0.1)
+    assert sut["max"] == pytest.approx(10.0)
+    assert sut["p50"] == pytest.approx(5.05)
+    assert sut["p90"] == pytest.approx(9.01)
+    assert sut["p99"] == pytest.approx(9.901)
+
+
+def test_format_benchmark__contains_header():
+    report = {
+        "config": {"concurrency": 2},
+        "latency": tvmc.runner.get_latency_stats([60, 120, 12, 42]),
+        "throughput": 0.05,
+    }
+    sut = tvmc.runner.format_benchmark(report)
+    assert "p99 (s)" in sut
+    assert "throughput (/s)" in sut
+
+
 def test_get_top_results_keep_results():
     fake_outputs = {"output_0": np.array([[1, 2, 3, 4], [5, 6, 7, 8]])}
     number_of_results_wanted = 3
@@ -96,3 +117,24 @@ def test_run_tflite_module__with_profile__valid_input(
     assert type(outputs) is dict
     assert type(times) is tuple
     assert "output_0" in outputs.keys()
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_benchmark_tflite_module(tflite_compiled_module_as_tarfile, concurrency):
+    # some CI environments wont offer TFLite, so skip in case it is not present
+    pytest.importorskip("tflite")
+
+    report = tvmc.runner.benchmark_module(
+        tflite_compiled_module_as_tarfile,
+        hostname=None,
+        device="cpu",
+        warmup=1,
+        repeat=3,
+        concurrency=concurrency,
+    )
+
+    assert report["config"]["concurrency"] == concurrency
+    # every instance measures its own latencies
+    assert len(report["times"]) == 3 * concurrency
+    assert report["latency"]["min"] <= report["latency"]["p50"] <= report["latency"]["max"]
+    assert report["throughput"] > 0
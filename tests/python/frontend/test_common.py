@@ -14,7 +14,14 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import numpy as np
+
+import tvm
+import tvm.testing
+from tvm import relay
 from tvm.relay.frontend.common import StrAttrsDict
+from tvm.relay.frontend.common import TypeInferenceContext, infer_shape, infer_type
+from tvm.relay.frontend.common import ConstantEvaluator, infer_value, try_infer_value
 
 
 def test_key_is_present():
@@ -27,6 +34,80 @@ def test_key_is_not_present():
     assert not attrs.has_attr("b")
 
 
+def test_type_inference_context():
+    def _build(out, i):
+        if i % 2:
+            return relay.nn.relu(out)
+        return relay.nn.max_pool2d(out, pool_size=(2, 2), padding=(1, 1))
+
+    x = relay.var("x", shape=(1, 3, 8, 8))
+    shapes = []
+    out = x
+    for i in range(20):
+        out = _build(out, i)
+        shapes.append(infer_shape(out))
+
+    out = x
+    with TypeInferenceContext() as ctx:
+        for i in range(20):
+            out = _build(out, i)
+            assert infer_shape(out) == shapes[i]
+        assert len(ctx._types) == 20
+
+        tup = relay.Tuple([out, relay.add(out, out)])
+        assert infer_shape(relay.TupleGetItem(tup, 1)) == shapes[-1]
+        assert len(infer_type(tup).checked_type.fields) == 2
+        assert len(ctx._types) == 22
+
+        # the types of inputs are not kept
+        infer_type(x)
+        assert len(ctx._types) == 22
+    assert TypeInferenceContext.current is None
+
+
+@tvm.testing.requires_llvm
+def test_infer_value_cache():
+    with TypeInferenceContext() as ctx:
+        evaluator = ctx.constant_evaluator
+        for i in range(3):
+            x = relay.var("x%d" % i, shape=(2, 3))
+            value = np.random.uniform(size=(2, 3)).astype("float32")
+            out = infer_value(relay.add(x, relay.const(1.0)), {"x%d" % i: tvm.nd.array(value)})
+            tvm.testing.assert_allclose(out.asnumpy(), value + 1.0)
+        # the function is compiled once for the three structurally equal expressions
+        assert evaluator.misses == 1 and evaluator.hits == 2
+
+        shape = relay.shape_of(relay.zeros((4, 5), "float32"))
+        for _ in range(2):
+            ret, success = try_infer_value(shape)
+            assert success
+            tvm.testing.assert_allclose(ret, [4, 5])
+        assert evaluator.misses == 2 and evaluator.hits == 3
+
+        # constants are not evaluated, and their data is not returned
+        const = relay.const(np.array([1, 2], dtype="int32"))
+        out = infer_value(const, {})
+        tvm.testing.assert_allclose(out.asnumpy(), [1, 2])
+        assert evaluator.misses == 2 and evaluator.hits == 3
+        out.copyfrom(np.array([3, 4], dtype="int32"))
+        tvm.testing.assert_allclose(const.data.asnumpy(), [1, 2])
+
+        # nested contexts share the evaluator, unless given another one
+        with TypeInferenceContext() as inner_ctx:
+            assert inner_ctx.constant_evaluator is evaluator
+        with TypeInferenceContext(ConstantEvaluator()) as inner_ctx:
+            assert inner_ctx.constant_evaluator is not evaluator
+
+    # the evaluator does not outlive its context
+    assert TypeInferenceContext.current is None
+    x = relay.var("x", shape=(2,))
+    out = infer_value(relay.add(x, relay.const(1.0)), {"x": tvm.nd.array(np.zeros(2, "float32"))})
+    tvm.testing.assert_allclose(out.asnumpy(), [1.0, 1.0])
+    assert evaluator.misses == 2 and evaluator.hits == 3
+
+
 if __name__ == "__main__":
     test_key_is_present()
     test_key_is_present()
+    test_type_inference_context()
+    test_infer_value_cache()
@@ -53,6 +53,56 @@ def test_ndarray_reflection():
     np.testing.assert_equal(deser_param_dict["x"].asnumpy(), deser_param_dict["y"].asnumpy())
 
 
+def test_save_load_file():
+    x = np.random.uniform(size=(10, 2)).astype("float32")
+    y = np.arange(7).astype("int8")
+    params = {"x": x, "y": tvm.nd.array(y)}
+    temp = util.tempdir()
+    path = temp.relpath("deploy.params")
+    relay.save_param_dict_to_file(params, path)
+    param2 = relay.load_param_dict_from_file(path)
+    assert len(param2) == 2
+    np.testing.assert_equal(param2["x"].asnumpy(), x)
+    np.testing.assert_equal(param2["y"].asnumpy(), y)
+
+    # the tensors are aligned for the runtime to refer to them
+    params_file = tvm.runtime.param_file.ParamFile(path)
+    for name in params_file.names:
+        assert params_file.asnumpy(name).ctypes.data % 128 == 0
+    assert tvm.runtime.param_file.load_param_names(path) == ["x", "y"]
+
+    # the bytes of save_param_dict are loaded as well
+    legacy_path = temp.relpath("legacy.params")
+    with open(legacy_path, "wb") as f:
+        f.write(relay.save_param_dict(params))
+    param3 = relay.load_param_dict_from_file(legacy_path)
+    np.testing.assert_equal(param3["x"].asnumpy(), x)
+    assert sorted(tvm.runtime.param_file.load_param_names(legacy_path)) == ["x", "y"]
+
+
+def test_graph_runtime_load_params_from_file():
+    x = relay.var("x", shape=(4, 8))
+    w = relay.var("w", shape=(4, 8))
+    func = relay.Function([x, w], relay.add(x, w))
+    w_in = np.random.uniform(size=(4, 8)).astype("float32")
+    x_in = np.random.uniform(size=(4, 8)).astype("float32")
+    with tvm.transform.PassContext(opt_level=0):
+        lib = relay.build(func, target="llvm")
+
+    temp = util.tempdir()
+    path = temp.relpath("deploy.params")
+    relay.save_param_dict_to_file({"w": w_in}, path)
+    legacy_path = temp.relpath("legacy.params")
+    with open(legacy_path, "wb") as f:
+        f.write(relay.save_param_dict({"w": w_in}))
+
+    for params_path, zero_copy in [(path, False), (path, True), (legacy_path, False)]:
+        mod = graph_runtime.GraphModule(lib["default"](tvm.cpu(0)))
+        mod.load_params_from_file(params_path, zero_copy=zero_copy)
+        mod.run(x=x_in)
+        tvm.testing.assert_allclose(mod.get_output(0).asnumpy(), x_in + w_in)
+
+
 def test_bigendian_rpc_param():
     """Test big endian rpc when there is a PowerPC RPC server available"""
     host = os.environ.get("TVM_POWERPC_TEST_HOST", None)
@@ -92,4 +142,6 @@ def test_bigendian_rpc_param():
 if __name__ == "__main__":
     test_save_load()
     test_ndarray_reflection()
+    test_save_load_file()
+    test_graph_runtime_load_params_from_file()
     test_bigendian_rpc_param()
@@ -106,6 +106,40 @@ def test_calibrate_memory_bound():
         relay.quantize.quantize(mod, params, dataset)
 
 
+def test_calibrate_streaming():
+    mod, params = testing.synthetic.get_workload()
+    dataset = get_calibration_dataset(mod, "data")
+    with relay.quantize.qconfig(calibrate_mode="kl_divergence_streaming"):
+        relay.quantize.quantize(mod, params, dataset)
+
+
+def test_streaming_histogram():
+    from tvm.relay.quantize.kl_divergence import StreamingHistogram, _find_scale_by_kl
+
+    num_bins = 201
+    batches = [np.zeros(10), np.random.normal(size=1000), np.random.normal(scale=10, size=1000)]
+    hist = StreamingHistogram(num_bins)
+    for batch in batches:
+        hist.update(batch)
+    data = np.concatenate(batches)
+
+    thres = np.max(np.abs(data))
+    assert thres <= hist.thres <= 3 * thres
+    assert hist.min_val == np.min(data)
+    assert hist.hist.sum() == data.size
+    # merged bins are aligned with the bins of the final range
+    expected, _ = np.histogram(data, bins=num_bins, range=(-hist.thres, hist.thres))
+    assert np.abs(hist.hist - expected).sum() <= 2
+
+    # the threshold is close to the one found with all the data at once
+    arr = np.random.normal(size=100000) * np.linspace(0.5, 1, 100000)
+    hist = StreamingHistogram()
+    for batch in np.split(arr, 10):
+        hist.update(batch)
+    expected = _find_scale_by_kl(arr)
+    np.testing.assert_allclose(hist.find_scale(), expected, rtol=0.1)
+
+
 ####################################
 # Quant/Dequant Partitioning Tests #
 ####################################
@@ -313,6 +347,8 @@ if __name__ == "__main__":
     test_calibrate_target(False)
     test_calibrate_target(True)
     test_calibrate_memory_bound()
+    test_calibrate_streaming()
+    test_streaming_histogram()
 
     test_add_partition()
     test_conv2d_partition()
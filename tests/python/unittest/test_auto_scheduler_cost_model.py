@@ -78,6 +78,41 @@ def test_xgb_model():
         model.load(fp.name)
 
 
+def test_xgb_model_incremental():
+    task, inputs, results = get_sample_records(50)
+
+    model = auto_scheduler.XGBModel(num_warmup_sample=-1, incremental=True, window_size=30)
+    model.update(inputs[:25], results[:25])
+    n_trees = len(model.bst.get_dump())
+    model.update(inputs[25:], results[25:])
+    # the second update continues from the first booster
+    assert len(model.bst.get_dump()) > n_trees
+    assert len(model.train_times) == 2
+
+    preds = model.predict(task, [x.state for x in inputs])
+    assert len(preds) == len(inputs)
+
+
+def test_xgb_model_feature_cache():
+    task, inputs, results = get_sample_records(50)
+    states = [x.state for x in inputs]
+
+    model = auto_scheduler.XGBModel(num_warmup_sample=-1, feature_cache_size=100)
+    preds = model.predict(task, states)
+    assert model.feature_cache.hits == 0
+    n_cached = len(model.feature_cache)
+    assert 0 < n_cached <= len(states)
+
+    # the states scored by predict are not featurized again
+    model.update(inputs, results)
+    assert model.feature_cache.hits == len(states)
+    assert len(model.feature_cache) == n_cached
+    model.predict(task, states)
+    assert model.feature_cache.hits == 2 * len(states)
+
+
 if __name__ == "__main__":
     test_random_model()
     test_xgb_model()
+    test_xgb_model_incremental()
+    test_xgb_model_feature_cache()
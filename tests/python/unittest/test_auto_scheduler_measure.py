@@ -20,6 +20,7 @@
 import tvm
 from tvm import topi
 from tvm import te, auto_scheduler
+import os
 import tempfile
 import tvm.testing
 
@@ -191,6 +192,67 @@ def test_recover_measure_input():
         assert str(correct_inp.state) == str(inp.state)
 
 
+def test_record_index():
+    task = auto_scheduler.create_task(matmul_auto_scheduler_test, [64, 64, 64], "llvm")
+    inp = auto_scheduler.measure.MeasureInput(task, task.compute_dag.init_state)
+    costs = [0.3, 0.1, 0.4, 0.2]
+    results = [auto_scheduler.measure.MeasureResult([c], 0, "", 0.2, 1) for c in costs]
+    results.append(auto_scheduler.measure.MeasureResult([0.01], 1, "", 0.2, 1))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        log_file = os.path.join(tmpdir, "records.json")
+        auto_scheduler.save_records(log_file, [inp] * 3, results[:3])
+
+        # the records are indexed once, and the best one is deserialized alone
+        best_inp, best_res = auto_scheduler.load_best(log_file, task.workload_key, task.target)
+        assert best_res.costs[0].value == 0.1
+        assert os.path.isfile(log_file + ".idx")
+
+        # records appended later are added to the index
+        auto_scheduler.save_records(log_file, [inp] * 2, results[3:])
+        index = auto_scheduler.RecordIndex(log_file, top_k=2)
+        assert sum(index.counts.values()) == 5
+        best = index.query_best(task.workload_key, "llvm")
+        assert [res.costs[0].value for _, res in best] == [0.1, 0.2]
+        assert str(best[0][0].state) == str(inp.state)
+        assert index.query_best("missing-workload") == []
+
+        # the index is kept in memory when it cannot be written
+        other_log_file = os.path.join(tmpdir, "other_records.json")
+        auto_scheduler.save_records(other_log_file, [inp] * 3, results[:3])
+        os.mkdir(other_log_file + ".idx")
+        index = auto_scheduler.RecordIndex(other_log_file)
+        assert sum(index.counts.values()) == 3
+        assert index.query_best(task.workload_key, "llvm")[0][1].costs[0].value == 0.1
+
+
+@tvm.testing.requires_llvm
+def test_record_index_appended_by_record_to_file():
+    task = auto_scheduler.create_task(matmul_auto_scheduler_test, [64, 64, 64], "llvm")
+    inp = auto_scheduler.measure.MeasureInput(task, task.compute_dag.init_state)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # a log written without its index, e.g. by a previous run
+        log_file = os.path.join(tmpdir, "records.json")
+        res = auto_scheduler.measure.MeasureResult([1e-9], 0, "", 0.2, 1)
+        auto_scheduler.save_records(log_file, [inp], [res])
+
+        # the index created by RecordToFile only holds the records it appends
+        tuning_options = auto_scheduler.TuningOptions(
+            num_measure_trials=2,
+            runner="local",
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        auto_scheduler.auto_schedule(task, auto_scheduler.EmptyPolicy(task), tuning_options)
+        assert os.path.isfile(log_file + ".idx")
+
+        # the records before the indexed ones are indexed as well
+        _, best_res = auto_scheduler.load_best(log_file, task.workload_key, task.target)
+        assert best_res.costs[0].value < 1e-8
+        index = auto_scheduler.RecordIndex(log_file)
+        assert sum(index.counts.values()) >= 2
+
+
 def test_measure_local_builder_runner():
     if not tvm.testing.device_enabled("llvm"):
         return
@@ -238,5 +300,7 @@ if __name__ == "__main__":
     test_record_follow_split_follow_fused_split()
     test_record_pragma_storage_align_rfactor()
     test_recover_measure_input()
+    test_record_index()
+    test_record_index_appended_by_record_to_file()
     test_measure_local_builder_runner()
     test_measure_local_builder_rpc_runner()
@@ -107,6 +107,39 @@ def test_task_scheduler_gradient():
         assert counters[tasks[1].workload_key] == 1
 
 
+def test_task_scheduler_concurrent():
+    tasks = []
+    for n in [2, 4, 8]:
+        tasks.append(auto_scheduler.create_task(matmul_auto_scheduler_test, (n, n, n), "llvm"))
+
+    with tempfile.NamedTemporaryFile() as fp:
+        log_file = fp.name
+        num_trials_per_task = 2
+
+        tune_option = auto_scheduler.TuningOptions(
+            num_measure_trials=num_trials_per_task * len(tasks),
+            num_measures_per_round=1,
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        task_scheduler = auto_scheduler.TaskScheduler(
+            tasks, strategy="round-robin", num_parallel_tasks=2
+        )
+        task_scheduler.tune(tune_option, search_policy="sketch.random")
+
+        # every task is warmed up, and the budget is not exceeded by the rounds in flight
+        counters = {}
+        for task in tasks:
+            counters[task.workload_key] = 0
+
+        for inp, res in auto_scheduler.load_records(log_file):
+            counters[inp.task.workload_key] += 1
+
+        assert all(ct >= 1 for ct in counters.values())
+        assert sum(counters.values()) == num_trials_per_task * len(tasks)
+        assert sum(task_scheduler.task_cts) == num_trials_per_task * len(tasks)
+
+
 if __name__ == "__main__":
     test_task_scheduler_round_robin()
     test_task_scheduler_gradient()
+    test_task_scheduler_concurrent()
@@ -116,9 +116,34 @@ def test_db_filter():
     assert len(records) == 2
 
 
+def test_list_db():
+    logging.info("test list-structured db ...")
+    records = get_sample_records(5)
+    inp1, res1 = records[0]
+    lis = list(tuple(res1))
+    lis[-1] = 9999.9999
+    res1_new = MeasureResult(*lis)
+
+    _db = database.DummyListDatabase(batch_size=2)
+    _db.flush()
+    _db.save_batch(records)
+    _db.save(inp1, res1_new, extend=True)
+    assert _db.load(inp1).timestamp == 9999.9999
+    assert len(_db.load(inp1, get_all=True)) == 2
+    assert _db.load(records[1][0]) == records[1][1]
+
+    _db.save(inp1, res1)
+    assert _db.load(inp1, get_all=True) == [res1]
+
+    # filtering streams the keys in batches smaller than the database
+    matched = _db.filter(lambda inp, ress: any(r.costs[0] <= 2 for r in ress))
+    assert len(matched) == 2
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_save_load()
     test_db_hash()
     test_db_latest_all()
     test_db_filter()
+    test_list_db()
@@ -15,9 +15,10 @@
 # specific language governing permissions and limitations
 # under the License.
 """Test local executor"""
+import os
 import time
 
-from tvm.autotvm.measure import LocalExecutor, executor
+from tvm.autotvm.measure import LocalExecutor, KLocalWorkerExecutor, executor
 
 
 def slow(n):
@@ -64,6 +65,42 @@ def test_timeout():
     assert isinstance(res, executor.TimeoutError)
 
 
+def test_cancel():
+    ex = LocalExecutor(timeout=60)
+
+    tic = time.time()
+    f1 = ex.submit(timeout_job, 10)
+    f1.cancel()
+    assert f1.done()
+    assert time.time() - tic < 10
+
+
+def worker_pid(ctx):
+    assert ctx.exist
+    return os.getpid()
+
+
+def worker_timeout_job(ctx, n):
+    time.sleep(n * 1.5)
+
+
+def test_klocal_worker_reuse():
+    timeout = 0.5
+
+    ex = KLocalWorkerExecutor(timeout=timeout)
+    pid = ex.submit(worker_pid, "llvm").get()
+    assert pid != os.getpid()
+    assert ex.submit(worker_pid, "llvm").get() == pid
+
+    # a timeout recycles the worker
+    res = ex.submit(worker_timeout_job, "llvm", timeout).get()
+    assert isinstance(res, executor.TimeoutError)
+    assert ex.submit(worker_pid, "llvm").get() != pid
+    ex.shutdown()
+
+
 if __name__ == "__main__":
     test_local_measure_async()
     test_timeout()
+    test_cancel()
+    test_klocal_worker_reuse()
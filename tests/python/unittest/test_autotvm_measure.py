@@ -25,6 +25,8 @@ from tvm import te
 from test_autotvm_common import DummyRunner, bad_matmul, get_sample_task
 from tvm import autotvm
 from tvm.autotvm.measure.measure import MeasureErrorNo, MeasureResult
+from tvm.rpc.server import Server
+from tvm.rpc.tracker import Tracker
 
 
 def test_task_tuner_without_measurement():
@@ -39,6 +41,7 @@ def test_task_tuner_without_measurement():
         autotvm.tuner.RandomTuner,
         autotvm.tuner.GridSearchTuner,
         autotvm.tuner.GATuner,
+        autotvm.tuner.VectorizedGATuner,
         autotvm.tuner.XGBTuner,
     ]:
         tuner = tuner_class(task)
@@ -46,6 +49,60 @@ def test_task_tuner_without_measurement():
         assert tuner.best_flops > 1
 
 
+def test_task_tuner_pipelined():
+    """test the pipelined tuning loop without measurement"""
+    task, _ = get_sample_task()
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=4), runner=DummyRunner()
+    )
+
+    for tuner_class in [
+        autotvm.tuner.RandomTuner,
+        autotvm.tuner.GATuner,
+        autotvm.tuner.VectorizedGATuner,
+    ]:
+        tuner = tuner_class(task)
+        measured = []
+
+        def _callback(_, inputs, results):
+            assert len(inputs) == len(results)
+            measured.extend(inp.config.index for inp in inputs)
+
+        tuner.tune(
+            n_trial=16,
+            measure_option=measure_option,
+            callbacks=[_callback],
+            pipeline=True,
+            pipeline_depth=2,
+        )
+        assert len(measured) == 16
+        assert tuner.best_flops > 1
+
+
+def test_task_tuner_pipelined_local_runner():
+    """test that the files of the queued batches survive the next builds"""
+    task, _ = get_sample_task()
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=2), runner=autotvm.LocalRunner(number=1)
+    )
+
+    def _callback(_, inputs, results):
+        for res in results:
+            assert res.error_no == 0, res
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(
+        n_trial=8,
+        measure_option=measure_option,
+        callbacks=[_callback],
+        pipeline=True,
+        pipeline_depth=2,
+    )
+    assert tuner.best_flops > 0
+
+
 def test_check_correctness():
     task, target = get_sample_task()
 
@@ -73,8 +130,66 @@ def test_check_correctness():
     tuner.tune(n_trial=2, measure_option=measure_option, callbacks=[_callback_wrong])
 
 
+def test_klocal_builder_parallel():
+    task, target = get_sample_task()
+
+    builder = autotvm.KLocalBuilder(n_parallel=2)
+    assert builder.n_parallel == 2
+    builder.set_task(task, {})
+
+    inputs = [autotvm.MeasureInput(target, task, task.config_space.get(i)) for i in range(4)]
+    results = builder.build(inputs)
+    assert len(results) == len(inputs)
+    for res in results:
+        assert not isinstance(res, MeasureResult), res
+        assert res.error is None
+
+
+def test_rpc_runner_reuse_session_after_error():
+    """test that the candidates after a runtime error run on a single device"""
+    task, target = get_sample_task()
+    tracker = Tracker("localhost", port=9000, port_end=10000, silent=True)
+    device_key = "$reuse$device$%d" % tracker.port
+    server = Server(
+        "localhost",
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=(tracker.host, tracker.port),
+        silent=True,
+    )
+    try:
+        runner = autotvm.RPCRunner(
+            device_key, tracker.host, tracker.port, n_parallel=1, number=1, reuse_session=True
+        )
+        runner.set_task(task)
+        builder = autotvm.LocalBuilder()
+        builder.set_task(task, runner.get_build_kwargs())
+
+        inputs = [autotvm.MeasureInput(target, task, task.config_space.get(i)) for i in range(4)]
+        build_results = builder.build(inputs)
+        # the library of the second candidate fails to load on the device
+        with open(build_results[1].filename, "wb") as f:
+            f.write(b"not a library")
+
+        tic = time.time()
+        results = runner.run(inputs, build_results)
+        assert results[1].error_no == MeasureErrorNo.RUNTIME_DEVICE
+        for i in [0, 2, 3]:
+            assert results[i].error_no == MeasureErrorNo.NO_ERROR, results[i]
+        # the next session is served without waiting for the failed one to time out
+        assert time.time() - tic < runner.timeout * len(inputs)
+    finally:
+        server.terminate()
+        tracker.terminate()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     test_task_tuner_without_measurement()
+    test_task_tuner_pipelined()
+    test_task_tuner_pipelined_local_runner()
     test_check_correctness()
+    test_klocal_builder_parallel()
+    test_rpc_runner_reuse_session_after_error()
@@ -87,7 +87,108 @@ def test_apply_history_best():
     assert str(x) == str(tsk.config_space.get(2))
 
 
+def test_record_store():
+    temp = util.tempdir()
+    store_path = temp.relpath("temp.tvmrec")
+    json_path = temp.relpath("temp.log")
+
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(0, 10)]
+    results = [MeasureResult((10 - i,), 0, 0, 0) for i in range(0, 10)]
+    results[-1] = MeasureResult((0.001,), MeasureErrorNo.RUNTIME_DEVICE, 0, 0)
+
+    cb = autotvm.callback.log_to_store(store_path)
+    cb(None, inputs[:5], results[:5])
+    cb(None, inputs[5:], results[5:])
+    assert autotvm.record_store.is_record_store(store_path)
+
+    # the index is reloaded from disk
+    store = autotvm.record_store.RecordStore(store_path, mode="r")
+    assert len(store) == 10
+    for x, y in zip(zip(inputs, results), store.read()):
+        assert measure_str_key(x[0]) == measure_str_key(y[0])
+        assert x[1].error_no == y[1].error_no
+
+    # the records are the rows of the json log format
+    with open(store_path, "rb") as f:
+        f.seek(store.entries[0].offset)
+        row = json.loads(f.read(store.entries[0].size))
+    assert measure_str_key(decode(json.dumps(row))[0]) == measure_str_key(inputs[0])
+    assert store.entries[0].workload == tsk.workload
+
+    # the best valid record is found without decoding the others
+    inp, _ = store.query_best(target, tsk.workload)
+    assert str(inp.config) == str(inputs[8].config)
+    hist_best = ApplyHistoryBest(store_path)
+    assert str(hist_best.query(target, tsk.workload)) == str(inputs[8].config)
+
+    # a round trip through the json format keeps all the records
+    autotvm.record_store.convert_to_json(store_path, json_path)
+    store_2 = autotvm.record_store.convert_from_json(json_path, temp.relpath("temp_2.tvmrec"))
+    assert [e[2:] for e in store_2.entries] == [e[2:] for e in store.entries]
+
+
+def test_log_toolkit():
+    temp = util.tempdir()
+    log_path = temp.relpath("temp.log")
+
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(0, 10)]
+    results = [MeasureResult((10 - i,), 0, 0, 0) for i in range(0, 10)]
+    with open(log_path, "w") as fo:
+        cb = autotvm.callback.log_to_file(fo)
+        cb(None, inputs, results)
+        # duplicated records
+        cb(None, inputs[:3], results[:3])
+
+    dedupe_path = temp.relpath("dedupe.log")
+    assert autotvm.record.dedupe_log(log_path, dedupe_path, n_jobs=2) == 10
+    merge_path = temp.relpath("merge.log")
+    assert autotvm.record.merge_logs([log_path, log_path], merge_path, n_jobs=1) == 26
+
+    out_files = autotvm.record.split_workload(log_path, out_prefix=temp.relpath("split"))
+    assert len(out_files) == 1
+    assert len(list(autotvm.record.load_from_file(out_files[0]))) == 10
+
+    best_path = temp.relpath("best.log")
+    autotvm.record.pick_best(log_path, best_path, top_k=3, n_jobs=2)
+    best = list(autotvm.record.load_from_file(best_path))
+    assert sorted(res.costs[0] for _, res in best) == [1, 2, 3]
+
+
+def test_apply_indexed_history_best():
+    temp = util.tempdir()
+    cache_dir = temp.relpath("index")
+
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(0, 10)]
+    results = [MeasureResult((10 - i,), 0, 0, 0) for i in range(0, 10)]
+    results[-1] = MeasureResult((0.001,), MeasureErrorNo.RUNTIME_DEVICE, 0, 0)
+
+    log_paths = [temp.relpath("a.log"), temp.relpath("b.log")]
+    autotvm.callback.log_to_file(log_paths[0])(None, inputs[:5], results[:5])
+    autotvm.callback.log_to_file(log_paths[1])(None, inputs[5:], results[5:])
+
+    hist_best = autotvm.task.ApplyIndexedHistoryBest(log_paths, index_cache=cache_dir)
+    assert str(hist_best.query(target, tsk.workload)) == str(inputs[8].config)
+
+    # the cached index of an unchanged file is reused, and rebuilt once the file changes
+    hist_best = autotvm.task.ApplyIndexedHistoryBest(log_paths, index_cache=cache_dir)
+    assert str(hist_best.query(target, tsk.workload)) == str(inputs[8].config)
+    time.sleep(0.01)
+    autotvm.callback.log_to_file(log_paths[0])(None, inputs[:1], [MeasureResult((0.5,), 0, 0, 0)])
+    hist_best = autotvm.task.ApplyIndexedHistoryBest(log_paths, index_cache=cache_dir)
+    assert str(hist_best.query(target, tsk.workload)) == str(inputs[0].config)
+
+    # records given as an iterator are indexed too
+    hist_best = autotvm.task.ApplyIndexedHistoryBest(zip(inputs, results))
+    assert str(hist_best.query(target, tsk.workload)) == str(inputs[8].config)
+
+
 if __name__ == "__main__":
     test_load_dump()
     test_apply_history_best()
     test_file_io()
+    test_record_store()
+    test_log_toolkit()
+    test_apply_indexed_history_best()
@@ -100,5 +100,38 @@ def test_split():
         pass
 
 
+def test_split_lazy():
+    # entities are computed on demand in the enumeration order
+    cfg = ConfigSpace()
+    cfg.define_split("tile_x", cfg.axis(224), policy="verbose", num_outputs=3)
+    space = cfg.space_map["tile_x"]
+    sizes = [space[i].size for i in range(len(space))]
+    assert len(set(tuple(x) for x in sizes)) == len(space) == 84
+    assert all(x[0] == -1 and x[1] * x[2] <= 224 for x in sizes)
+    assert space[-1].size == sizes[-1]
+    assert [x.size for x in space.entities] == sizes
+
+    # filter only keeps the indices of the accepted entities
+    cfg.define_split(
+        "tile_y", cfg.axis(224), policy="verbose", num_outputs=3, filter=lambda x: x.size[-1] <= 4
+    )
+    filtered = [x.size for x in cfg.space_map["tile_y"].entities]
+    assert filtered == [x for x in sizes if x[-1] <= 4]
+
+    try:
+        cfg.define_split("tile_z", cfg.axis(7), num_outputs=2, filter=lambda x: False)
+        assert False
+    except IndexError:
+        pass
+
+    # a deep tiling of a large axis is not enumerated
+    cfg = ConfigSpace()
+    cfg.define_split("tile_n", cfg.axis(2 ** 12 * 3 ** 5 * 5 * 7), policy="verbose", num_outputs=6)
+    space = cfg.space_map["tile_n"]
+    assert len(space) > 10 ** 8
+    assert len(cfg.get(len(cfg) - 1)["tile_n"].size) == 6
+
+
 if __name__ == "__main__":
     test_split()
+    test_split_lazy()
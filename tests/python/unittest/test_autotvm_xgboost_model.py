@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 import time
+import tempfile
 
 import numpy as np
 
@@ -51,6 +52,77 @@ def test_tuner():
     tuner.load_history(records)
 
 
+def test_batch_sa_optimizer():
+    task, target = get_sample_task()
+    records = get_sample_records(n=100)
+
+    model = XGBoostCostModel(task, feature_type="knob", loss_type="rank")
+    model.fit_log(records, plan_size=32)
+
+    optimizer = autotvm.tuner.sa_model_optimizer.BatchSimulatedAnnealingOptimizer(
+        task, n_iter=20, parallel_size=64
+    )
+    exclusive = set(range(10))
+    maximums = optimizer.find_maximums(model, 8, exclusive)
+    assert 0 < len(maximums) <= 8
+    assert len(set(maximums)) == len(maximums)
+    assert not exclusive.intersection(maximums)
+    assert all(0 <= x < len(task.config_space) for x in maximums)
+
+    tuner = autotvm.tuner.XGBTuner(task, feature_type="knob", optimizer="batch_sa")
+    tuner.load_history(records)
+
+    class NegativeModel(object):
+        def predict(self, xs):
+            return -1.0 - np.asarray(xs, dtype=np.float64)
+
+    maximums = optimizer.find_maximums(NegativeModel(), 8, exclusive)
+    assert len(maximums) == 8
+
+
+def test_incremental_fit():
+    task, target = get_sample_task()
+
+    model = XGBoostCostModel(
+        task, feature_type="knob", loss_type="rank", incremental=True, window_size=32
+    )
+    xs = np.arange(64)
+    ys = np.random.uniform(size=64)
+    model.fit(xs[:32], ys[:32], plan_size=32)
+    n_trees = len(model.bst.get_dump())
+    model.fit(xs, ys, plan_size=32)
+    # the second fit continues from the first booster
+    assert len(model.bst.get_dump()) > n_trees
+    assert len(model.train_times) == 2
+
+
+def test_lru_feature_cache():
+    task, target = get_sample_task()
+    cache_dir = tempfile.mkdtemp()
+
+    cache = autotvm.tuner.LRUFeatureCache(capacity=4, cache_dir=cache_dir)
+    model = XGBoostCostModel(task, feature_type="knob", loss_type="rank", feature_cache=cache)
+    expected = model._get_feature(np.arange(10))
+    # the cache is bounded but the features of one call are complete
+    assert len(cache.get(model.cache_key).memory) == 4
+    cache.save()
+
+    # a new session memory-maps the saved features instead of extracting them
+    cache = autotvm.tuner.LRUFeatureCache(capacity=4, cache_dir=cache_dir)
+    model = XGBoostCostModel(task, feature_type="knob", loss_type="rank", feature_cache=cache)
+    fea_cache = cache.get(model.cache_key)
+    # the features evicted from memory are persisted as well
+    assert len(fea_cache) == 10
+    model.feature_extract_func = None
+    np.testing.assert_equal(model._get_feature([7, 8, 9, 6]), expected[[7, 8, 9, 6]])
+    np.testing.assert_equal(model._get_feature([0, 1, 2]), expected[[0, 1, 2]])
+    # the entries both in memory and on disk are counted once
+    assert len(fea_cache) == 10
+
+
 if __name__ == "__main__":
     test_fit()
     test_tuner()
+    test_batch_sa_optimizer()
+    test_incremental_fit()
+    test_lru_feature_cache()
@@ -0,0 +1,62 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the benchmark driver of the relay.testing networks"""
+
+import os
+import tempfile
+
+import tvm.testing
+from tvm.exec import benchmark_networks
+
+
+def test_history_regressions():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = os.path.join(tmp_dir, "history.json")
+        config = {"target": "llvm", "batch_size": 1}
+        assert (
+            benchmark_networks.find_baseline(benchmark_networks.load_history(history), config)
+            is None
+        )
+
+        for p50 in (10.0, 11.0):
+            run = {"timestamp": p50, "config": config, "results": {"mlp": {"p50": p50}}}
+            benchmark_networks.append_history(history, run)
+        other = {"target": "cuda", "batch_size": 1}
+        benchmark_networks.append_history(history, {"timestamp": 0, "config": other, "results": {}})
+
+        runs = benchmark_networks.load_history(history)
+        assert len(runs) == 3
+        assert benchmark_networks.find_baseline(runs, config)["timestamp"] == 11.0
+        assert benchmark_networks.find_baseline(runs, config, "first")["timestamp"] == 10.0
+
+    baseline = {"mlp": {"p50": 10.0}, "lstm": {"p50": 10.0}}
+    results = {"mlp": {"p50": 10.4}, "lstm": {"p50": 10.6}, "dcgan": {"p50": 20.0}}
+    regressions = benchmark_networks.detect_regressions(results, baseline, threshold=0.05)
+    assert regressions == [("lstm", 10.0, 10.6)]
+
+
+@tvm.testing.requires_llvm
+def test_benchmark_network():
+    result = benchmark_networks.benchmark_network("mlp", warmup=1, number=1, repeat=3)
+    for key in ("mean", "p50", "p90", "p99", "max"):
+        assert result[key] > 0
+    assert result["min"] <= result["p50"] <= result["p99"] <= result["max"]
+
+
+if __name__ == "__main__":
+    test_history_regressions()
+    test_benchmark_network()
@@ -171,8 +171,77 @@ def test_std_math_functions():
         np.testing.assert_allclose(B_data.asnumpy(), np.array([7.389056, 20.085537]))
 
 
+@tvm.testing.requires_micro
+def test_runtime_lib_cache():
+    """Test reusing the runtime libraries across builds."""
+    import tvm.micro
+
+    class CountingCompiler(tvm.micro.DefaultCompiler):
+        def __init__(self, target):
+            super(CountingCompiler, self).__init__(target=target)
+            self.num_libraries = 0
+
+        def library(self, output, sources, options=None):
+            self.num_libraries += 1
+            return super(CountingCompiler, self).library(output, sources, options)
+
+    A = tvm.te.placeholder((2,), dtype="int8")
+    B = tvm.te.placeholder((1,), dtype="int8")
+    C = tvm.te.compute(A.shape, lambda i: A[i] + B[0], name="C")
+    sched = tvm.te.create_schedule(C.op)
+    with tvm.transform.PassContext(opt_level=3, config={"tir.disable_vectorize": True}):
+        mod = tvm.build(sched, [A, B, C], TARGET, target_host=TARGET, name="add")
+
+    cache_dir = tvm.contrib.util.tempdir()
+    opts = tvm.micro.default_options(os.path.join(tvm.micro.CRT_ROOT_DIR, "host"))
+    binaries = []
+    for expected_libraries in [len(tvm.micro.build.RUNTIME_LIB_SRC_DIRS) + 1, 1]:
+        compiler = CountingCompiler(target=TARGET)
+        binaries.append(
+            tvm.micro.build_static_runtime(
+                tvm.micro.Workspace(),
+                compiler,
+                mod,
+                lib_opts=opts["bin_opts"],
+                bin_opts=opts["bin_opts"],
+                runtime_lib_cache_dir=cache_dir.temp_dir,
+            )
+        )
+        # the runtime libraries are compiled once, then only the generated module is
+        assert compiler.num_libraries == expected_libraries
+
+    with tvm.micro.Session(binary=binaries[-1], flasher=compiler.flasher()) as sess:
+        A_data = tvm.nd.array(np.array([2, 3], dtype="int8"), ctx=sess.context)
+        B_data = tvm.nd.array(np.array([4], dtype="int8"), ctx=sess.context)
+        C_data = tvm.nd.array(np.array([0, 0], dtype="int8"), ctx=sess.context)
+        sess.get_system_lib().get_function("add")(A_data, B_data, C_data)
+        assert (C_data.asnumpy() == np.array([6, 7])).all()
+
+
+@tvm.testing.requires_micro
+def test_runtime_lib_cache_prune():
+    """Test that only the most recently used archives of a runtime library are kept."""
+    import tvm.micro
+
+    cache_dir = tvm.contrib.util.tempdir()
+    num_entries = tvm.micro.build.RUNTIME_LIB_CACHE_SIZE + 2
+    for i in range(num_entries):
+        for lib_name in ["common", "utvm_rpc_server"]:
+            path = cache_dir.relpath(f"{lib_name}-{i}.tar")
+            with open(path, "w"):
+                pass
+            os.utime(path, (i, i))
+
+    tvm.micro.build._prune_runtime_lib_cache(cache_dir.temp_dir, "common")
+    expected = [f"common-{i}.tar" for i in range(2, num_entries)]
+    expected += [f"utvm_rpc_server-{i}.tar" for i in range(num_entries)]
+    assert sorted(os.listdir(cache_dir.temp_dir)) == sorted(expected)
+
+
 if __name__ == "__main__":
     test_compile_runtime()
     test_reset()
     test_graph_runtime()
     test_std_math_functions()
+    test_runtime_lib_cache()
+    test_runtime_lib_cache_prune()
@@ -21,13 +21,14 @@ import os
 import stat
 import logging
 import time
+import weakref
 import multiprocessing
 
 import pytest
 import numpy as np
 from tvm import rpc
 from tvm.contrib import util, cc
-from tvm.rpc.tracker import Tracker
+from tvm.rpc.tracker import Tracker, PriorityScheduler
 
 
 def test_bigendian_rpc():
@@ -191,6 +192,26 @@ def test_rpc_file_exchange():
     assert rev == blob
 
 
+def test_rpc_upload_archive():
+    if not tvm.runtime.enabled("rpc"):
+        return
+    server = rpc.Server("localhost")
+    remote = rpc.connect(server.host, server.port)
+    temp = util.tempdir()
+    blobs = {}
+    for i in range(3):
+        name = temp.relpath("dat%d.bin" % i)
+        blobs["dat%d.bin" % i] = bytearray(np.random.randint(0, 10, size=(10 + i)))
+        with open(name, "wb") as f:
+            f.write(blobs["dat%d.bin" % i])
+    # the archive is named after its local file when no target is given
+    for target in [None, "batch.tar.gz"]:
+        names = remote.upload_archive([temp.relpath(x) for x in sorted(blobs)], target)
+        assert names == sorted(blobs)
+        for name in names:
+            assert remote.download(name) == blobs[name]
+
+
 @tvm.testing.requires_llvm
 def test_rpc_remote_module():
     if not tvm.runtime.enabled("rpc"):
@@ -507,6 +528,81 @@ def test_rpc_tracker_request():
     tracker.terminate()
 
 
+def test_rpc_tracker_priority_scheduler():
+    class _Conn(object):
+        def __init__(self):
+            self.pending_matchkeys = set()
+
+    def _value(conn, port):
+        matchkey = "key:%d" % port
+        conn.pending_matchkeys.add(matchkey)
+        return (conn, "localhost", port, matchkey)
+
+    scheduler = PriorityScheduler("test_device")
+    conn = _Conn()
+    values = [_value(conn, port) for port in range(9000, 9004)]
+    for value in values:
+        scheduler.put(value)
+    scheduler.remove(values[0])
+    assert scheduler.summary() == {"free": 3, "pending": 0}
+
+    granted = []
+    scheduler.request("low", 1, lambda value: granted.append(("low", value[1])) or True)
+    scheduler.request("high", 10, lambda value: granted.append(("high", value[1])) or True)
+    # the free resources are given in the order they were put
+    assert granted == [("low", 9001), ("high", 9002)]
+    assert scheduler.summary() == {"free": 1, "pending": 0}
+
+    scheduler.remove(values[3])
+    scheduler.request("low", 1, lambda value: granted.append(("low", value[1])) or True)
+    scheduler.request("high", 10, lambda value: granted.append(("high", value[1])) or True)
+    assert scheduler.summary() == {"free": 0, "pending": 2}
+    # the higher priority request is served first
+    scheduler.put(values[0])
+    assert granted[-1] == ("high", 9000)
+    assert scheduler.summary() == {"free": 0, "pending": 1}
+
+    # a callback refusing the resource puts it back
+    scheduler = PriorityScheduler("test_device")
+    scheduler.request("user", 1, lambda value: False)
+    scheduler.put(_value(conn, 9005))
+    assert scheduler.summary() == {"free": 1, "pending": 0}
+
+
+def test_rpc_tracker_lease():
+    tracker = Tracker("localhost", port=9000, port_end=10000)
+    device_key = "test_device"
+    server = rpc.Server(
+        "localhost",
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=(tracker.host, tracker.port),
+    )
+    client = rpc.connect_tracker(tracker.host, tracker.port)
+    time.sleep(0.5)
+
+    # the single server serves a new session once the previous one is closed
+    with client.lease(device_key, max_uses=2) as lease:
+        sess = lease.session()
+        assert lease.session() is sess
+        sess.cpu()
+        old_sess = weakref.ref(sess)
+        del sess
+        # the session is requested again once used up
+        sess = lease.session()
+        assert old_sess() is None
+        sess.cpu()
+        old_sess = weakref.ref(sess)
+        del sess
+        lease.release()
+        assert old_sess() is None
+        assert lease.session().cpu().exist
+
+    server.terminate()
+    tracker.terminate()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_rpc_echo()
@@ -516,9 +612,12 @@ if __name__ == "__main__":
     test_bigendian_rpc()
     test_rpc_remote_module()
     test_rpc_file_exchange()
+    test_rpc_upload_archive()
     test_rpc_array()
     test_rpc_simple()
     test_local_func()
     test_rpc_tracker_register()
     test_rpc_tracker_request()
+    test_rpc_tracker_priority_scheduler()
+    test_rpc_tracker_lease()
     test_rpc_large_array()
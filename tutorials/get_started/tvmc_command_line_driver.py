@@ -211,6 +211,21 @@ np.savez("imagenet_cat", data=img_data)
 # an RPC Tracker. To read more about these options please check ``tvmc
 # run --help``.
 #
+# To measure the latency of the module rather than its outputs, ``tvmc run``
+# has a benchmark mode. It warms the module up, then reports the latency
+# percentiles and the throughput, optionally of several instances of the
+# module sharing their params and running at the same time.
+#
+# .. code-block:: bash
+#
+#    tvmc run \
+#      --benchmark \
+#      --warmup 10 \
+#      --repeat 100 \
+#      --concurrency 2 \
+#      --benchmark-output benchmark.json \
+#      compiled_module.tar
+#
 
 ######################################################################
 # Output post-processing